@@ -0,0 +1,62 @@
+"""
+Throughput of the XML sanitization used for responses and imported object definitions,
+and of cleaning plus parsing a response with every installed parser backend.
+
+    python benchmarks/bench_clean_xml.py --sizes 1 50 500
+"""
+import argparse
+import time
+from sapdswsdlclient.utilities import clean_xml
+from sapdswsdlclient.utilities.clean_xml import clean_xml_text, clean_xml_request, clean_xml_response
+
+RESPONSE_ROW = ('<jobDetail><JobName>JOB_LOAD_SALES</JobName><runID>2026101812000042</runID>'
+                '<Status>succeeded</Status><trace>rows: 1000 & more\xa0\x01done</trace></jobDetail>\n')
+REQUEST_ROW = ('<DIScript name="SCR_INIT"><![CDATA[$G_DATE = sysdate(); print(\'\\d\');]]></DIScript>'
+               '<DIAttribute name="desc" value="Tom & Jerry <b>"/>\n')
+
+ENVELOPE = ('<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"><soapenv:Body>'
+            '{}</soapenv:Body></soapenv:Envelope>')
+
+
+def payload(row, size_mb):
+    return row * (size_mb * 1024 * 1024 // len(row.encode('utf-8')))
+
+
+def throughput(fn, text):
+    size_mb = len(text.encode('utf-8')) / 1024 / 1024
+    start = time.perf_counter()
+    fn(text)
+    return size_mb / (time.perf_counter() - start)
+
+
+default_backend = clean_xml.get_parser_backend()
+
+
+def backends():
+    return [backend for backend in clean_xml.parser_backends
+            if backend != 'lxml' or clean_xml.lxml_etree is not None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 50], help='payload sizes in MB')
+    args = parser.parse_args()
+    print(f'default parser backend: {default_backend}')
+
+    for size_mb in args.sizes:
+        response = payload(RESPONSE_ROW, size_mb)
+        print(f'clean_xml_response text {size_mb:>4} MB: {throughput(clean_xml_text, response):8.1f} MB/s')
+        response = ENVELOPE.format(response)
+        for backend in backends():
+            clean_xml.set_parser_backend(backend)
+            print(f'clean_xml_response {backend:<5}{size_mb:>5} MB: '
+                  f'{throughput(clean_xml_response, response):8.1f} MB/s')
+        clean_xml.set_parser_backend(default_backend)
+        del response
+        request = payload(REQUEST_ROW, size_mb)
+        print(f'clean_xml_request       {size_mb:>4} MB: {throughput(clean_xml_request, request):8.1f} MB/s')
+        del request
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,2 @@
+# test_client.py is a usage example that talks to a live Management Console
+collect_ignore = ['test_client.py']
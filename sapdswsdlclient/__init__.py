@@ -1,7 +1,21 @@
 from sapdswsdlclient.server.auth import Server
+from sapdswsdlclient.server.async_auth import AsyncServer
+from sapdswsdlclient.server.session_pool import SessionPool
 
 
-def logon(wsdl_url, username, password, cms_system, cms_authentication):
-    server_instance = Server(wsdl_url, username, password, cms_system, cms_authentication)
+def logon(wsdl_url, username, password, cms_system, cms_authentication,
+          pool_size=10, timeout=(10, 300), session_ttl=300, metadata_cache=None):
+    server_instance = Server(wsdl_url, username, password, cms_system, cms_authentication,
+                             pool_size=pool_size, timeout=timeout, session_ttl=session_ttl,
+                             metadata_cache=metadata_cache)
     server_instance.logon()
-    return server_instance
\ No newline at end of file
+    return server_instance
+
+
+async def async_logon(wsdl_url, username, password, cms_system, cms_authentication,
+                      pool_size=10, timeout=(10, 300), session_ttl=300, metadata_cache=None):
+    server_instance = AsyncServer(wsdl_url, username, password, cms_system, cms_authentication,
+                                  pool_size=pool_size, timeout=timeout, session_ttl=session_ttl,
+                                  metadata_cache=metadata_cache)
+    await server_instance.logon()
+    return server_instance
@@ -1,2 +1,10 @@
 class NotSignedInError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class SessionExpiredError(NotSignedInError):
+    pass
+
+
+class LogNotFoundError(ValueError):
+    pass
@@ -0,0 +1,46 @@
+from functools import wraps
+from sapdswsdlclient.models.batch_job import BatchJob
+from sapdswsdlclient.models.job_server import JobServer
+from sapdswsdlclient.models.dataflow import Dataflow
+from sapdswsdlclient.models.logs import Log
+from sapdswsdlclient.models.repo import Repo
+from sapdswsdlclient.models.realtime_service import RealtimeService
+from sapdswsdlclient.server.re_auth import async_re_logon
+
+
+class AsyncModel:
+    def __init__(self, server_instance):
+        self._server = server_instance
+
+
+def async_operation(method):
+    """
+    :param method: sync model method decorated with soap_operation
+    :return: coroutine method running the same operation on the AsyncServer
+    """
+    operation = method.operation
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._server.execute(operation(self, *args, **kwargs))
+    return async_re_logon(wrapper, retry=getattr(method, 'retry', True))
+
+
+def async_model(model):
+    """
+    :param model: sync model class
+    :return: class with a coroutine counterpart for every SOAP operation of the model
+    """
+    namespace = {'__doc__': f'Coroutine counterpart of {model.__name__}.'}
+    for name, method in vars(model).items():
+        if hasattr(method, 'operation'):
+            namespace[name] = async_operation(method)
+    return type(f'Async{model.__name__}', (AsyncModel,), namespace)
+
+
+AsyncBatchJob = async_model(BatchJob)
+AsyncJobServer = async_model(JobServer)
+AsyncDataflow = async_model(Dataflow)
+AsyncLog = async_model(Log)
+AsyncRepo = async_model(Repo)
+AsyncRealtimeService = async_model(RealtimeService)
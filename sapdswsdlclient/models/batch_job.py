@@ -1,12 +1,72 @@
+import time
+from collections.abc import Mapping
 from typing import Optional, Literal
-import requests
 import html
 import re
-from sapdswsdlclient.templates.templates import request_template, headers
-from sapdswsdlclient.models.items import SystemConfigurations, SubstitutionParameters
-from sapdswsdlclient.utilities.clean_xml import clean_xml_response
+from sapdswsdlclient.models.items import SystemConfigurations, SubstitutionParameters, JobExecution, FlowDetail, RunId
 from sapdswsdlclient.utilities.check_for_fault_or_error import check_for_fault_or_error
+from sapdswsdlclient.utilities.concurrency import run_concurrently
+from sapdswsdlclient.utilities.metadata_cache import cached_metadata
+from sapdswsdlclient.utilities.response_schema import RecordSchema, FieldSchema
 from sapdswsdlclient.server.re_auth import re_logon
+from sapdswsdlclient.server.soap_call import SoapCall, soap_operation
+from sapdswsdlclient.templates.envelope import soap_request, Raw, escape_value
+
+job_detail_fields = {'JobName': 'JobName', 'ObjID': 'ObjID', 'RunID': 'runID', 'StartTime': 'StartTime',
+                     'EndTime': 'EndTime', 'ExecutionTime': 'ExecutionTime', 'Status': 'Status',
+                     'JobServerUsed': 'JobServerUsed'}
+job_detail_schema = RecordSchema('jobDetail', job_detail_fields, record_type=JobExecution)
+run_exe_detail_schema = RecordSchema('jobDetail', {key: tag for key, tag in job_detail_fields.items()
+                                                   if key not in ('JobName', 'RunID')})
+flow_detail_schema = RecordSchema('flowDetail', {
+    'ObjectName': 'ObjectName', 'ObjectType': 'ObjectType', 'ParentObject': 'ParentObject',
+    'ParentType': 'ParentType', 'StartTime': 'StartTime', 'EndTime': 'EndTime', 'Duration': 'Duration',
+    'RowsRead': 'RowsRead', 'JobServerUsed': 'JobserverUsed', 'hasAuditData': 'hasAuditData'},
+    fault_tags=['ErrorMessage', 'faultstring'], record_type=FlowDetail)
+run_id_schema = RecordSchema('run', {'runID': 'runID', 'status': 'status', 'repoName': 'repoName'},
+                             fault_tags=['errorMessage', 'faultstring'], record_type=RunId)
+scheduled_task_schema = RecordSchema('SchduledTask', {
+    'ScheduledTaskName': 'ScheduledTaskName', 'JobName': 'JobName', 'RepoName': 'RepoName',
+    'RecurrenceType': 'RecurrenceType', 'RecurrenceDays': 'RecurrenceDays', 'StartTime': 'StartTime',
+    'DurationTime': 'DurationTime', 'RepeatInterval': 'RepeatInterval', 'NextRunTime': 'NextRunTime',
+    'IsActive': 'IsActive'}, fault_tags=['errorMessage', 'faultstring'])
+job_list_schema = FieldSchema({}, list_fields={'jobName': 'jobName'}, fault_tags=['errorMessage', 'faultstring'])
+job_options_schema = FieldSchema({
+    'sampling_rate': 'sampling_rate', 'auditing': 'auditing',
+    'disableValidationStatisticsCollection': 'disableValidationStatisticsCollection', 'recovery': 'recovery',
+    'recoverfromlastfailedexec': 'recoverfromlastfailedexec',
+    'collectstatsformonitoring': 'collectstatsformonitoring',
+    'collectstatsforoptimization': 'collectstatsforoptimization', 'usecollectedstats': 'usecollectedstats',
+    'exportdataqualityreports': 'exportdataqualityreports', 'StatusCode': 'StatusCode'},
+    list_fields={'trace': 'trace'}, fault_tags=['ErrorMessage', 'faultstring'])
+run_status_schema = FieldSchema({'processID': 'pid', 'counterID': 'cid', 'runID': 'rid', 'repoName': 'repoName'},
+                                fault_tags=['errorMessage', 'faultstring'])
+# statuses of runs that have finished, in lower case
+terminal_statuses = frozenset(['succeeded', 'error', 'warning'])
+
+
+def is_terminal(status):
+    """
+    :param status: Status of a job execution or status of a run ID, in any case
+    :return: True if the run has finished
+    """
+    return status is not None and status.lower() in terminal_statuses
+
+
+def note_run_statuses(server, repo_name, runs):
+    """
+    Tells the log cache of the server, if any, which runs have finished.
+
+    :param server: Server or AsyncServer
+    :param repo_name: name of the repository
+    :param runs: iterable of (run ID, status) pairs
+    """
+    cache = server.log_cache
+    if cache is None:
+        return
+    for run_id, status in runs:
+        if run_id is not None and is_terminal(status):
+            cache.mark_finished(server.wsdl_url, repo_name, run_id)
 
 
 class BatchJob:
@@ -15,11 +75,9 @@ class BatchJob:
         :param server_instance:
         """
         self._server = server_instance
-        self.request_template = request_template
-        self.headers = headers
 
     @re_logon
-
+    @soap_operation
     def get_exe_detail(self, repo_name, job_name, start_time: Optional[str] = '', end_time: Optional[str] = ''):
         """
         :param repo_name: name of the repository
@@ -29,37 +87,25 @@ class BatchJob:
         :return: a list of all job executions for a selected repository and job
         """
 
-        request_body = f'''<ser:GetBatchJobExeDetailRequest>
+        request_body = soap_request('''<ser:GetBatchJobExeDetailRequest>
                             <repoName>{repo_name}</repoName>
                             <jobName>{job_name}</jobName>
                             <startTime>{start_time}</startTime>
                             <endTime>{end_time}</endTime>
-                        </ser:GetBatchJobExeDetailRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_ExeDetail'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-        job_exe_details = list()
-
-        root = response.findall('.//jobDetail')
-        if root:
-            for job in root:
-                job_item = dict()
-                job_item['JobName'] = job.find('JobName').text
-                job_item['ObjID'] = job.find('ObjID').text
-                job_item['RunID'] = job.find('runID').text
-                job_item['StartTime'] = job.find('StartTime').text
-                job_item['EndTime'] = job.find('EndTime').text
-                job_item['ExecutionTime'] = job.find('ExecutionTime').text
-                job_item['Status'] = job.find('Status').text
-                job_item['JobServerUsed'] = job.find('JobServerUsed').text
-                job_exe_details.append(job_item)
+                        </ser:GetBatchJobExeDetailRequest>''', repo_name=repo_name, job_name=job_name,
+                                    start_time=start_time, end_time=end_time)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_ExeDetail', request_body)
+
+        job_exe_details = job_detail_schema.parse(response)
+        if job_exe_details:
             return job_exe_details
         else:
             return {'returnCode': '0', 'returnMessage': 'No job execution details found'}
 
 
+    @re_logon
+    @soap_operation
+    @cached_metadata
     def get_detail(self, repo_name, job_name):
         """
         :param repo_name: name of the repository
@@ -67,15 +113,11 @@ class BatchJob:
         :return: a list of a job's global variables, all the available system configurations
                 and substitution parameters
         """
-        request_body = f'''<ser:Get_BatchJob_DetailRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_DetailRequest>
                                 <jobName>{job_name}</jobName>
                                 <repoName>{repo_name}</repoName>
-                        </ser:Get_BatchJob_DetailRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_Details'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                        </ser:Get_BatchJob_DetailRequest>''', job_name=job_name, repo_name=repo_name)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_Details', request_body)
 
         check_for_fault_or_error(response, ['ErrorMessage', 'faultstring'])
 
@@ -112,9 +154,11 @@ class BatchJob:
             substitution_parameters_instance = SubstitutionParameters(param_list)
             job_details.append(substitution_parameters_instance)
 
-            return job_details
+        return job_details
 
 
+    @re_logon
+    @soap_operation
     def get_by_time_range(self, repo_name, range_start_time, range_end_time, job_name: Optional[str] = ''):
         """
         :param repo_name: name of the repository
@@ -123,144 +167,81 @@ class BatchJob:
         :param job_name: [Optional] the name of the batch job
         :return: a list of all jobs or all instances of the specified job running during the specified time range
         """
-        request_body = f'''<ser:Get_BatchJob_By_TimeRangeRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_By_TimeRangeRequest>
                                 <repoName>{repo_name}</repoName>
                                 <jobName>{job_name}</jobName>
                                 <rangeStartTime>{range_start_time}</rangeStartTime>
                                 <rangeEndTime>{range_end_time}</rangeEndTime>
-                            </ser:Get_BatchJob_By_TimeRangeRequest>'''
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_By_TimeRange'
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-        jobs_by_time_range = list()
-
-        root = response.findall('.//jobDetail')
-        if root:
-            for job in root:
-                job_item = dict()
-                job_item['JobName'] = job.find('JobName').text
-                job_item['ObjID'] = job.find('ObjID').text
-                job_item['RunID'] = job.find('runID').text
-                job_item['StartTime'] = job.find('StartTime').text
-                job_item['EndTime'] = job.find('EndTime').text
-                job_item['ExecutionTime'] = job.find('ExecutionTime').text
-                job_item['Status'] = job.find('Status').text
-                job_item['JobServerUsed'] = job.find('JobServerUsed').text
-                jobs_by_time_range.append(job_item)
+                            </ser:Get_BatchJob_By_TimeRangeRequest>''', repo_name=repo_name, job_name=job_name,
+                                    range_start_time=range_start_time, range_end_time=range_end_time)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_By_TimeRange', request_body)
+
+        jobs_by_time_range = job_detail_schema.parse(response)
+        note_run_statuses(self._server, repo_name, [(job['RunID'], job['Status']) for job in jobs_by_time_range])
+        if jobs_by_time_range:
             return jobs_by_time_range
         else:
             return f'No jobs found in the time range {range_start_time} - {range_end_time}.'
 
 
+    @re_logon
+    @soap_operation
+    @cached_metadata
     def get_list(self, repo_name, is_all_batch_jobs: Literal[0, 1] = 1):
         """
         :param repo_name: name of the repository
         :param is_all_batch_jobs: [Optional] 0 if the jobs published as Web services; 1 if all the jobs
         :return: the list of batch jobs
         """
-        request_body = f'''<ser:Get_BatchJob_ListRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_ListRequest>
                                 <repoName>{repo_name}</repoName>
                                 <allBatchJobs>{is_all_batch_jobs}</allBatchJobs>
-                            </ser:Get_BatchJob_ListRequest>'''
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_List'
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+                            </ser:Get_BatchJob_ListRequest>''', repo_name=repo_name,
+                                    is_all_batch_jobs=is_all_batch_jobs)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_List', request_body)
 
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
-
-        root = response.findall('.//jobName')
-        job_list = list()
-        for job in root:
-            if job is not None:
-                job_list.append(job.text)
-        return {repo_name: job_list}
+        return {repo_name: job_list_schema.parse(response)['jobName']}
 
 
+    @re_logon
+    @soap_operation
     def get_flow_details(self, repo_name, run_id):
         """
         :param repo_name: name of the repository
         :param run_id: run ID of the batch job instance
         :return: the batch job instance objects execution statistics
         """
-        request_body = f'''<ser:Get_BatchJob_FlowDetailsRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_FlowDetailsRequest>
                                 <repoName>{repo_name}</repoName>
                                 <runID>{run_id}</runID>
-                            </ser:Get_BatchJob_FlowDetailsRequest>'''
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_FlowDetails'
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Get_BatchJob_FlowDetailsRequest>''', repo_name=repo_name, run_id=run_id)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_FlowDetails', request_body)
 
-        check_for_fault_or_error(response, ['ErrorMessage', 'faultstring'])
-
-        flow_details = list()
-
-        root = response.findall('.//flowDetail')
-        if root:
-            for flow in root:
-                flow_item = dict()
-                flow_item['ObjectName'] = flow.find('ObjectName').text
-                flow_item['ObjectType'] = flow.find('ObjectType').text
-                flow_item['ParentObject'] = flow.find('ParentObject').text
-                flow_item['ParentType'] = flow.find('ParentType').text
-                flow_item['StartTime'] = flow.find('StartTime').text
-                flow_item['EndTime'] = flow.find('EndTime').text
-                flow_item['Duration'] = flow.find('Duration').text
-                flow_item['RowsRead'] = flow.find('RowsRead').text
-                flow_item['JobServerUsed'] = flow.find('JobserverUsed').text
-                flow_item['hasAuditData'] = flow.find('hasAuditData').text
-                flow_details.append(flow_item)
+        flow_details = flow_detail_schema.parse(response)
+        if flow_details:
             return flow_details
 
 
+    @re_logon
+    @soap_operation
+    @cached_metadata
     def get_options(self, job_name, repo_name):
         """
         :param job_name: name of the job
         :param repo_name: name of the repository
         :return: dict of job execution and trace options
         """
-        request_body = f'''<ser:Get_BatchJob_OptionsRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_OptionsRequest>
                                 <jobName>{job_name}</jobName>
                                 <repoName>{repo_name}</repoName>
-                            </ser:Get_BatchJob_OptionsRequest>'''
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_Options'
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Get_BatchJob_OptionsRequest>''', job_name=job_name, repo_name=repo_name)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_Options', request_body)
 
-        check_for_fault_or_error(response, ['ErrorMessage', 'faultstring'])
-
-        job_options = dict()
-        job_options['sampling_rate'] = response.find('.//sampling_rate').text
-        job_options['auditing'] = response.find('.//auditing').text
-        job_options['disableValidationStatisticsCollection'] = (
-            response.find('.//disableValidationStatisticsCollection').text)
-        job_options['recovery'] = response.find('.//recovery').text
-        job_options['recoverfromlastfailedexec'] = (
-            response.find('.//recoverfromlastfailedexec').text)
-        job_options['collectstatsformonitoring'] = (
-            response.find('.//collectstatsformonitoring').text)
-        job_options['collectstatsforoptimization'] = (
-            response.find('.//collectstatsforoptimization').text)
-        job_options['usecollectedstats'] = response.find('.//usecollectedstats').text
-        job_options['exportdataqualityreports'] = (
-            response.find('.//exportdataqualityreports').text)
-        job_options['trace'] = list()
-        trace_options = response.findall('.//trace')
-        for trace in trace_options:
-            if trace is not None:
-                job_options['trace'].append(trace.text)
-        job_options['StatusCode'] = response.find('.//StatusCode').text
-
-        return job_options
+        return job_options_schema.parse(response)
 
 
+    @re_logon
+    @soap_operation
     def get_run_exe_detail(self, repo_name, job_name, run_id):
         """
         :param job_name: name of the job
@@ -268,34 +249,25 @@ class BatchJob:
         :param run_id: run ID of the job instance
         :return: dict of details for the job instance execution
         """
-        request_body = f'''<ser:Get_BatchJob_Run_ExeDetailRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_Run_ExeDetailRequest>
                                 <repoName>{repo_name}</repoName>
                                 <jobName>{job_name}</jobName>
                                 <runID>{run_id}</runID>
-                            </ser:Get_BatchJob_Run_ExeDetailRequest>'''
+                            </ser:Get_BatchJob_Run_ExeDetailRequest>''', repo_name=repo_name, job_name=job_name,
+                                    run_id=run_id)
 
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_Run_ExeDetail'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_Run_ExeDetail', request_body)
 
-        response = clean_xml_response(response.text)
-        job_run_exe_details = dict()
-
-        root = response.find('.//jobDetail')
-        if root is not None:
-            job_run_exe_details['ObjID'] = root.find('ObjID').text
-            job_run_exe_details['StartTime'] = root.find('StartTime').text
-            job_run_exe_details['EndTime'] = root.find('EndTime').text
-            job_run_exe_details['ExecutionTime'] = root.find('ExecutionTime').text
-            job_run_exe_details['Status'] = root.find('Status').text
-            job_run_exe_details['JobServerUsed'] = root.find('JobServerUsed').text
-
-        else:
+        job_run_exe_details = run_exe_detail_schema.parse(response)
+        if not job_run_exe_details:
             raise ValueError(f'No execution details for run ID {run_id} of {job_name} in {repo_name}.')
+        note_run_statuses(self._server, repo_name, [(run_id, job_run_exe_details[0]['Status'])])
 
-        return job_run_exe_details
+        return job_run_exe_details[0]
 
 
+    @re_logon
+    @soap_operation
     def get_run_ids(self, repo_name, job_name, status: Optional[str] = 'all'):
         """
         :param repo_name: name of the repository
@@ -303,49 +275,127 @@ class BatchJob:
         :param status: the options are running, succeeded, error, warning, all
         :return: list of run IDs for batch job instances
         """
-        request_body = f'''<ser:Get_BatchJob_RunIDsRequest>
+        request_body = soap_request('''<ser:Get_BatchJob_RunIDsRequest>
                                 <repoName>{repo_name}</repoName>
                                 <jobName>{job_name}</jobName>
                                 <status>{status}</status>
-                            </ser:Get_BatchJob_RunIDsRequest>'''
+                            </ser:Get_BatchJob_RunIDsRequest>''', repo_name=repo_name, job_name=job_name,
+                                    status=status)
 
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_BatchJob_RunIDs'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+        response = yield SoapCall('jobAdmin=Get_BatchJob_RunIDs', request_body)
 
-        response = clean_xml_response(response.text)
+        run_ids = run_id_schema.parse(response)
+        note_run_statuses(self._server, repo_name, [(run['runID'], run['status']) for run in run_ids])
+        return run_ids
 
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
 
-        runs = list()
+    def wait_for(self, runs, timeout: Optional[float] = None, poll: float = 5, max_poll: float = 60):
+        """
+        :param runs: iterable of results of run_job, or of (repo_name, job_name, run_id) tuples
+        :param timeout: [Optional] seconds after which TimeoutError is raised for the runs still running;
+                        the last poll happens when they have passed
+        :param poll: [Optional] seconds between polls while runs keep finishing
+        :param max_poll: [Optional] longest wait between polls; the wait grows towards it while no run finishes
+        :return: generator of (run, status) in the order the runs finish, status as listed by get_run_ids;
+                runs are listed per job, so every poll asks once per repository and job for the runs still
+                running, and once more for all runs of the jobs with a run that isn't listed as running;
+                runs the server hasn't recorded yet, such as queued ones, stay pending
+        """
+        pending = dict()
+        for run in runs:
+            if isinstance(run, Mapping):
+                repo_name, job_name, run_id = run['repoName'], run['jobName'], run['runID']
+            else:
+                repo_name, job_name, run_id = run
+            pending.setdefault((repo_name, job_name), dict())[str(run_id)] = run
+        if poll < 0 or max_poll < poll:
+            raise ValueError('poll must not be negative nor greater than max_poll.')
+        return self._wait_for(pending, timeout, poll, max_poll)
+
+
+    def _wait_for(self, pending, timeout, poll, max_poll):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = poll
+        while pending:
+            finished = 0
+            for (repo_name, job_name), group in list(pending.items()):
+                running = {str(run['runID']) for run in self.get_run_ids(repo_name, job_name, 'running')}
+                if all(run_id in running for run_id in group):
+                    continue
+                statuses = {str(run['runID']): run['status'] for run in self.get_run_ids(repo_name, job_name, 'all')}
+                for run_id in [run_id for run_id in group if run_id not in running]:
+                    status = statuses.get(run_id)
+                    if is_terminal(status):
+                        finished += 1
+                        yield group.pop(run_id), status
+                if not group:
+                    del pending[repo_name, job_name]
+            if not pending:
+                return
+            interval = poll if finished else min(max_poll, interval * 1.5)
+            wait = interval
+            if deadline is not None:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    runs = sum(len(group) for group in pending.values())
+                    raise TimeoutError(f'{runs} runs did not finish in {timeout} seconds.')
+                wait = min(interval, wait)
+            time.sleep(wait)
+
+
+    def get_run_exe_detail_many(self, repo_name, runs, max_workers: Optional[int] = None):
+        """
+        :param repo_name: name of the repository
+        :param runs: iterable of (job_name, run_id) pairs
+        :param max_workers: [Optional] number of concurrent requests; defaults to the connection pool size
+        :return: generator of ((job_name, run_id), details, error) in completion order;
+                error is the exception raised for that run or None
+        """
+        return run_concurrently(lambda run: self.get_run_exe_detail(repo_name, run[0], run[1]), runs,
+                                max_workers or self._server.transport.pool_size)
+
+
+    def get_flow_details_many(self, repo_name, run_ids, max_workers: Optional[int] = None):
+        """
+        :param repo_name: name of the repository
+        :param run_ids: iterable of run IDs of batch job instances
+        :param max_workers: [Optional] number of concurrent requests; defaults to the connection pool size
+        :return: generator of (run_id, flow details, error) in completion order;
+                error is the exception raised for that run or None
+        """
+        return run_concurrently(lambda run_id: self.get_flow_details(repo_name, run_id), run_ids,
+                                max_workers or self._server.transport.pool_size)
 
-        runs_data = response.findall('.//run')
-        for run in runs_data:
-            run_dict = dict()
-            if run is not None:
-                run_dict['runID'] = run.find('runID').text
-                run_dict['status'] = run.find('status').text
-                run_dict['repoName'] = run.find('repoName').text
-            runs.append(run_dict)
-        return runs
 
+    def get_run_ids_many(self, repo_name, job_names, status: Optional[str] = 'all',
+                         max_workers: Optional[int] = None):
+        """
+        :param repo_name: name of the repository
+        :param job_names: iterable of job names
+        :param status: the options are running, succeeded, error, warning, all
+        :param max_workers: [Optional] number of concurrent requests; defaults to the connection pool size
+        :return: generator of (job_name, run IDs, error) in completion order;
+                error is the exception raised for that job or None
+        """
+        return run_concurrently(lambda job_name: self.get_run_ids(repo_name, job_name, status), job_names,
+                                max_workers or self._server.transport.pool_size)
 
+
+    @re_logon
+    @soap_operation
+    @cached_metadata
     def get_input_format(self, repo_name, job_name):
         """
         :param repo_name: name of the repository
         :param job_name: name of the job
         :return: the input format for a batch job
         """
-        request_body = f'''<ser:Get_Job_Input_FormatRequest>
+        request_body = soap_request('''<ser:Get_Job_Input_FormatRequest>
                                 <repoName>{repo_name}</repoName>
                                 <jobName>{job_name}</jobName>
-                            </ser:Get_Job_Input_FormatRequest>'''
-
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_Job_Input_Format'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+                            </ser:Get_Job_Input_FormatRequest>''', repo_name=repo_name, job_name=job_name)
 
-        response = clean_xml_response(response.text)
+        response = yield SoapCall('jobAdmin=Get_Job_Input_Format', request_body)
 
         check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
 
@@ -355,7 +405,7 @@ class BatchJob:
 
         xml_namespaces = {'localtypes': 'http://www.businessobjects.com/DataServices/ServerX.xsd'}
         xml_root = response
-        format_element = xml_root.find('.//format', xml_namespaces).text
+        format_element = xml_root.findtext('.//format', '', xml_namespaces)
 
         xsd_string = html.unescape(format_element)
         xsd_lines = xsd_string.split('xsd:element')
@@ -385,43 +435,25 @@ class BatchJob:
         return input_format
 
 
+    @re_logon
+    @soap_operation
     def get_scheduled_tasks(self, repo_name, all_batch_jobs: Optional[str] = 'false'):
         """
         :param repo_name: name of the repository
         :param all_batch_jobs: true (all) / false (active)
         :return: list of scheduled tasks
         """
-        request_body = f'''<ser:Get_Scheduled_TasksRequest>
+        request_body = soap_request('''<ser:Get_Scheduled_TasksRequest>
                                 <repoName>{repo_name}</repoName>
                                 <allBatchJobs>{all_batch_jobs}</allBatchJobs>
-                            </ser:Get_Scheduled_TasksRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_Scheduled_Tasks'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
+                            </ser:Get_Scheduled_TasksRequest>''', repo_name=repo_name, all_batch_jobs=all_batch_jobs)
+        response = yield SoapCall('jobAdmin=Get_Scheduled_Tasks', request_body)
 
-        scheduled_tasks = list()
-        tasks = response.findall('.//SchduledTask')
-        for t in tasks:
-            task_description = dict()
-            if t is not None:
-                task_description['ScheduledTaskName'] = t.find('ScheduledTaskName').text
-                task_description['JobName'] = t.find('JobName').text
-                task_description['RepoName'] = t.find('RepoName').text
-                task_description['RecurrenceType'] = t.find('RecurrenceType').text
-                task_description['RecurrenceDays'] = t.find('RecurrenceDays').text
-                task_description['StartTime'] = t.find('StartTime').text
-                task_description['DurationTime'] = t.find('DurationTime').text
-                task_description['RepeatInterval'] = t.find('RepeatInterval').text
-                task_description['NextRunTime'] = t.find('NextRunTime').text
-                task_description['IsActive'] = t.find('IsActive').text
-            scheduled_tasks.append(task_description)
-        return scheduled_tasks
+        return scheduled_task_schema.parse(response)
 
 
+    @re_logon(retry=False)
+    @soap_operation
     def run_job(self, repo_name, job_name,
                 job_parameters: Optional[str] = '', global_variables:  Optional[dict] = '',
                 job_server: Optional[str] = '', server_group: Optional[str] = ''):
@@ -434,14 +466,15 @@ class BatchJob:
                             can't be specified if serverGroup is also specified.
         :param server_group: [Optional] name of the server group to use to execute the job;
                             can't be specified if jobServer is specified
-        :return: process ID, counter ID, run ID, repository name associated with the batch job execution
+        :return: process ID, counter ID, run ID, repository name and job name of the batch job execution
         """
         if job_server and server_group:
             raise ValueError('You can only specify either Job Server or Server Group, not both.')
 
         global_variables_xml = ''
         if global_variables:
-            existing_vars = list(self.get_input_format(repo_name, job_name).values())[0]
+            input_format = yield from self.get_input_format.operation(self, repo_name, job_name)
+            existing_vars = list(input_format.values())[0]
             existing_vars_list = list()
             for var in existing_vars:
                 for name, value in var.items():
@@ -450,11 +483,12 @@ class BatchJob:
 
             for name, value in global_variables.items():
                 if name in existing_vars_list:
-                    global_variables_xml += f'''<variable name="{name}">'{value}'</variable>'''
+                    global_variables_xml += (f'<variable name="{escape_value(name)}">'
+                                             f"'{escape_value(value)}'</variable>")
                 else:
                     raise ValueError(f'''No '{name}' variable existing for {job_name}''')
 
-        request_body = f'''<ser:Run_Batch_JobRequest>
+        request_body = soap_request('''<ser:Run_Batch_JobRequest>
                                 <repoName>{repo_name}</repoName>
                                 <jobName>{job_name}</jobName>
                                 <jobParameters>{job_parameters}</jobParameters>
@@ -463,38 +497,30 @@ class BatchJob:
                                 </globalVariables>
                                 <jobServer>{job_server}</jobServer>
                                 <serverGroup>{server_group}</serverGroup>
-                            </ser:Run_Batch_JobRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Run_Batch_Job'
-        response = requests.post(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
-
-        run_status = dict()
-        run_status['processID'] = response.find('.//pid').text
-        run_status['counterID'] = response.find('.//cid').text
-        run_status['runID'] = response.find('.//rid').text
-        run_status['repoName'] = response.find('.//repoName').text
+                            </ser:Run_Batch_JobRequest>''', repo_name=repo_name, job_name=job_name,
+                                    job_parameters=Raw(job_parameters),
+                                    global_variables_xml=Raw(global_variables_xml), job_server=job_server,
+                                    server_group=server_group)
+        response = yield SoapCall('jobAdmin=Run_Batch_Job', request_body, method='post')
+
+        run_status = run_status_schema.parse(response)
+        run_status['jobName'] = job_name
         return run_status
 
 
+    @re_logon(retry=False)
+    @soap_operation
     def stop_job(self, repo_name, run_id):
         """
         :param repo_name: name of the repository
         :param run_id: run ID of the bath job instance
         :return: status of the operation
         """
-        request_body = f'''<ser:Run_Batch_JobRequest>
+        request_body = soap_request('''<ser:Run_Batch_JobRequest>
                                 <repoName>{repo_name}</repoName>
                                 <runID>{run_id}</runID>
-                            </ser:Run_Batch_JobRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Stop_Batch_Job'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Run_Batch_JobRequest>''', repo_name=repo_name, run_id=run_id)
+        response = yield SoapCall('jobAdmin=Stop_Batch_Job', request_body)
 
         check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
 
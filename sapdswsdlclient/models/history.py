@@ -0,0 +1,177 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from sapdswsdlclient.models.batch_job import terminal_statuses
+from sapdswsdlclient.models.items import JobExecution
+from sapdswsdlclient.utilities.concurrency import run_concurrently
+
+time_format = '%Y-%m-%d %H:%M:%S'
+execution_fields = JobExecution.__slots__
+
+schema = f'''
+CREATE TABLE IF NOT EXISTS executions (
+    repo_name TEXT NOT NULL,
+    {', '.join(f'{field} TEXT' for field in execution_fields)},
+    PRIMARY KEY (repo_name, RunID)
+);
+CREATE INDEX IF NOT EXISTS executions_job ON executions (repo_name, JobName, StartTime);
+CREATE INDEX IF NOT EXISTS executions_status ON executions (Status, StartTime);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo_name TEXT PRIMARY KEY,
+    synced_until TEXT NOT NULL
+);
+'''
+upsert = f'''
+INSERT INTO executions (repo_name, {', '.join(execution_fields)})
+VALUES (?, {', '.join('?' * len(execution_fields))})
+ON CONFLICT (repo_name, RunID) DO UPDATE SET
+    {', '.join(f'{field} = excluded.{field}' for field in execution_fields if field != 'RunID')}
+'''
+
+
+def to_time_text(value):
+    """
+    :param value: datetime or datetime as YYYY-MM-DD HH:mm:ss
+    :return: datetime as YYYY-MM-DD HH:mm:ss, which sorts like the datetime
+    """
+    if isinstance(value, datetime):
+        return value.strftime(time_format)
+    return datetime.strptime(value, time_format).strftime(time_format)
+
+
+class HistorySync:
+    def __init__(self, path, overlap: timedelta = timedelta(minutes=5), window: timedelta = timedelta(days=1)):
+        """
+        Local SQLite copy of the execution history of batch jobs, kept up to date incrementally.
+
+        :param path: file of the database, created if it doesn't exist; ':memory:' keeps it in memory
+        :param overlap: [Optional] time before the high-water mark of a repository fetched again on every sync,
+                        covering runs recorded late and clock differences with the server
+        :param window: [Optional] longest time range fetched by one get_by_time_range request
+        """
+        self.path = path
+        self.overlap = overlap
+        self.window = window
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(schema)
+        self._lock = threading.Lock()
+
+
+    def synced_until(self, repo_name):
+        """
+        :return: high-water mark of the repository as YYYY-MM-DD HH:mm:ss, None if it was never synced
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT synced_until FROM sync_state WHERE repo_name = ?',
+                                           (repo_name,)).fetchone()
+        return row[0] if row else None
+
+
+    def sync_repo(self, server, repo_name, since=None, until=None):
+        """
+        Fetches the runs of the repository from its high-water mark up to until and upserts them by run ID.
+        Runs that were still running at the previous sync are fetched again until they have finished.
+
+        :param server: Server whose history is synced
+        :param repo_name: name of the repository
+        :param since: [Optional] start of the first sync as datetime or YYYY-MM-DD HH:mm:ss; defaults to 30 days
+                    before until; ignored once the repository has a high-water mark
+        :param until: [Optional] end of the sync as datetime or YYYY-MM-DD HH:mm:ss; defaults to now
+        :return: number of runs upserted
+        """
+        until = datetime.strptime(to_time_text(until or datetime.now()), time_format)
+        start = self._sync_start(repo_name, since, until)
+        upserted = 0
+        while start < until:
+            end = min(start + self.window, until)
+            runs = server.batch_job.get_by_time_range(repo_name, start.strftime(time_format),
+                                                      end.strftime(time_format))
+            # a message instead of a list means no runs in the range
+            if isinstance(runs, str):
+                runs = list()
+            with self._lock, self._connection:
+                self._connection.executemany(upsert, [(repo_name, *(run[field] for field in execution_fields))
+                                                      for run in runs])
+                self._connection.execute('INSERT INTO sync_state (repo_name, synced_until) VALUES (?, ?) '
+                                         'ON CONFLICT (repo_name) DO UPDATE SET synced_until = excluded.synced_until',
+                                         (repo_name, end.strftime(time_format)))
+            upserted += len(runs)
+            start = end
+        return upserted
+
+
+    def sync(self, server, repo_names, since=None, until=None, max_workers: Optional[int] = None):
+        """
+        :param server: Server whose history is synced
+        :param repo_names: iterable of repository names
+        :param since: [Optional] start of the first sync of a repository, see sync_repo
+        :param until: [Optional] end of the sync, see sync_repo
+        :param max_workers: [Optional] number of repositories synced concurrently; defaults to the connection pool size
+        :return: generator of (repo_name, number of runs upserted, error) in completion order;
+                error is the exception raised for that repository or None, and its high-water mark stays
+                at the last window that was stored
+        """
+        until = until or datetime.now()
+        return run_concurrently(lambda repo_name: self.sync_repo(server, repo_name, since, until), repo_names,
+                                max_workers or server.transport.pool_size)
+
+
+    def query(self, repo_name=None, job_name=None, status=None, since=None, until=None):
+        """
+        :param repo_name: [Optional] name of the repository
+        :param job_name: [Optional] name of the job
+        :param status: [Optional] status of the runs, in any case, e.g. error
+        :param since: [Optional] earliest start time as datetime or YYYY-MM-DD HH:mm:ss
+        :param until: [Optional] latest start time as datetime or YYYY-MM-DD HH:mm:ss
+        :return: list of JobExecution records ordered by start time
+        """
+        conditions = list()
+        parameters = list()
+        for condition, value in (('repo_name = ?', repo_name), ('JobName = ?', job_name),
+                                 ('lower(Status) = ?', status and status.lower()),
+                                 ('StartTime >= ?', since and to_time_text(since)),
+                                 ('StartTime <= ?', until and to_time_text(until))):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        with self._lock:
+            rows = self._connection.execute(f'SELECT {", ".join(execution_fields)} FROM executions {where} '
+                                            'ORDER BY StartTime, RunID', parameters).fetchall()
+        return [JobExecution(**dict(zip(execution_fields, row))) for row in rows]
+
+
+    def close(self):
+        self._connection.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def _sync_start(self, repo_name, since, until):
+        """
+        :return: start of the next sync: the high-water mark less the overlap, or the start of the earliest run
+                still running at the previous sync if that is earlier
+        """
+        synced_until = self.synced_until(repo_name)
+        if synced_until is None:
+            return datetime.strptime(to_time_text(since), time_format) if since else until - timedelta(days=30)
+        start = datetime.strptime(synced_until, time_format) - self.overlap
+        statuses = sorted(terminal_statuses)
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT min(StartTime) FROM executions WHERE repo_name = ? AND StartTime IS NOT NULL '
+                f'AND lower(coalesce(Status, \'\')) NOT IN ({", ".join("?" * len(statuses))})',
+                (repo_name, *statuses)).fetchone()
+        if row[0] is not None:
+            try:
+                start = min(start, datetime.strptime(row[0], time_format))
+            except ValueError:
+                pass
+        return start
@@ -1,3 +1,7 @@
+import sys
+from collections.abc import Mapping
+
+
 class SystemConfigurations:
     def __init__(self, system_configurations_list):
         self.system_configurations_list = system_configurations_list
@@ -77,4 +81,71 @@ class ErrorMessage:
         if self.error_message is None:
             return 'None'
         else:
-            return '<ErrorMessageItem>'
\ No newline at end of file
+            return '<ErrorMessageItem>'
+
+
+class Record(Mapping):
+    """
+    Compact result record: fields are slots instead of dict entries, values of the fields listed in
+    interned are shared between records, and the record reads like the dict it replaces
+    (record['Status'], dict(record), record == {...}); to_dict() returns a plain dict.
+    """
+    __slots__ = ()
+    interned = frozenset()
+
+    def __init__(self, **values):
+        interned = self.interned
+        for name in self.__slots__:
+            value = values.get(name)
+            if value is not None and name in interned:
+                value = sys.intern(value)
+            setattr(self, name, value)
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class JobExecution(Record):
+    __slots__ = ('JobName', 'ObjID', 'RunID', 'StartTime', 'EndTime', 'ExecutionTime', 'Status', 'JobServerUsed')
+    interned = frozenset(['JobName', 'ObjID', 'Status', 'JobServerUsed'])
+
+
+class FlowDetail(Record):
+    __slots__ = ('ObjectName', 'ObjectType', 'ParentObject', 'ParentType', 'StartTime', 'EndTime', 'Duration',
+                 'RowsRead', 'JobServerUsed', 'hasAuditData')
+    interned = frozenset(['ObjectName', 'ObjectType', 'ParentObject', 'ParentType', 'JobServerUsed', 'hasAuditData'])
+
+
+class RunId(Record):
+    __slots__ = ('runID', 'status', 'repoName')
+    interned = frozenset(['status', 'repoName'])
+
+
+class DFMonitorRow(Record):
+    __slots__ = ('threadName', 'state', 'absoluteTime', 'counter', 'rowProcessed', 'bufferSize', 'bufferUsed',
+                 'CPUUtilization', 'jobServerUsed')
+    interned = frozenset(['threadName', 'state', 'bufferSize', 'jobServerUsed'])
+
+
+class ErrorLogEntry(Record):
+    __slots__ = ('ProcessID', 'ThreadID', 'ErrorCode', 'Timestamp', 'Message')
+    interned = frozenset(['ProcessID', 'ThreadID', 'ErrorCode'])
+
+
+class MonitorLogRow(Record):
+    __slots__ = ('PathName', 'State', 'RowCount', 'ElapsedTime', 'AbsoluteTime')
+    interned = frozenset(['PathName', 'State'])
@@ -1,62 +1,50 @@
-from sapdswsdlclient.templates.templates import request_template, headers
-import requests
-from sapdswsdlclient.utilities.clean_xml import clean_xml_response
-from sapdswsdlclient.utilities.check_for_fault_or_error import check_for_fault_or_error
+from sapdswsdlclient.utilities.response_schema import RecordSchema, FieldSchema
 from sapdswsdlclient.server.re_auth import re_logon
+from sapdswsdlclient.server.soap_call import SoapCall, soap_operation
+from sapdswsdlclient.templates.envelope import soap_request
+
+job_server_schema = RecordSchema('JobServerInfo', {'jobServerName': 'jobServerName', 'jobServerHostname': 'jobServer'},
+                                 fault_tags=['ErrorMessage', 'faultstring'])
+job_server_status_schema = FieldSchema({'Status': 'Status'}, fault_tags=['errorMessage', 'faultstring'])
+machine_info_schema = RecordSchema('MachineInfo', {'TimeZone': 'TimeZone', 'TimeZoneShortName': 'TimeZoneShortName',
+                                                   'Offset': 'Offset'},
+                                   fault_tags=['errorMessage', 'faultstring'])
 
 
 class JobServer:
     def __init__(self, server_instance):
         self._server = server_instance
-        self.request_template = request_template
-        self.headers = headers
 
     @re_logon
-
+    @soap_operation
     def get_job_server_list(self, repo_name):
         """
         :param repo_name: name of the repository
         :return: name(s) and hostname(s) of the Job Server(s)
         """
-        request_body = f'''<ser:GetJobServerListRequest>
+        request_body = soap_request('''<ser:GetJobServerListRequest>
                                 <repoName>{repo_name}</repoName>
-                            </ser:GetJobServerListRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_JobServer_List'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:GetJobServerListRequest>''', repo_name=repo_name)
+        response = yield SoapCall('jobAdmin=Get_JobServer_List', request_body)
 
-        check_for_fault_or_error(response, ['ErrorMessage', 'faultstring'])
-
-        root = response.findall('.//JobServerInfo')
-        job_servers = list()
-        for job_server in root:
-            if job_server is not None:
-                job_servers.append({'jobServerName': job_server.find('jobServerName').text,
-                       'jobServerHostname': job_server.find('jobServer').text})
-        return job_servers
+        return job_server_schema.parse(response)
 
 
+    @re_logon
+    @soap_operation
     def get_job_server_status(self, repo_name, job_server):
         """
         :param repo_name: name of the repository
         :param job_server: job server as <jobserver hostname>:<jobserver port>
         :return: job server status
         """
-        request_body = f'''<ser:GetJobServerStatusRequest>
+        request_body = soap_request('''<ser:GetJobServerStatusRequest>
                                 <repoName>{repo_name}</repoName>
                                 <jobServer>{job_server}</jobServer>
-                            </ser:GetJobServerStatusRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_JobServer_Status'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+                            </ser:GetJobServerStatusRequest>''', repo_name=repo_name, job_server=job_server)
+        response = yield SoapCall('jobAdmin=Get_JobServer_Status', request_body)
 
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
-
-        status = response.find('.//Status').text
+        status = job_server_status_schema.parse(response)['Status']
         if status == '0':
             return {'statusCode': status, 'statusMessage': 'Job Server is running'}
         elif status == '1':
@@ -67,23 +55,16 @@ class JobServer:
             return {'statusCode': status, 'statusMessage': None}
 
 
+    @re_logon
+    @soap_operation
     def get_mc_machine_timezone(self):
         """
         :return: time zone of the Management Console machine
         """
-        request_body = f'''<ser:Get_MC_Machine_TimezoneRequest/>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_MC_Machine_Timezone'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
+        request_body = soap_request('''<ser:Get_MC_Machine_TimezoneRequest/>''')
+        response = yield SoapCall('jobAdmin=Get_MC_Machine_Timezone', request_body)
 
-        machine_info = dict()
-        root = response.find('.//MachineInfo')
-        if root is not None:
-            machine_info['TimeZone'] = root.find('TimeZone').text
-            machine_info['TimeZoneShortName'] = root.find('TimeZoneShortName').text
-            machine_info['Offset'] = root.find('Offset').text
-        return machine_info
\ No newline at end of file
+        machine_info = machine_info_schema.parse(response)
+        if machine_info:
+            return machine_info[0]
+        return dict()
@@ -0,0 +1,230 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from datetime import datetime
+from sapdswsdlclient.exceptions.exceptions import LogNotFoundError
+from sapdswsdlclient.models.batch_job import is_terminal
+from sapdswsdlclient.models.logs import log_pages
+
+# error codes such as RUN-050304, object names such as DF_LOAD_SALES and table names such as DWH.SALES
+token_pattern = re.compile(r'[A-Za-z0-9_$#]+(?:[.\-][A-Za-z0-9_$#]+)*')
+letter_pattern = re.compile('[A-Za-z]')
+
+schema = '''
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    repo_name TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    log_type TEXT NOT NULL,
+    run_time REAL NOT NULL,
+    UNIQUE (repo_name, run_id, log_type)
+);
+CREATE INDEX IF NOT EXISTS logs_run_time ON logs (run_time);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    log_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (token, log_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_log_id ON postings (log_id);
+'''
+
+
+def log_tokens(text):
+    """
+    :param text: log text
+    :return: Counter of the upper-case tokens of the text; tokens without a letter, such as times and row counts,
+            are skipped and the parts of dotted names are counted as well
+    """
+    tokens = Counter()
+    for token in token_pattern.findall(text or ''):
+        if len(token) < 2 or letter_pattern.search(token) is None:
+            continue
+        token = token.upper()
+        tokens[token] += 1
+        if '.' in token:
+            for part in token.split('.'):
+                if len(part) > 1 and letter_pattern.search(part) is not None:
+                    tokens[part] += 1
+    return tokens
+
+
+def run_state(run):
+    """
+    :param run: execution record such as those returned by get_by_time_range, run ID record such as those
+                returned by get_run_ids, or (run ID, status) pair
+    :return: (run ID, status, start time or None)
+    """
+    if isinstance(run, Mapping):
+        if 'RunID' in run:
+            return run['RunID'], run['Status'], run.get('StartTime')
+        return run['runID'], run['status'], None
+    if isinstance(run, tuple) and len(run) == 2:
+        return run[0], run[1], None
+    raise TypeError('Runs are given as records or (run ID, status) pairs, as only logs of finished runs are indexed.')
+
+
+def to_timestamp(value):
+    """
+    :param value: datetime, seconds since the epoch, or datetime as YYYY-MM-DD HH:mm:ss
+    :return: seconds since the epoch
+    """
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S').timestamp()
+    return float(value)
+
+
+class LogIndex:
+    def __init__(self, path):
+        """
+        Inverted index of the tokens in error and trace logs of many runs, kept in a SQLite database.
+
+        :param path: file of the database, created if it doesn't exist; ':memory:' keeps the index in memory
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(schema)
+        self._lock = threading.Lock()
+
+
+    def add(self, repo_name, run_id, log_type, text, run_time=None):
+        """
+        Indexes the log of a run, replacing what was indexed for it before.
+
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param log_type: e.g. error or trace
+        :param text: log text, or an iterable of texts such as the pages of the log
+        :param run_time: [Optional] start of the run as datetime, seconds or YYYY-MM-DD HH:mm:ss; defaults to now
+        """
+        if text is None or isinstance(text, str):
+            tokens = log_tokens(text)
+        else:
+            tokens = Counter()
+            for part in text:
+                tokens.update(log_tokens(part))
+        run_time = time.time() if run_time is None else to_timestamp(run_time)
+        with self._lock, self._connection:
+            self._remove(repo_name, str(run_id), log_type)
+            log_id = self._connection.execute(
+                'INSERT INTO logs (repo_name, run_id, log_type, run_time) VALUES (?, ?, ?, ?)',
+                (repo_name, str(run_id), log_type, run_time)).lastrowid
+            self._connection.executemany('INSERT INTO postings (token, log_id, count) VALUES (?, ?, ?)',
+                                         [(token, log_id, count) for token, count in tokens.items()])
+
+
+    def update(self, server, repo_name, runs, log_types=('error', 'trace'), read_ahead: int = 2):
+        """
+        Downloads and indexes the logs of the finished runs that aren't indexed yet. Runs that haven't finished
+        are skipped, as their logs still grow; they are indexed by a later update once they have finished.
+
+        :param server: Server whose logs are indexed; with a log cache, logs read before aren't downloaded again
+        :param repo_name: name of the repository
+        :param runs: iterable of execution records such as those returned by get_by_time_range, run ID records
+                    such as those returned by get_run_ids, or (run ID, status) pairs
+        :param log_types: [Optional] logs to index
+        :param read_ahead: [Optional] number of log pages fetched in the background, see Log.iter_pages
+        :return: number of logs indexed
+        """
+        indexed = 0
+        for run in runs:
+            run_id, status, run_time = run_state(run)
+            if not is_terminal(status):
+                continue
+            for log_type in log_types:
+                if self.contains(repo_name, run_id, log_type):
+                    continue
+                page_text = log_pages[log_type][1]
+                try:
+                    pages = [page_text(log) for _, log in server.log.iter_pages(repo_name, run_id, log_type,
+                                                                               read_ahead=read_ahead)]
+                except LogNotFoundError:
+                    pages = []
+                self.add(repo_name, run_id, log_type, pages, run_time)
+                indexed += 1
+        return indexed
+
+
+    def contains(self, repo_name, run_id, log_type):
+        """
+        :return: True if the log of the run is indexed
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT 1 FROM logs WHERE repo_name = ? AND run_id = ? AND log_type = ?',
+                                           (repo_name, str(run_id), log_type)).fetchone()
+        return row is not None
+
+
+    def search(self, *tokens, since=None, until=None, repo_name=None, log_type=None):
+        """
+        :param tokens: tokens that must all occur in a log, in any case, e.g. 'RUN-050304' or 'DF_LOAD_SALES'
+        :param since: [Optional] earliest run time as datetime, seconds or YYYY-MM-DD HH:mm:ss
+        :param until: [Optional] latest run time as datetime, seconds or YYYY-MM-DD HH:mm:ss
+        :param repo_name: [Optional] name of the repository
+        :param log_type: [Optional] e.g. error or trace
+        :return: list of dicts with repo_name, run_id, log_type, run_time (datetime) and count,
+                the number of occurrences of the tokens, newest run first
+        """
+        tokens = sorted({token.upper() for token in tokens})
+        if not tokens:
+            raise ValueError('At least one token is required.')
+        conditions = [f'p.token IN ({", ".join("?" * len(tokens))})']
+        parameters = list(tokens)
+        for condition, value in (('l.run_time >= ?', since), ('l.run_time <= ?', until)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(to_timestamp(value))
+        for condition, value in (('l.repo_name = ?', repo_name), ('l.log_type = ?', log_type)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        parameters.append(len(tokens))
+        query = f'''SELECT l.repo_name, l.run_id, l.log_type, l.run_time, SUM(p.count)
+                    FROM postings p JOIN logs l ON l.id = p.log_id
+                    WHERE {' AND '.join(conditions)}
+                    GROUP BY l.id HAVING COUNT(*) = ?
+                    ORDER BY l.run_time DESC, l.id DESC'''
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [{'repo_name': repo, 'run_id': run_id, 'log_type': kind, 'run_time': datetime.fromtimestamp(run_time),
+                 'count': count} for repo, run_id, kind, run_time, count in rows]
+
+
+    def remove_before(self, run_time):
+        """
+        Drops the logs of runs that started before run_time.
+
+        :param run_time: datetime, seconds or YYYY-MM-DD HH:mm:ss
+        :return: number of logs dropped
+        """
+        with self._lock, self._connection:
+            log_ids = [row[0] for row in self._connection.execute('SELECT id FROM logs WHERE run_time < ?',
+                                                                  (to_timestamp(run_time),))]
+            self._connection.executemany('DELETE FROM postings WHERE log_id = ?', [(log_id,) for log_id in log_ids])
+            self._connection.executemany('DELETE FROM logs WHERE id = ?', [(log_id,) for log_id in log_ids])
+        return len(log_ids)
+
+
+    def close(self):
+        self._connection.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def _remove(self, repo_name, run_id, log_type):
+        row = self._connection.execute('SELECT id FROM logs WHERE repo_name = ? AND run_id = ? AND log_type = ?',
+                                       (repo_name, run_id, log_type)).fetchone()
+        if row is not None:
+            self._connection.execute('DELETE FROM postings WHERE log_id = ?', row)
+            self._connection.execute('DELETE FROM logs WHERE id = ?', row)
@@ -1,48 +1,146 @@
-from typing import Optional
-import requests
-from sapdswsdlclient.templates.templates import request_template, headers
+import gzip as gzip_module
+import io
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Optional, Literal
+from sapdswsdlclient.exceptions.exceptions import LogNotFoundError
+from sapdswsdlclient.models.batch_job import is_terminal
 from sapdswsdlclient.models.items import MonitorLog, MonitorLogRaw, ErrorLogRaw, TraceLogRaw
-from sapdswsdlclient.utilities.clean_xml import clean_xml_response
-from sapdswsdlclient.utilities.check_for_fault_or_error import check_for_fault_or_error
-from sapdswsdlclient.server.re_auth import re_logon
+from sapdswsdlclient.utilities.columnar import MonitorLogColumns, require_numpy
+from sapdswsdlclient.utilities.response_schema import FieldSchema
+from sapdswsdlclient.utilities.log_file import LogFile
+from sapdswsdlclient.utilities.log_entries import ErrorLog, MonitorLogRows
+from sapdswsdlclient.utilities.log_stream import iter_log_lines, iter_log_text
+from sapdswsdlclient.server.re_auth import re_logon, re_logon_stream
+from sapdswsdlclient.server.soap_call import SoapCall, soap_operation
+from sapdswsdlclient.templates.envelope import soap_request
+
+monitor_log_schema = FieldSchema({'ReturnCode': 'returnCode', 'monitor': 'monitor'})
+error_log_schema = FieldSchema({'ReturnCode': 'returnCode', 'error': 'error'})
+trace_log_schema = FieldSchema({'ReturnCode': 'returnCode', 'trace': 'trace'})
+
+# log type -> request, SOAP action and schema of its Get_*_Log call
+log_calls = {'monitor': ('Get_Monitor_LogRequest', 'jobAdmin=Get_Monitor_Log', monitor_log_schema),
+             'error': ('Get_Error_LogRequest', 'jobAdmin=Get_Error_Log', error_log_schema),
+             'trace': ('Get_Trace_LogRequest', 'jobAdmin=Get_Trace_Log', trace_log_schema)}
+# log type -> method fetching a page, text of a fetched page
+log_pages = {'monitor': ('get_monitor_log', lambda log: log['MonitorLogRawMessage'].monitor_log_raw_data),
+             'error': ('get_error_log', lambda log: log['errorLogMessage'].error_log_raw_data),
+             'trace': ('get_trace_log', lambda log: log['traceLogMessage'].trace_log_raw_data)}
+
+
+def split_lines(text):
+    """
+    :return: lines of text without line breaks; a final line break doesn't start another line
+    """
+    lines = text.split('\n')
+    if text.endswith('\n'):
+        lines.pop()
+    return lines
+
+
+def log_request_body(request_name, repo_name, run_id, page):
+    return soap_request('''<ser:{request_name}>
+                    <repoName>{repo_name}</repoName>
+                    <runID>{run_id}</runID>
+                    <page>{page}</page>
+                </ser:{request_name}>''', request_name=request_name, repo_name=repo_name, run_id=run_id, page=page)
+
+
+def log_text(server, log_type, repo_name, run_id, page):
+    """
+    Operation step downloading the text of a log page, or reading it from the log cache of the server.
+
+    :return: return code and text of the log page; cached pages were returned with code 0
+    :raises LogNotFoundError: if the server returns code 1
+    """
+    cache = server.log_cache
+    if cache is not None:
+        hit, text = cache.get(server.wsdl_url, repo_name, run_id, log_type, page)
+        if hit:
+            return '0', text
+    request_name, soap_action, schema = log_calls[log_type]
+    response = yield SoapCall(soap_action, log_request_body(request_name, repo_name, run_id, page))
+
+    values = schema.parse(response)
+    if values['ReturnCode'] == '1':
+        raise LogNotFoundError(values[log_type])
+    if cache is not None and values['ReturnCode'] == '0':
+        cache.put(server.wsdl_url, repo_name, run_id, log_type, page, values[log_type])
+    return values['ReturnCode'], values[log_type]
+
+
+def write_log(parts, file, gzip: bool = False):
+    """
+    :param parts: iterable of str parts of a log
+    :param file: writable binary or text file object, left open
+    :param gzip: [Optional] compress what is written to a binary file object
+    :return: number of characters written
+    """
+    if isinstance(file, io.TextIOBase):
+        if gzip:
+            raise ValueError('gzip requires a binary file object.')
+        write = file.write
+    elif gzip:
+        compressed = gzip_module.GzipFile(fileobj=file, mode='wb')
+        write = lambda text: compressed.write(text.encode('utf-8'))
+    else:
+        write = lambda text: file.write(text.encode('utf-8'))
+    written = 0
+    for text in parts:
+        write(text)
+        written += len(text)
+    if gzip:
+        compressed.close()
+    return written
+
+
+def file_result(log_type):
+    """
+    Adds as_file to a Get_*_Log method: with as_file=True the log is streamed into a memory-mapped LogFile
+    instead of being parsed into a string.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, repo_name, run_id, page: Optional[int] = None, as_file: bool = False):
+            if as_file:
+                return self.get_log_file(repo_name, run_id, log_type, page)
+            return method(self, repo_name, run_id, page)
+        return wrapper
+    return decorator
 
 
 class Log:
     def __init__(self, server_instance):
         self._server = server_instance
-        self.request_template = request_template
-        self.headers = headers
 
     @re_logon
-
-    def get_monitor_log(self, repo_name, run_id, page: Optional[int] = None):
+    @soap_operation
+    def get_monitor_log(self, repo_name, run_id, page: Optional[int] = None, columnar: bool = False):
         """
         :param repo_name: name of the repository
         :param run_id: run ID of the batch job instance
         :param page: [Optional] page number of the monitor log
+        :param columnar: [Optional] return the rows as MonitorLogColumns of NumPy arrays under 'MonitorLogColumns'
+                        instead of 'MonitorLogMessage'; requires numpy
         :return: the monitor log data
         """
-        request_body = f'''<ser:Get_Monitor_LogRequest>
-                                <repoName>{repo_name}</repoName>
-                                <runID>{run_id}</runID>
-                                <page>{page}</page>
-                            </ser:Get_Monitor_LogRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_Monitor_Log'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['faultstring'])
+        if columnar:
+            require_numpy()
+        return_code, monitor_log_data = yield from log_text(self._server, 'monitor', repo_name, run_id, page)
 
         monitor_log = dict()
 
-        monitor_log['ReturnCode'] = response.find('.//returnCode').text
-        if monitor_log['ReturnCode'] == '1':
-            error_message = response.find('.//monitor').text
-            raise ValueError(error_message)
+        monitor_log['ReturnCode'] = return_code
+        if columnar:
+            monitor_log['MonitorLogColumns'] = MonitorLogColumns.from_text(monitor_log_data or '')
+            monitor_log['MonitorLogRawMessage'] = MonitorLogRaw(monitor_log_data)
+            return monitor_log
 
-        monitor_log_data = response.find('.//monitor').text
         if monitor_log_data is None:
             monitor_log_instance = MonitorLog(None)
             monitor_log_raw_instance = MonitorLogRaw(None)
@@ -50,95 +148,255 @@ class Log:
             monitor_log['MonitorLogRawMessage'] = monitor_log_raw_instance
             return monitor_log
 
-        monitor_log_message = monitor_log_data.split('\n')
-        monitor_log_list = list()
-        for row in monitor_log_message:
-            if len(row):
-                monitor_log_dict = dict()
-                row_list = row.split(', ')
-                monitor_log_dict['PathName'] = row_list[0]
-                monitor_log_dict['State'] = row_list[1]
-                monitor_log_dict['RowCount'] = row_list[2]
-                monitor_log_dict['ElapsedTime'] = row_list[3]
-                monitor_log_dict['AbsoluteTime'] = row_list[4]
-                monitor_log_list.append(monitor_log_dict)
-        monitor_log_instance = MonitorLog(monitor_log_list)
-        monitor_log['MonitorLogMessage'] = monitor_log_instance
+        monitor_log_instance = MonitorLog(list(MonitorLogRows(monitor_log_data)))
         monitor_log_raw_instance = MonitorLogRaw(monitor_log_data)
         monitor_log['MonitorLogMessage'] = monitor_log_instance
         monitor_log['MonitorLogRawMessage'] = monitor_log_raw_instance
         return monitor_log
 
 
+    @file_result('error')
+    @re_logon
+    @soap_operation
     def get_error_log(self, repo_name, run_id, page: Optional[int] = None):
         """
         :param repo_name: name of the repository
         :param run_id: run ID of the batch job instance
         :param page: [Optional] page number of the error log
-        :return: the error log data
+        :param as_file: [Optional] return the log as a LogFile backed by a memory-mapped temporary file instead
+        :return: the error log data, or a LogFile if as_file is True;
+                'errorLogEntries' holds the entries as an ErrorLog parsed on access
         """
-        request_body = f'''<ser:Get_Error_LogRequest>
-                                <repoName>{repo_name}</repoName>
-                                <runID>{run_id}</runID>
-                                <page>{page}</page>
-                            </ser:Get_Error_LogRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_Error_Log'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+        return_code, error_log_data = yield from log_text(self._server, 'error', repo_name, run_id, page)
 
-        response = clean_xml_response(response.text)
+        error_log = dict()
 
-        check_for_fault_or_error(response, ['faultstring'])
+        error_log['ReturnCode'] = return_code
+        error_log['errorLogMessage'] = ErrorLogRaw(error_log_data)
+        error_log['errorLogEntries'] = ErrorLog(error_log_data)
+        return error_log
 
-        error_log = dict()
 
-        error_log['ReturnCode'] = response.find('.//returnCode').text
-        if error_log['ReturnCode'] == '1':
-            error_message = response.find('.//error').text
-            raise ValueError(error_message)
+    @file_result('trace')
+    @re_logon
+    @soap_operation
+    def get_trace_log(self, repo_name, run_id, page: Optional[int] = None):
+        """
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param page: [Optional] page number of the trace log
+        :param as_file: [Optional] return the log as a LogFile backed by a memory-mapped temporary file instead
+        :return: the trace log data, or a LogFile if as_file is True
+        """
+        return_code, trace_log_data = yield from log_text(self._server, 'trace', repo_name, run_id, page)
 
-        error_log_data = response.find('.//error')
-        if error_log_data is not None:
-            error_log_instance = ErrorLogRaw(error_log_data.text)
-        else:
-            error_log_instance = ErrorLogRaw(None)
+        trace_log = dict()
 
-        error_log['errorLogMessage'] = error_log_instance
-        return error_log
+        trace_log['ReturnCode'] = return_code
+        trace_log['traceLogMessage'] = TraceLogRaw(trace_log_data)
+        return trace_log
 
 
-    def get_trace_log(self, repo_name, run_id, page: Optional[int] = None):
+    @re_logon_stream
+    def iter_error_log(self, repo_name, run_id, page: Optional[int] = None, chunk_size: int = 65536):
+        """
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param page: [Optional] page number of the error log
+        :param chunk_size: [Optional] number of bytes read from the connection at a time
+        :return: generator of error log lines, parsed while the response is downloaded
+        """
+        request_body = log_request_body('Get_Error_LogRequest', repo_name, run_id, page)
+        chunks = self._server.stream(SoapCall('jobAdmin=Get_Error_Log', request_body), chunk_size)
+        return iter_log_lines(chunks, 'error')
+
+
+    @re_logon_stream
+    def iter_trace_log(self, repo_name, run_id, page: Optional[int] = None, chunk_size: int = 65536):
         """
         :param repo_name: name of the repository
         :param run_id: run ID of the batch job instance
         :param page: [Optional] page number of the trace log
-        :return: the trace log data
+        :param chunk_size: [Optional] number of bytes read from the connection at a time
+        :return: generator of trace log lines, parsed while the response is downloaded
         """
-        request_body = f'''<ser:Get_Trace_LogRequest>
-                                <repoName>{repo_name}</repoName>
-                                <runID>{run_id}</runID>
-                                <page>{page}</page>
-                            </ser:Get_Trace_LogRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'jobAdmin=Get_Trace_Log'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
+        request_body = log_request_body('Get_Trace_LogRequest', repo_name, run_id, page)
+        chunks = self._server.stream(SoapCall('jobAdmin=Get_Trace_Log', request_body), chunk_size)
+        return iter_log_lines(chunks, 'trace')
 
-        response = clean_xml_response(response.text)
 
-        check_for_fault_or_error(response, ['faultstring'])
+    def download(self, repo_name, run_id, log_type: Literal['monitor', 'error', 'trace'], target,
+                 page: Optional[int] = None, gzip: bool = False, chunk_size: int = 65536):
+        """
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param log_type: the options are monitor, error, trace
+        :param target: path of the file to write, or a writable binary or text file object
+        :param page: [Optional] page number of the log
+        :param gzip: [Optional] write the log gzip-compressed
+        :param chunk_size: [Optional] number of bytes read from the connection at a time
+        :return: number of characters of the log written; the log is written while it is downloaded,
+                so memory use doesn't grow with its size
+        """
+        if log_type not in log_calls:
+            raise ValueError(f'Unknown log type {log_type!r}, the options are {", ".join(log_calls)}.')
+        parts = self._iter_log_text(repo_name, run_id, log_type, page, chunk_size)
+        if isinstance(target, (str, os.PathLike)):
+            try:
+                file = open(target, 'wb')
+            except BaseException:
+                parts.close()
+                raise
+            try:
+                with file:
+                    return write_log(parts, file, gzip)
+            except BaseException:
+                # a partly written log is not left behind
+                os.remove(target)
+                raise
+        return write_log(parts, target, gzip)
 
-        trace_log = dict()
 
-        trace_log['ReturnCode'] = response.find('.//returnCode').text
-        if trace_log['ReturnCode'] == '1':
-            error_message = response.find('.//trace').text
-            raise ValueError(error_message)
+    @re_logon_stream
+    def _iter_log_text(self, repo_name, run_id, log_type, page, chunk_size):
+        """
+        :return: generator of the parts of the log text, parsed while the response is downloaded
+        """
+        request_name, soap_action, _ = log_calls[log_type]
+        request_body = log_request_body(request_name, repo_name, run_id, page)
+        return iter_log_text(self._server.stream(SoapCall(soap_action, request_body), chunk_size), log_type)
+
+
+    def get_log_file(self, repo_name, run_id, log_type: Literal['monitor', 'error', 'trace'],
+                     page: Optional[int] = None, chunk_size: int = 65536):
+        """
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param log_type: the options are monitor, error, trace
+        :param page: [Optional] page number of the log
+        :param chunk_size: [Optional] number of bytes read from the connection at a time
+        :return: LogFile of the log, streamed into a temporary file that is deleted when the LogFile is closed
+        """
+        file = tempfile.TemporaryFile()
+        try:
+            self.download(repo_name, run_id, log_type, file, page=page, chunk_size=chunk_size)
+        except BaseException:
+            file.close()
+            raise
+        return LogFile(file)
+
+
+    def iter_pages(self, repo_name, run_id, log_type: Literal['monitor', 'error', 'trace'],
+                   first_page: int = 1, read_ahead: int = 2):
+        """
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param log_type: the options are monitor, error, trace
+        :param first_page: [Optional] page number to start from
+        :param read_ahead: [Optional] number of following pages fetched in the background
+                            while the current page is consumed; 0 fetches one page at a time
+        :return: generator of (page number, log data as returned by get_monitor_log / get_error_log / get_trace_log);
+                it ends before the first page that is empty, repeats the previous page or isn't found
+        """
+        if log_type not in log_pages:
+            raise ValueError(f'Unknown log type {log_type!r}, the options are {", ".join(log_pages)}.')
+        if read_ahead < 0:
+            raise ValueError('read_ahead must not be negative.')
+        return self._iter_pages(repo_name, run_id, log_type, first_page, read_ahead)
+
+
+    def _iter_pages(self, repo_name, run_id, log_type, first_page, read_ahead):
+        method_name, page_text = log_pages[log_type]
+        fetch = getattr(self, method_name)
+        executor = ThreadPoolExecutor(max_workers=read_ahead + 1, thread_name_prefix='sapds-log-pages')
+        pending = deque()
+        next_page = first_page
+        previous_text = None
+        try:
+            while True:
+                while len(pending) <= read_ahead:
+                    pending.append(executor.submit(fetch, repo_name, run_id, next_page))
+                    next_page += 1
+                page = next_page - len(pending)
+                try:
+                    log = pending.popleft().result()
+                except LogNotFoundError:
+                    if page == first_page:
+                        raise
+                    return
+                text = page_text(log)
+                if not text or text == previous_text:
+                    return
+                previous_text = text
+                yield page, log
+        finally:
+            # pages fetched beyond the last one are dropped
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+    def follow(self, repo_name, run_id, job_name, log_type: Literal['monitor', 'error', 'trace'] = 'trace',
+               poll: float = 2, max_poll: float = 30, timeout: Optional[float] = None):
+        """
+        :param repo_name: name of the repository
+        :param run_id: run ID of the batch job instance
+        :param job_name: name of the job, used to check the status of the run
+        :param log_type: [Optional] the options are monitor, error, trace
+        :param poll: [Optional] seconds between polls while new lines keep arriving
+        :param max_poll: [Optional] longest wait between polls; the wait grows towards it while the log is idle
+        :param timeout: [Optional] seconds after which TimeoutError is raised if the run hasn't finished
+        :return: generator of the log lines added since the previous poll, ending once the run has
+                finished and its log is read to the end
+        """
+        if log_type not in log_pages:
+            raise ValueError(f'Unknown log type {log_type!r}, the options are {", ".join(log_pages)}.')
+        if poll < 0 or max_poll < poll:
+            raise ValueError('poll must not be negative nor greater than max_poll.')
+        return self._follow(repo_name, run_id, job_name, log_type, poll, max_poll, timeout)
+
+
+    def _page_text(self, log_type, repo_name, run_id, page):
+        """
+        :return: text of a log page, empty if the page doesn't exist (yet)
+        """
+        method_name, page_text = log_pages[log_type]
+        try:
+            return page_text(getattr(self, method_name)(repo_name, run_id, page)) or ''
+        except LogNotFoundError:
+            return ''
 
-        trace_log_data = response.find('.//trace')
-        if trace_log_data is not None:
-            error_log_instance = TraceLogRaw(trace_log_data.text)
-        else:
-            error_log_instance = TraceLogRaw(None)
 
-        trace_log['traceLogMessage'] = error_log_instance
-        return trace_log
\ No newline at end of file
+    def _follow(self, repo_name, run_id, job_name, log_type, poll, max_poll, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = poll
+        # only the last page seen is downloaded again, and only lines past offset are handed out
+        page, offset = 1, 0
+        while True:
+            details = self._server.batch_job.get_run_exe_detail(repo_name, job_name, run_id)
+            finished = is_terminal(details['Status'])
+            grew = False
+            text = self._page_text(log_type, repo_name, run_id, page)
+            while True:
+                # the last line of a running job's log may still be incomplete
+                complete = len(text) if finished else text.rfind('\n') + 1
+                if complete > offset:
+                    yield from split_lines(text[offset:complete])
+                    offset = complete
+                    grew = True
+                if grew and not finished:
+                    break
+                following = self._page_text(log_type, repo_name, run_id, page + 1)
+                # servers ignoring the page number return the same page again
+                if not following or following == text:
+                    break
+                # the page is complete once the next one exists
+                if offset < len(text):
+                    yield from split_lines(text[offset:])
+                page, offset, text = page + 1, 0, following
+            if finished:
+                return
+            interval = poll if grew else min(max_poll, interval * 1.5)
+            if deadline is not None and time.monotonic() + interval > deadline:
+                raise TimeoutError(f'Run ID {run_id} of {job_name} in {repo_name} did not finish in {timeout} seconds.')
+            time.sleep(interval)
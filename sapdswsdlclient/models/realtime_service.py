@@ -1,58 +1,47 @@
-import requests
-from sapdswsdlclient.templates.templates import request_template, headers
-from sapdswsdlclient.utilities.clean_xml import clean_xml_response
 from sapdswsdlclient.utilities.check_for_fault_or_error import check_for_fault_or_error
+from sapdswsdlclient.utilities.response_schema import RecordSchema
 from typing import Literal
 from sapdswsdlclient.server.re_auth import re_logon
+from sapdswsdlclient.server.soap_call import SoapCall, soap_operation
+from sapdswsdlclient.templates.envelope import soap_request, Raw
+
+access_server_schema = RecordSchema('AccessServerInfo', {
+    'AsName': 'AsName', 'MachineName': 'MachineName', 'Port': 'Port', 'UseSSLProtocol': 'UseSSLProtocol',
+    'Status': 'Status'}, fault_tags=['ErrorMessage', 'faultstring'])
 
 
 class RealtimeService:
     def __init__(self, server_instance):
         self._server = server_instance
-        self.request_template = request_template
-        self.headers = headers
 
     @re_logon
-
+    @soap_operation
     def get_as_info(self):
         """
         :return: Access Server information
         """
-        request_body = f'''<ser:GetAccessServerInfoRequest/>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'serviceAdmin=Get_AS_Info'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+        request_body = soap_request('''<ser:GetAccessServerInfoRequest/>''')
+        response = yield SoapCall('serviceAdmin=Get_AS_Info', request_body)
 
-        check_for_fault_or_error(response, ['ErrorMessage', 'faultstring'])
-
-        as_info = dict()
-        root = response.find('.//AccessServerInfo')
-        if root is not None:
-            as_info['AsName'] = root.find('AsName').text
-            as_info['MachineName'] = root.find('MachineName').text
-            as_info['Port'] = root.find('Port').text
-            as_info['UseSSLProtocol'] = root.find('UseSSLProtocol').text
-            as_info['Status'] = root.find('Status').text
-        return as_info
+        as_info = access_server_schema.parse(response)
+        if as_info:
+            return as_info[0]
+        return dict()
 
 
+    @re_logon
+    @soap_operation
     def get_rt_msg_format(self, service_name, selector: Literal['in', 'out']):
         """
         :param service_name: name of the real-time service
         :param selector: whether the input or output schema for the service is returned
         :return: the input/output format for a real-time service
         """
-        request_body = f'''<ser:Get_RTMsg_FormatRequest>
+        request_body = soap_request('''<ser:Get_RTMsg_FormatRequest>
                                 <serviceName>{service_name}</serviceName>
                                 <selector>{selector}</selector>
-                            </ser:Get_RTMsg_FormatRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'serviceAdmin=Get_RTMsg_Format'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Get_RTMsg_FormatRequest>''', service_name=service_name, selector=selector)
+        response = yield SoapCall('serviceAdmin=Get_RTMsg_Format', request_body)
 
         check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
 
@@ -76,16 +65,14 @@ class RealtimeService:
         return msg_format
 
 
+    @re_logon
+    @soap_operation
     def get_rt_service_list(self):
         """
         :return: list of the names of published real-time services
         """
-        request_body = f'''<ser:Get_RTService_ListRequest/>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'serviceAdmin=Get_RTService_List'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+        request_body = soap_request('''<ser:Get_RTService_ListRequest/>''')
+        response = yield SoapCall('serviceAdmin=Get_RTService_List', request_body)
 
         check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
 
@@ -96,21 +83,20 @@ class RealtimeService:
         return rt_service_list
 
 
+    @re_logon(retry=False)
+    @soap_operation
     def run_rt_service(self, service_name, xml_input):
         """
         :param service_name: name of the realtime service
         :param xml_input: XML input content used to start the real-time service
         :return: error message if there is any and XML output content returned by the realtime service
         """
-        request_body = f'''<ser:Run_Realtime_ServiceRequest>
+        request_body = soap_request('''<ser:Run_Realtime_ServiceRequest>
                                 <serviceName>{service_name}</serviceName>
                                 <xmlInput>{xml_input}</xmlInput>
-                            </ser:Run_Realtime_ServiceRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'serviceAdmin=Run_Realtime_Service'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Run_Realtime_ServiceRequest>''', service_name=service_name,
+                                    xml_input=Raw(xml_input))
+        response = yield SoapCall('serviceAdmin=Run_Realtime_Service', request_body)
 
         check_for_fault_or_error(response, ['faultstring'])
 
@@ -1,49 +1,79 @@
+import os
+from contextlib import closing
 from typing import Optional, Literal
-import requests
-from sapdswsdlclient.templates.templates import request_template, headers
 from sapdswsdlclient.models.items import TraceMessage, ErrorMessage
-from sapdswsdlclient.utilities.clean_xml import clean_xml_response, clean_xml_request
+from sapdswsdlclient.utilities.clean_xml import clean_xml_request, iter_clean_xml_request
 from sapdswsdlclient.utilities.check_for_fault_or_error import check_for_fault_or_error
+from sapdswsdlclient.utilities.concurrency import run_concurrently
+from sapdswsdlclient.utilities.metadata_cache import invalidate_metadata
+from sapdswsdlclient.utilities.response_schema import RecordSchema
 from sapdswsdlclient.server.re_auth import re_logon
+from sapdswsdlclient.server.soap_call import SoapCall, soap_operation
+from sapdswsdlclient.templates.envelope import soap_request, Raw, Chunks
+
+repository_schema = RecordSchema('repository', {
+    'repoName': 'repoName', 'repoType': 'repoType', 'dbType': 'dbType', 'dbHost': 'dbHost',
+    'connectionStatus': 'connectionStatus', 'username': 'username', 'permissions': 'permissions'},
+    fault_tags=['errorMessage', 'faultstring'])
+
+
+def iter_definition(xml_path, chunk_size):
+    """
+    :param xml_path: path to the xml file of the object
+    :param chunk_size: number of characters read at a time
+    :return: generator of str parts of the object definition, without the XML declaration
+    """
+    with open(xml_path, 'r') as f:
+        definition = f.read(chunk_size)
+        while len(definition) < len('<?xml') or definition.startswith('<?xml') and '?>' not in definition:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            definition += chunk
+        if definition.startswith('<?xml'):
+            end_index = definition.find('?>')
+            if end_index != -1:
+                definition = definition[end_index + 2:].lstrip()
+                while not definition:
+                    definition = f.read(chunk_size)
+                    if not definition:
+                        return
+                    definition = definition.lstrip()
+        while definition:
+            yield definition
+            definition = f.read(chunk_size)
+
+
+def until_failed_import(results):
+    """
+    :param results: generator of (path, status of the import, error)
+    :return: generator of the results up to and including the first failed import; pending imports are cancelled
+    """
+    with closing(results):
+        for path, imported_object, error in results:
+            yield path, imported_object, error
+            if error is not None or imported_object.get('returnCode') != '0':
+                return
 
 
 class Repo:
     def __init__(self, server_instance):
         self._server = server_instance
-        self.request_template = request_template
-        self.headers = headers
 
     @re_logon
-
+    @soap_operation
     def get_repo_list(self):
         """
         :return: list of the repositories with their attributes available for the authenticated user
         """
-        request_body = f'''<ser:Get_Repository_ListRequest/>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'repoAdmin=Get_Repository_List'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
-
-        check_for_fault_or_error(response, ['errorMessage', 'faultstring'])
-
-        repo_list = list()
-        root = response.findall('.//repository')
-        if root is not None:
-            for repo in root:
-                repo_attr = dict()
-                repo_attr['repoName'] = repo.find('repoName').text
-                repo_attr['repoType'] = repo.find('repoType').text
-                repo_attr['dbType'] = repo.find('dbType').text
-                repo_attr['dbHost'] = repo.find('dbHost').text
-                repo_attr['connectionStatus'] = repo.find('connectionStatus').text
-                repo_attr['username'] = repo.find('username').text
-                repo_attr['permissions'] = repo.find('permissions').text
-                repo_list.append(repo_attr)
-        return repo_list
+        request_body = soap_request('''<ser:Get_Repository_ListRequest/>''')
+        response = yield SoapCall('repoAdmin=Get_Repository_List', request_body)
+
+        return repository_schema.parse(response)
 
 
+    @re_logon
+    @soap_operation
     def validate_repo_object(self, obj_name, obj_type, repo_name, parameter, system_profile: Optional[str] = '',
                              job_server: Optional[str] = '', server_group: Optional[str] = '',
                              substitution_parameters: Optional[complex] = '', trace_on: Literal[0, 1] = ''):
@@ -65,7 +95,7 @@ class Repo:
         if job_server and server_group:
             raise ValueError('You can only specify either Job Server or Server Group, not both.')
 
-        request_body = f'''<ser:Validate_Repo_ObjectRequest>
+        request_body = soap_request('''<ser:Validate_Repo_ObjectRequest>
                                 <objName>{obj_name}</objName>
                                 <objType>{obj_type}</objType>
                                 <repoName>{repo_name}</repoName>
@@ -75,17 +105,16 @@ class Repo:
                                 <substitutionParameters>{substitution_parameters}</substitutionParameters>    
                                 <parameter>{parameter}</parameter>
                                 <traceOn>{trace_on}</traceOn>
-                        </ser:Validate_Repo_ObjectRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'repoAdmin=Validate_Repo_Object'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                        </ser:Validate_Repo_ObjectRequest>''', obj_name=obj_name, obj_type=obj_type,
+                                    repo_name=repo_name, system_profile=system_profile, job_server=job_server,
+                                    server_group=server_group, substitution_parameters=Raw(substitution_parameters),
+                                    parameter=Raw(parameter), trace_on=trace_on)
+        response = yield SoapCall('repoAdmin=Validate_Repo_Object', request_body)
 
         check_for_fault_or_error(response, ['faultstring'])
 
         validated_object = dict()
-        return_code = response.find('.//returnCode').text
+        return_code = response.findtext('.//returnCode')
         validated_object['returnCode'] = return_code
 
         if return_code == '0':
@@ -110,6 +139,8 @@ class Repo:
         return validated_object
 
 
+    @re_logon(retry=False)
+    @soap_operation
     def delete_repo_object(self, obj_name, obj_type, repo_name, job_server: Optional[str] = '',
                            server_group: Optional[str] = '', trace_on: Literal[0, 1] = ''):
         """
@@ -127,23 +158,22 @@ class Repo:
         if job_server and server_group:
             raise ValueError('You can only specify either Job Server or Server Group, not both.')
 
-        request_body = f'''<ser:Delete_Repo_ObjectsRequest>
+        request_body = soap_request('''<ser:Delete_Repo_ObjectsRequest>
                                 <objName objType='{obj_type}'>{obj_name}</objName>
                                 <repoName>{repo_name}</repoName>
                                 <jobServer>{job_server}</jobServer>
                                 <serverGroup>{server_group}</serverGroup>
                                 <traceOn>{trace_on}</traceOn>
-                            </ser:Delete_Repo_ObjectsRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'repoAdmin=Delete_Repo_Objects'
-        response = requests.post(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Delete_Repo_ObjectsRequest>''', obj_type=obj_type, obj_name=obj_name,
+                                    repo_name=repo_name, job_server=job_server, server_group=server_group,
+                                    trace_on=trace_on)
+        response = yield SoapCall('repoAdmin=Delete_Repo_Objects', request_body, method='post')
+        invalidate_metadata(self._server, repo_name)
 
         check_for_fault_or_error(response, ['faultstring'])
 
         result = dict()
-        result['returnCode'] = response.find('.//returnCode').text
+        result['returnCode'] = response.findtext('.//returnCode')
 
         if result['returnCode'] == '0':
             result['returnMessage'] = 'The operation completed successfully'
@@ -167,21 +197,19 @@ class Repo:
         return result
 
 
+    @re_logon
+    @soap_operation
     def export_dq_report(self, repo_name, run_id):
         """
         :param repo_name: name of the repository
         :param run_id: run ID of the batch job instance
         :return: information about the exported data quality report
         """
-        request_body = f'''<ser:Export_DQReportRequest>
+        request_body = soap_request('''<ser:Export_DQReportRequest>
                                 <repoName>{repo_name}</repoName>
                                 <runID>{run_id}</runID>
-                            </ser:Export_DQReportRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-        self.headers['SOAPAction'] = 'repoAdmin=Export_DQReport'
-        response = requests.get(self._server.wsdl_url, data=request, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                            </ser:Export_DQReportRequest>''', repo_name=repo_name, run_id=run_id)
+        response = yield SoapCall('repoAdmin=Export_DQReport', request_body)
 
         check_for_fault_or_error(response, ['faultstring'])
 
@@ -210,8 +238,11 @@ class Repo:
         return exported
 
 
+    @re_logon(retry=False)
+    @soap_operation
     def import_object(self, repo_name, xml_path, passphrase, trace_on: Literal[0, 1] = '',
-                      job_server: Optional[str] = '', server_group: Optional[str] = ''):
+                      job_server: Optional[str] = '', server_group: Optional[str] = '',
+                      chunk_size: Optional[int] = None):
         """
         :param repo_name: name of the repository
         :param xml_path: path to the xml file of the object to import
@@ -221,34 +252,36 @@ class Repo:
                             can't be specified if serverGroup is also specified
         :param server_group: [Optional] name of the server group associated with the repository;
                             can't be specified if jobServer is also specified.
+        :param chunk_size: [Optional] number of characters read from the file at a time; the definition is then
+                            cleaned and sent chunked while the file is read instead of being loaded whole
         :return: status of the operation to import the object
         """
         if job_server and server_group:
             raise ValueError('You can only specify either Job Server or Server Group, not both.')
 
-        with open(xml_path, 'r') as f:
-            definition = f.read()
-        if definition.startswith('<?xml'):
-            end_index = definition.find('?>')
-            if end_index != -1:
-                definition = definition[end_index + 2:].lstrip()
-
-        definition = clean_xml_request(definition)
-        request_body = f'''<ser:ImportObjectDefinitionRequest>
+        if chunk_size:
+            definition = Chunks(iter_clean_xml_request(iter_definition(xml_path, chunk_size)))
+        else:
+            with open(xml_path, 'r') as f:
+                definition = f.read()
+            if definition.startswith('<?xml'):
+                end_index = definition.find('?>')
+                if end_index != -1:
+                    definition = definition[end_index + 2:].lstrip()
+
+            definition = Raw(clean_xml_request(definition))
+        request_body = soap_request('''<ser:ImportObjectDefinitionRequest>
                             <repoName>{repo_name}</repoName>
                             <definition>{definition}</definition>
                             <jobServer>{job_server}</jobServer>
                             <serverGroup>{server_group}</serverGroup>
                             <passphrase>{passphrase}</passphrase>
                             <traceOn>{trace_on}</traceOn>
-                        </ser:ImportObjectDefinitionRequest>'''
-        request = self.request_template.format(session_id=self._server.session_id, request_body=request_body)
-
-        encoded_data = request.encode('utf-8-sig')
-        self.headers['SOAPAction'] = 'repoAdmin=Import_Repo_Object'
-        response = requests.post(self._server.wsdl_url, data=encoded_data, headers=self.headers)
-
-        response = clean_xml_response(response.text)
+                        </ser:ImportObjectDefinitionRequest>''', repo_name=repo_name, definition=definition,
+                                    job_server=job_server, server_group=server_group, passphrase=passphrase,
+                                    trace_on=trace_on)
+        response = yield SoapCall('repoAdmin=Import_Repo_Object', request_body, method='post', encoding='utf-8-sig')
+        invalidate_metadata(self._server, repo_name)
 
         check_for_fault_or_error(response, ['faultstring'])
 
@@ -275,4 +308,44 @@ class Repo:
             trace_instance = TraceMessage(None)
         imported_object['traceMessage'] = trace_instance
 
-        return imported_object
\ No newline at end of file
+        return imported_object
+
+
+    def import_objects(self, repo_name, paths_or_dir, passphrase, max_workers: Optional[int] = None,
+                       stop_on_error: bool = False, trace_on: Literal[0, 1] = '', job_server: Optional[str] = '',
+                       server_group: Optional[str] = '', chunk_size: Optional[int] = None):
+        """
+        :param repo_name: name of the repository
+        :param paths_or_dir: directory whose .xml files are imported, path to one xml file, or iterable of paths to xml files
+        :param passphrase: passphrase for the xml files
+        :param max_workers: [Optional] number of concurrent imports; defaults to the connection pool size
+        :param stop_on_error: [Optional] stop at the first file that raises or isn't imported with returnCode 0;
+                            files that haven't started yet are skipped
+        :param trace_on: [Optional] if 1, enables tracing for the operations
+        :param job_server: [Optional] name of the job server associated with the repository;
+                            can't be specified if serverGroup is also specified
+        :param server_group: [Optional] name of the server group associated with the repository;
+                            can't be specified if jobServer is also specified.
+        :param chunk_size: [Optional] stream every file in parts of this many characters, see import_object
+        :return: generator of (path, status of the import, error) in completion order;
+                error is the exception raised for that file or None
+        """
+        if job_server and server_group:
+            raise ValueError('You can only specify either Job Server or Server Group, not both.')
+
+        if isinstance(paths_or_dir, (str, os.PathLike)):
+            if os.path.isdir(paths_or_dir):
+                paths = sorted(os.path.join(paths_or_dir, name) for name in os.listdir(paths_or_dir)
+                               if name.lower().endswith('.xml'))
+            else:
+                # a single file, not an iterable of paths
+                paths = [paths_or_dir]
+        else:
+            paths = list(paths_or_dir)
+
+        results = run_concurrently(lambda path: self.import_object(repo_name, path, passphrase, trace_on, job_server,
+                                                                   server_group, chunk_size),
+                                   paths, max_workers or self._server.transport.pool_size)
+        if stop_on_error:
+            return until_failed_import(results)
+        return results
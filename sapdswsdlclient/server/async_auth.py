@@ -0,0 +1,111 @@
+import asyncio
+from typing import Optional
+from sapdswsdlclient.models.async_models import (AsyncBatchJob, AsyncJobServer, AsyncDataflow, AsyncLog,
+                                                 AsyncRepo, AsyncRealtimeService)
+from sapdswsdlclient.server.async_transport import AsyncTransport
+from sapdswsdlclient.server.base import BaseServer
+from sapdswsdlclient.server.soap_call import build_request, parse_response
+from sapdswsdlclient.templates.templates import soap_headers
+from sapdswsdlclient.utilities.metadata_cache import MetadataCache
+
+
+class AsyncServer(BaseServer):
+    def __init__(self, wsdl_url, username, password, cms_system, cms_authentication,
+                 pool_size: int = 10, timeout=(10, 300), session_ttl: float = 300,
+                 metadata_cache: Optional[MetadataCache] = None):
+        """
+        Same API as Server, but every method is a coroutine running on a non-blocking aiohttp transport.
+
+        :param wsdl_url: WSDL file URL
+        :param username: username
+        :param password: password
+        :param cms_system: job server's hostname
+        :param cms_authentication: the options are 'secEnterprise', 'secLDAP', 'secWinAD', 'secSAPR3'
+        :param pool_size: [Optional] maximum number of keep-alive connections to the Management Console
+        :param timeout: [Optional] seconds to wait for the server, either a single value
+                        or a (connect timeout, read timeout) tuple; None waits indefinitely
+        :param session_ttl: [Optional] seconds for which a confirmed session is trusted without validating it again
+        :param metadata_cache: [Optional] MetadataCache serving job definitions read before, see BaseServer
+        """
+        super().__init__(wsdl_url, username, password, cms_system, cms_authentication, session_ttl=session_ttl,
+                         metadata_cache=metadata_cache)
+        self.transport = AsyncTransport(pool_size=pool_size, timeout=timeout)
+        self.session_lock = asyncio.Lock()
+
+        self.batch_job = AsyncBatchJob(self)
+        self.job_server = AsyncJobServer(self)
+        self.dataflow = AsyncDataflow(self)
+        self.log = AsyncLog(self)
+        self.repo = AsyncRepo(self)
+        self.realtime_service = AsyncRealtimeService(self)
+
+
+    async def send(self, call):
+        """
+        :param call: SoapCall to send to the Management Console
+        :return: cleaned xml root of the response, or (status code, reason, text) for raw calls
+        """
+        request = build_request(self.session_id, call)
+        headers = soap_headers(call.soap_action)
+        status_code, reason, text = await self.transport.request(call.method, self.wsdl_url, request, headers)
+        return parse_response(call, status_code, reason, text)
+
+
+    async def execute(self, operation):
+        """
+        :param operation: generator yielding SoapCall requests, see soap_call.soap_operation
+        :return: the value returned by the operation
+        """
+        try:
+            call = next(operation)
+            while True:
+                call = operation.send(await self.send(call))
+        except StopIteration as e:
+            return e.value
+
+
+    async def ping(self):
+        """
+        :return: status code and SAP DS version if status code is 200; status code and reason if not
+        """
+        return await self.execute(self._ping())
+
+
+    async def logon(self):
+        """
+        :return: server instance object
+        """
+        return await self.execute(self._logon())
+
+
+    async def validate_session_id(self):
+        """
+        :return: 0 if SessionID is valid, 1 if SessionID is invalid
+        """
+        return await self.execute(self._validate_session_id())
+
+
+    async def logout(self):
+        """
+        :return: 'Logout complete' if successful
+        """
+        return await self.execute(self._logout())
+
+
+    async def close(self):
+        """
+        Closes the pooled connections to the Management Console.
+        """
+        await self.transport.close()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.session_id and self.status is None:
+                await self.logout()
+        finally:
+            await self.close()
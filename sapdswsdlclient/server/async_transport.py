@@ -0,0 +1,68 @@
+import asyncio
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+async def iter_async(parts):
+    """
+    :param parts: iterable of the parts of a streamed request; reading them may block, e.g. on a file
+    :return: async generator of the parts, which aiohttp sends chunked; each part is read in the default
+            executor, so that reading it doesn't block the event loop
+    """
+    loop = asyncio.get_running_loop()
+    parts = iter(parts)
+    end = object()
+    while True:
+        part = await loop.run_in_executor(None, next, parts, end)
+        if part is end:
+            return
+        yield part
+
+
+class AsyncTransport:
+    def __init__(self, pool_size: int = 10, timeout=(10, 300)):
+        """
+        :param pool_size: maximum number of keep-alive connections kept open to the Management Console
+        :param timeout: [Optional] seconds to wait for the server, either a single value
+                        or a (connect timeout, read timeout) tuple; None waits indefinitely
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncServer requires aiohttp: pip install sapdswsdlclient[async]')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = None
+
+    def _client_timeout(self):
+        if self.timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(self.timeout, tuple):
+            connect_timeout, read_timeout = self.timeout
+            return aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=read_timeout)
+        return aiohttp.ClientTimeout(total=self.timeout)
+
+    def _get_session(self):
+        # the session binds to the running event loop, so it is created on first use
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self._client_timeout())
+        return self.session
+
+    async def request(self, method, url, data, headers):
+        """
+        :param method: 'get' or 'post'
+        :return: status code, reason and text of the response
+        """
+        if data is not None and not isinstance(data, (bytes, str)):
+            data = iter_async(data)
+        async with self._get_session().request(method.upper(), url, data=data, headers=headers) as response:
+            text = await response.text()
+            return response.status, response.reason, text
+
+    async def close(self):
+        """
+        Closes all pooled connections.
+        """
+        if self.session is not None:
+            await self.session.close()
@@ -1,37 +1,46 @@
-import requests
-from requests import exceptions
-import xml.etree.ElementTree as ET
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from sapdswsdlclient.models.batch_job import BatchJob
 from sapdswsdlclient.models.job_server import JobServer
 from sapdswsdlclient.models.dataflow import Dataflow
 from sapdswsdlclient.models.logs import Log
 from sapdswsdlclient.models.repo import Repo
 from sapdswsdlclient.models.realtime_service import RealtimeService
-from sapdswsdlclient.templates.templates import request_template, headers
-from sapdswsdlclient.exceptions.exceptions import NotSignedInError
-
-
-class Server:
-    def __init__(self, wsdl_url, username, password, cms_system, cms_authentication):
+from sapdswsdlclient.server.base import BaseServer
+from sapdswsdlclient.server.session_pool import SessionPool
+from sapdswsdlclient.server.soap_call import build_request, parse_response
+from sapdswsdlclient.server.transport import Transport
+from sapdswsdlclient.templates.templates import soap_headers
+from sapdswsdlclient.utilities.clean_xml import iter_clean_xml_response
+from sapdswsdlclient.utilities.metadata_cache import MetadataCache
+
+
+class Server(BaseServer):
+    """
+    One Server instance can be shared by many threads, e.g. driven from a ThreadPoolExecutor or via map():
+    every request gets its own headers, connections come from a thread-safe pool and re-authentication
+    is serialized, so concurrent calls share one session.
+    """
+    def __init__(self, wsdl_url, username, password, cms_system, cms_authentication,
+                 pool_size: int = 10, timeout=(10, 300), session_ttl: float = 300,
+                 metadata_cache: Optional[MetadataCache] = None):
         """
         :param wsdl_url: WSDL file URL
         :param username: username
         :param password: password
         :param cms_system: job server's hostname
         :param cms_authentication: the options are 'secEnterprise', 'secLDAP', 'secWinAD', 'secSAPR3'
+        :param pool_size: [Optional] maximum number of keep-alive connections to the Management Console
+        :param timeout: [Optional] seconds to wait for the server, either a single value
+                        or a (connect timeout, read timeout) tuple; None waits indefinitely
+        :param session_ttl: [Optional] seconds for which a confirmed session is trusted without validating it again
+        :param metadata_cache: [Optional] MetadataCache serving job definitions read before, see BaseServer
         """
-        self.username = username
-        self.cms_system = cms_system
-        self.cms_authentication = cms_authentication
-        self.wsdl_url = wsdl_url
-        self.password = password
-
-        self.request_template = request_template
-        self.headers = headers
-
-        self.session_id = ''
-        self.status = None
-        self.is_session_id_valid = None
+        super().__init__(wsdl_url, username, password, cms_system, cms_authentication, session_ttl=session_ttl,
+                         metadata_cache=metadata_cache)
+        self.transport = Transport(pool_size=pool_size, timeout=timeout)
+        self._leased = threading.local()
 
         self.batch_job = BatchJob(self)
         self.job_server = JobServer(self)
@@ -41,127 +50,126 @@ class Server:
         self.realtime_service = RealtimeService(self)
 
 
-    def ping(self):
+    def send(self, call):
         """
-        :return: status code and SAP DS version if status code is 200; status code and reason if not
+        :param call: SoapCall to send to the Management Console
+        :return: cleaned xml root of the response, or (status code, reason, text) for raw calls
         """
-        request = f'''
-            <soapenv:Envelope xmlns:soapenv='http://schemas.xmlsoap.org/soap/envelope/' xmlns:ser='http://www.businessobjects.com/DataServices/ServerX.xsd'>
-                <soapenv:Header/>
-                   <soapenv:Body>
-                      <ser:PingRequest/>
-                   </soapenv:Body>
-                </soapenv:Envelope>
-                '''
-        self.headers['SOAPAction'] = 'function=Ping'
-        response = requests.get(self.wsdl_url, data=request, headers=self.headers)
-        status = response.status_code
-        if status == 200:
-            version = ET.fromstring(response.text).find('.//version').text
-            return status, version
-        else:
-            return status, response.reason
+        request = build_request(getattr(self._leased, 'session_id', None) or self.session_id, call)
+        headers = soap_headers(call.soap_action)
+        response = self.transport.request(call.method, self.wsdl_url, data=request, headers=headers)
+        return parse_response(call, response.status_code, response.reason, response.text)
 
 
-    def logon(self):
+    def execute(self, operation):
         """
-        :return: server instance object
+        :param operation: generator yielding SoapCall requests, see soap_call.soap_operation
+        :return: the value returned by the operation; runs on a leased session if a session pool is open
         """
-        request = f'''
-            <soapenv:Envelope xmlns:soapenv='http://schemas.xmlsoap.org/soap/envelope/' xmlns:ser='http://www.businessobjects.com/DataServices/ServerX.xsd'>
-                <soapenv:Header/>
-                   <soapenv:Body>
-                      <ser:LogonRequest>
-                         <username>{self.username}</username>
-                         <password>{self.password}</password>
-                         <cms_system>{self.cms_system}</cms_system>
-                         <cms_authentication>{self.cms_authentication}</cms_authentication>
-                      </ser:LogonRequest>
-                   </soapenv:Body>
-                </soapenv:Envelope>
-                '''
-
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'SOAPAction': 'function=Logon'
-        }
+        if self.session_pool is None:
+            return self._drive(operation)
+        with self.session_pool.lease() as session_id:
+            self._leased.session_id = session_id
+            try:
+                return self._drive(operation)
+            finally:
+                self._leased.session_id = None
 
-        try:
-            response = requests.post(self.wsdl_url, data=request, headers=headers)
 
-            if response.status_code != 200:
-                root = ET.fromstring(response.text)
-                faultstring = root.find('.//faultstring').text
-                raise NotSignedInError(faultstring)
-            else:
-                root = ET.fromstring(response.text)
-                session_id = root.find('.//SessionID')
-                if not session_id is None:
-                    self.session_id = session_id.text
-                    return self.session_id
-                else:
-                    raise ValueError('Session ID not found in the response.')
+    def stream(self, call, chunk_size: int = 65536):
+        """
+        :param call: SoapCall to send to the Management Console
+        :param chunk_size: number of bytes read from the connection at a time
+        :return: generator of cleaned str parts of the response, read while it is downloaded
+        """
+        if self.session_pool is None:
+            yield from self._stream(call, self.session_id, chunk_size)
+        else:
+            with self.session_pool.lease() as session_id:
+                yield from self._stream(call, session_id, chunk_size)
+
 
-        except exceptions.ConnectionError as e:
-            raise e
+    def _stream(self, call, session_id, chunk_size):
+        request = build_request(session_id, call)
+        headers = soap_headers(call.soap_action)
+        chunks = self.transport.stream(call.method, self.wsdl_url, data=request, headers=headers,
+                                       chunk_size=chunk_size)
+        yield from iter_clean_xml_response(chunks)
 
 
-    def validate_session_id(self):
+    def _drive(self, operation):
+        try:
+            call = next(operation)
+            while True:
+                call = operation.send(self.send(call))
+        except StopIteration as e:
+            return e.value
+
+
+    def map(self, fn, iterable, max_workers: int = None):
         """
-        :return: 0 if SessionID is valid, 1 if SessionID is invalid
+        :param fn: callable applied to every item, e.g. lambda run_id: server.log.get_error_log(repo_name, run_id)
+        :param iterable: items to pass to fn
+        :param max_workers: [Optional] number of threads; defaults to the connection pool size
+        :return: list of results in the order of the items
         """
-        if not self.session_id:
+        with ThreadPoolExecutor(max_workers=max_workers or self.transport.pool_size) as executor:
+            return list(executor.map(fn, iterable))
 
-            raise NotSignedInError ('The user is not signed in.')
-        else:
-            auth_request_body = f'''<ser:ValidateSessionIDRequest/>'''
-            auth_request = self.request_template.format(session_id=self.session_id, request_body=auth_request_body)
 
-            self.headers['SOAPAction'] = 'function=Validate_SessionID'
+    def ping(self):
+        """
+        :return: status code and SAP DS version if status code is 200; status code and reason if not
+        """
+        return self._drive(self._ping())
+
 
-            try:
-                response = requests.post(self.wsdl_url, data=auth_request, headers=headers)
+    def logon(self):
+        """
+        :return: server instance object
+        """
+        return self._drive(self._logon())
 
-                if response.status_code != 200:
-                    root = ET.fromstring(response.text)
-                    faultstring = root.find('.//faultstring').text
-                    raise NotSignedInError(faultstring)
-                else:
-                    root = ET.fromstring(response.text)
-                    is_session_id_valid = root.find('.//Status')
-                    if not is_session_id_valid is None:
-                        self.is_session_id_valid = is_session_id_valid.text
-                        return self.is_session_id_valid
 
-            except exceptions.ConnectionError as e:
-                raise e
+    def validate_session_id(self):
+        """
+        :return: 0 if SessionID is valid, 1 if SessionID is invalid
+        """
+        return self._drive(self._validate_session_id())
 
 
     def logout(self):
         """
         :return: 'Logout complete' if successful
         """
-        if not self.session_id:
-            raise NotSignedInError ('The user is not signed in.')
-        else:
-            auth_request_body = f'''<ser:LogoutRequest/>'''
-            auth_request = self.request_template.format(session_id=self.session_id, request_body=auth_request_body)
+        return self._drive(self._logout())
 
-            self.headers['SOAPAction'] = 'function=Logout'
 
-            try:
-                response = requests.post(self.wsdl_url, data=auth_request, headers=headers)
-
-                if response.status_code != 200:
-                    root = ET.fromstring(response.text)
-                    faultstring = root.find('.//faultstring').text
-                    raise NotSignedInError(faultstring)
-                else:
-                    root = ET.fromstring(response.text)
-                    status = root.find('.//status')
-                    if not status is None:
-                        self.status = status.text
-                        return self.status
-
-            except exceptions.ConnectionError as e:
-                raise
\ No newline at end of file
+    def open_session_pool(self, size: int = 4, refresh_interval: float = 60):
+        """
+        :param size: number of sessions to sign in
+        :param refresh_interval: [Optional] seconds between background health checks of idle sessions
+        :return: the opened SessionPool; model calls lease one of its sessions until it is closed
+        """
+        return SessionPool(self, size=size, refresh_interval=refresh_interval).open()
+
+
+    def close(self):
+        """
+        Closes the session pool, if any, and the pooled connections to the Management Console.
+        """
+        if self.session_pool is not None:
+            self.session_pool.close()
+        self.transport.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.session_id and self.status is None:
+                self.logout()
+        finally:
+            self.close()
@@ -0,0 +1,165 @@
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Optional
+from sapdswsdlclient.server.soap_call import SoapCall
+from sapdswsdlclient.templates.envelope import soap_request
+from sapdswsdlclient.templates.templates import request_template, headers
+from sapdswsdlclient.exceptions.exceptions import NotSignedInError
+from sapdswsdlclient.utilities.log_cache import LogCache
+from sapdswsdlclient.utilities.metadata_cache import MetadataCache
+
+
+class BaseServer:
+    def __init__(self, wsdl_url, username, password, cms_system, cms_authentication, session_ttl: float = 300,
+                 metadata_cache: Optional[MetadataCache] = None):
+        """
+        :param wsdl_url: WSDL file URL
+        :param username: username
+        :param password: password
+        :param cms_system: job server's hostname
+        :param cms_authentication: the options are 'secEnterprise', 'secLDAP', 'secWinAD', 'secSAPR3'
+        :param session_ttl: [Optional] seconds for which a confirmed session is trusted without validating it again
+        :param metadata_cache: [Optional] MetadataCache serving job definitions read before; definitions are
+                            read from the server every time if not given
+        """
+        self.username = username
+        self.cms_system = cms_system
+        self.cms_authentication = cms_authentication
+        self.wsdl_url = wsdl_url
+        self.password = password
+
+        self.request_template = request_template
+        self.headers = headers
+
+        self.session_id = ''
+        self.status = None
+        self.is_session_id_valid = None
+        self.session_ttl = session_ttl
+        self.session_validated_at = None
+        self.session_lock = threading.RLock()
+        self.session_pool = None
+        self.log_cache = None
+        self.metadata_cache = metadata_cache
+
+
+    def mark_session_valid(self):
+        """
+        Records that the session was confirmed as valid just now.
+        """
+        self.session_validated_at = time.monotonic()
+
+
+    def is_session_fresh(self):
+        """
+        :return: True if the session was confirmed as valid less than session_ttl seconds ago
+        """
+        if not self.session_id or self.session_validated_at is None:
+            return False
+        return time.monotonic() - self.session_validated_at < self.session_ttl
+
+
+    def open_log_cache(self, directory, max_bytes: int = 1 << 30, max_age: float = 30 * 86400):
+        """
+        :param directory: directory holding the cache; may be shared by several processes
+        :param max_bytes: [Optional] size of the cache on disk above which the oldest pages are removed
+        :param max_age: [Optional] seconds after which a cached page is removed
+        :return: the opened LogCache; log pages of runs reported as finished by get_run_exe_detail,
+                get_run_ids or get_by_time_range are stored in it and read from it from then on
+        """
+        self.log_cache = LogCache(directory, max_bytes=max_bytes, max_age=max_age)
+        return self.log_cache
+
+
+    def _ping(self):
+        request = soap_request('''
+            <soapenv:Envelope xmlns:soapenv='http://schemas.xmlsoap.org/soap/envelope/' xmlns:ser='http://www.businessobjects.com/DataServices/ServerX.xsd'>
+                <soapenv:Header/>
+                   <soapenv:Body>
+                      <ser:PingRequest/>
+                   </soapenv:Body>
+                </soapenv:Envelope>
+                ''', session=False)
+        status, reason, text = yield SoapCall('function=Ping', request, session=False, raw=True)
+        if status == 200:
+            version = ET.fromstring(text).findtext('.//version')
+            return status, version
+        else:
+            return status, reason
+
+
+    def _new_session(self):
+        request = soap_request('''
+            <soapenv:Envelope xmlns:soapenv='http://schemas.xmlsoap.org/soap/envelope/' xmlns:ser='http://www.businessobjects.com/DataServices/ServerX.xsd'>
+                <soapenv:Header/>
+                   <soapenv:Body>
+                      <ser:LogonRequest>
+                         <username>{username}</username>
+                         <password>{password}</password>
+                         <cms_system>{cms_system}</cms_system>
+                         <cms_authentication>{cms_authentication}</cms_authentication>
+                      </ser:LogonRequest>
+                   </soapenv:Body>
+                </soapenv:Envelope>
+                ''', session=False, username=self.username, password=self.password, cms_system=self.cms_system,
+                               cms_authentication=self.cms_authentication)
+        root = yield SoapCall('function=Logon', request, method='post', session=False)
+
+        faultstring = root.find('.//faultstring')
+        if faultstring is not None:
+            raise NotSignedInError(faultstring.text)
+        session_id = root.find('.//SessionID')
+        if not session_id is None:
+            return session_id.text
+        else:
+            raise ValueError('Session ID not found in the response.')
+
+
+    def _logon(self):
+        self.session_id = yield from self._new_session()
+        self.status = None
+        self.mark_session_valid()
+        return self.session_id
+
+
+    def _validate_session_id(self):
+        if not self.session_id:
+            raise NotSignedInError ('The user is not signed in.')
+
+        self.is_session_id_valid = yield from self._check_session(self.session_id)
+        return self.is_session_id_valid
+
+
+    def _check_session(self, session_id):
+        root = yield SoapCall('function=Validate_SessionID', soap_request('<ser:ValidateSessionIDRequest/>'),
+                              method='post', session_id=session_id)
+
+        faultstring = root.find('.//faultstring')
+        if faultstring is not None:
+            raise NotSignedInError(faultstring.text)
+        is_session_id_valid = root.find('.//Status')
+        if not is_session_id_valid is None:
+            return is_session_id_valid.text
+
+
+    def _logout(self):
+        if not self.session_id:
+            raise NotSignedInError ('The user is not signed in.')
+
+        status = yield from self._end_session(self.session_id)
+        if not status is None:
+            self.status = status
+            self.session_validated_at = None
+            return self.status
+
+
+    def _end_session(self, session_id):
+        root = yield SoapCall('function=Logout', soap_request('<ser:LogoutRequest/>'), method='post',
+                              session_id=session_id)
+
+        faultstring = root.find('.//faultstring')
+        if faultstring is not None:
+            raise NotSignedInError(faultstring.text)
+        status = root.find('.//status')
+        if not status is None:
+            return status.text
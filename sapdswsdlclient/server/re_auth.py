@@ -1,17 +1,156 @@
 from functools import wraps
-from sapdswsdlclient.exceptions.exceptions import NotSignedInError
+from sapdswsdlclient.exceptions.exceptions import NotSignedInError, SessionExpiredError
+from sapdswsdlclient.server.soap_call import start_operation
 
 
-def re_logon(func):
+def re_authenticate(server):
+    """
+    Signs out of the expired session, if the server still knows it, and signs in again.
+    """
+    try:
+        server.logout()
+    except Exception:
+        pass
+    try:
+        server.logon()
+    except Exception as e:
+        raise NotSignedInError("Failed to re-authenticate after session timeout.") from e
+
+
+def ensure_session(server):
+    """
+    Validates the session once session_ttl has passed since it was last confirmed and signs in again if it expired.
+    """
+    if server.session_pool is not None or server.is_session_fresh():
+        return
+    with server.session_lock:
+        if not server.is_session_fresh():
+            if server.validate_session_id() == '1':
+                re_authenticate(server)
+            else:
+                server.mark_session_valid()
+
+
+def re_logon(func=None, *, retry: bool = True):
+    """
+    Trusts the session for server.session_ttl seconds after it was last confirmed and only validates it
+    again once that time has passed. If the call fails with a session fault, signs in again and,
+    unless retry is False, repeats the call once. Calls that change server state use retry=False,
+    so a fault can never run a job or import an object twice. A SOAP operation answered without
+    a request, e.g. from a cache, returns before the session is checked or a pooled session is leased.
+    """
+    if func is None:
+        return lambda f: re_logon(f, retry=retry)
+    operation = getattr(func, 'operation', None)
+
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        ping = self._server.ping()
-        if ping[0] != 200:
-            raise ConnectionError(ping)
-        if self._server.validate_session_id() == '1':
+        server = self._server
+        first_call = lambda: func(self, *args, **kwargs)
+        if operation is not None:
+            done, value = start_operation(operation(self, *args, **kwargs))
+            if done:
+                return value
+            first_call = lambda: server.execute(value)
+        if server.session_pool is not None:
+            # the pool checks its sessions and replaces the ones that fail with a session fault
             try:
-                self._server.logon()
-            except Exception:
-                raise NotSignedInError("Failed to re-authenticate after session timeout. Check the credentials.")
-        return func(self, *args, **kwargs)
-    return wrapper
\ No newline at end of file
+                return first_call()
+            except SessionExpiredError:
+                if not retry:
+                    raise
+                return func(self, *args, **kwargs)
+        ensure_session(server)
+        session_id = server.session_id
+        try:
+            return first_call()
+        except SessionExpiredError:
+            with server.session_lock:
+                # another thread may have signed in again while this call was running
+                if server.session_id == session_id:
+                    re_authenticate(server)
+            if not retry:
+                raise
+            return func(self, *args, **kwargs)
+    wrapper.retry = retry
+    return wrapper
+
+
+def started_stream(first, items):
+    """
+    :return: generator of first followed by the rest of items; closing it closes items
+    """
+    try:
+        yield first
+        yield from items
+    finally:
+        items.close()
+
+
+def re_logon_stream(func):
+    """
+    re_logon for methods returning a generator that streams a response. The first item is read when the
+    method is called, under re_logon, so a session fault before it signs in again and restarts the stream once;
+    a fault after items were handed out is raised, as they can't be taken back.
+    """
+    @re_logon
+    def start(self, *args, **kwargs):
+        items = func(self, *args, **kwargs)
+        for first in items:
+            return started_stream(first, items)
+        return items
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        return start(self, *args, **kwargs)
+    wrapper.retry = True
+    return wrapper
+
+
+async def async_re_authenticate(server):
+    try:
+        await server.logout()
+    except Exception:
+        pass
+    try:
+        await server.logon()
+    except Exception as e:
+        raise NotSignedInError("Failed to re-authenticate after session timeout.") from e
+
+
+def async_re_logon(func=None, *, retry: bool = True):
+    """
+    Coroutine counterpart of re_logon for the AsyncServer models.
+    """
+    if func is None:
+        return lambda f: async_re_logon(f, retry=retry)
+    operation = getattr(func, 'operation', None)
+
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        server = self._server
+        first_call = lambda: func(self, *args, **kwargs)
+        if operation is not None:
+            done, value = start_operation(operation(self, *args, **kwargs))
+            if done:
+                return value
+            first_call = lambda: server.execute(value)
+        if not server.is_session_fresh():
+            async with server.session_lock:
+                if not server.is_session_fresh():
+                    if await server.validate_session_id() == '1':
+                        await async_re_authenticate(server)
+                    else:
+                        server.mark_session_valid()
+        session_id = server.session_id
+        try:
+            return await first_call()
+        except SessionExpiredError:
+            async with server.session_lock:
+                if server.session_id == session_id:
+                    await async_re_authenticate(server)
+            if not retry:
+                raise
+            return await func(self, *args, **kwargs)
+    wrapper.retry = retry
+    return wrapper
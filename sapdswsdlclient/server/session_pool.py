@@ -0,0 +1,171 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from sapdswsdlclient.exceptions.exceptions import SessionExpiredError
+
+
+class SessionPool:
+    def __init__(self, server_instance, size: int = 4, refresh_interval: float = 60):
+        """
+        Holds several authenticated sessions of one user and leases one to every model call.
+
+        :param server_instance: Server whose credentials are used to sign in
+        :param size: number of sessions to sign in
+        :param refresh_interval: [Optional] seconds between background health checks of idle sessions;
+                                sessions unused for longer than server.session_ttl are validated and replaced if expired
+        """
+        self._server = server_instance
+        self.size = size
+        self.refresh_interval = refresh_interval
+
+        self._idle = queue.LifoQueue()
+        self._checked_at = dict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def sessions(self):
+        """
+        :return: number of signed in sessions, leased or idle
+        """
+        with self._lock:
+            return len(self._checked_at)
+
+    def open(self):
+        """
+        Signs in the sessions, starts the background refresh and attaches the pool to the server.
+        If a session can't be signed in, those signed in before it are signed out again.
+
+        :return: the pool
+        """
+        with self._lock:
+            self._closed = False
+        try:
+            for _ in range(self.size):
+                self._add_session()
+        except BaseException:
+            self._drain()
+            raise
+        self._stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, name='sapds-session-pool', daemon=True)
+        self._refresher.start()
+        self._server.session_pool = self
+        return self
+
+    def close(self):
+        """
+        Detaches the pool from the server, stops the background refresh and signs out the idle sessions.
+        Sessions leased at the time are signed out when they are returned.
+        """
+        if self._server.session_pool is self:
+            self._server.session_pool = None
+        with self._lock:
+            self._closed = True
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+        self._drain()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        :param timeout: [Optional] seconds to wait for an idle session; None waits until one is returned
+        :return: context manager yielding a session ID that is used by no other caller until it exits
+        """
+        session_id = self._idle.get(timeout=timeout)
+        try:
+            yield session_id
+        except SessionExpiredError:
+            self._remove_session(session_id)
+            session_id = None
+            try:
+                if not self._closed:
+                    self._add_session()
+            except Exception:
+                # the refresh loop signs in the missing session later
+                pass
+            raise
+        finally:
+            if session_id is not None:
+                self._release(session_id)
+
+    def _add_session(self):
+        session_id = self._server._drive(self._server._new_session())
+        self._release(session_id)
+
+    def _release(self, session_id):
+        """
+        Returns a session to the idle ones, or signs it out if the pool was closed in the meantime.
+        """
+        with self._lock:
+            if not self._closed:
+                self._checked_at[session_id] = time.monotonic()
+                self._idle.put(session_id)
+                return
+        self._remove_session(session_id)
+
+    def _drain(self):
+        """
+        Signs out the idle sessions.
+        """
+        while True:
+            try:
+                session_id = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._remove_session(session_id)
+
+    def _remove_session(self, session_id):
+        with self._lock:
+            self._checked_at.pop(session_id, None)
+        try:
+            self._server._drive(self._server._end_session(session_id))
+        except Exception:
+            pass
+
+    def _refresh(self):
+        """
+        Validates idle sessions that were not confirmed within server.session_ttl, replaces expired ones
+        and signs in sessions missing after failed replacements.
+        """
+        for _ in range(self._idle.qsize()):
+            try:
+                session_id = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                checked_at = self._checked_at.get(session_id, 0)
+            if time.monotonic() - checked_at < self._server.session_ttl:
+                self._idle.put(session_id)
+                continue
+            try:
+                is_valid = self._server._drive(self._server._check_session(session_id)) == '0'
+            except Exception:
+                is_valid = False
+            if is_valid:
+                with self._lock:
+                    self._checked_at[session_id] = time.monotonic()
+                self._idle.put(session_id)
+            else:
+                self._remove_session(session_id)
+
+        while self.sessions < self.size and not self._stop.is_set():
+            try:
+                self._add_session()
+            except Exception:
+                break
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            self._refresh()
@@ -0,0 +1,93 @@
+from functools import wraps
+from typing import NamedTuple, Optional
+from sapdswsdlclient.templates.envelope import Request
+from sapdswsdlclient.templates.templates import request_template
+from sapdswsdlclient.utilities.clean_xml import clean_xml_response
+
+
+class SoapCall(NamedTuple):
+    """
+    A single SOAP request yielded by an operation.
+
+    :param soap_action: value of the SOAPAction header, e.g. 'jobAdmin=Get_BatchJob_List'
+    :param request_body: Request built by templates.envelope.soap_request, or the ser:...Request element
+                        as str, or the full envelope if session is False
+    :param method: 'get' or 'post'
+    :param encoding: [Optional] encoding of the request sent to the server
+    :param session: wrap request_body into the envelope carrying the current session ID
+    :param raw: send back (status code, reason, text) instead of the cleaned xml root
+    :param session_id: [Optional] session ID to send instead of the one the server is using
+    """
+    soap_action: str
+    request_body: str
+    method: str = 'get'
+    encoding: Optional[str] = None
+    session: bool = True
+    raw: bool = False
+    session_id: Optional[str] = None
+
+
+def build_request(session_id, call: SoapCall):
+    """
+    :return: the request data to send for the call; bytes for a Request, or a generator of bytes
+            if it streams Chunks
+    """
+    if isinstance(call.request_body, Request):
+        return call.request_body.render(call.session_id or session_id, call.encoding or 'utf-8')
+    if call.session:
+        request = request_template.format(session_id=call.session_id or session_id, request_body=call.request_body)
+    else:
+        request = call.request_body
+    if call.encoding:
+        return request.encode(call.encoding)
+    return request
+
+
+def parse_response(call: SoapCall, status_code, reason, text):
+    """
+    :return: the value sent back into the operation that yielded the call
+    """
+    if call.raw:
+        return status_code, reason, text
+    return clean_xml_response(text)
+
+
+def soap_operation(func):
+    """
+    Turns a generator that yields SoapCall requests and receives the parsed responses into a method
+    executed by the model's server. The generator stays available as .operation, so the sync Server
+    and the AsyncServer run the same request building and response parsing code.
+    """
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        return self._server.execute(func(self, *args, **kwargs))
+    wrapper.operation = func
+    return wrapper
+
+
+def start_operation(operation):
+    """
+    Runs an operation up to its first request, so that one answered without a request, e.g. from a cache,
+    needs no session.
+
+    :param operation: generator yielding SoapCall requests
+    :return: (True, value returned by the operation) if it made no request,
+            (False, operation resuming at its first request) otherwise
+    """
+    try:
+        call = next(operation)
+    except StopIteration as e:
+        return True, e.value
+    return False, resumed_operation(call, operation)
+
+
+def resumed_operation(call, operation):
+    """
+    :return: generator yielding call, the request the operation stopped at, and then the rest of its requests
+    """
+    while True:
+        response = yield call
+        try:
+            call = operation.send(response)
+        except StopIteration as e:
+            return e.value
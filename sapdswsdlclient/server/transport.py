@@ -0,0 +1,49 @@
+import codecs
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport:
+    def __init__(self, pool_size: int = 10, timeout=(10, 300)):
+        """
+        :param pool_size: maximum number of keep-alive connections kept open to the Management Console
+        :param timeout: [Optional] seconds to wait for the server, either a single value
+                        or a (connect timeout, read timeout) tuple; None waits indefinitely
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, url, data, headers):
+        """
+        :param method: 'get' or 'post'
+        :return: response of the request sent over a pooled connection
+        """
+        return self.session.request(method.upper(), url, data=data, headers=headers, timeout=self.timeout)
+
+    def stream(self, method, url, data, headers, chunk_size: int = 65536):
+        """
+        :param method: 'get' or 'post'
+        :param chunk_size: number of bytes read from the connection at a time
+        :return: generator of decoded str parts of the response body, read while it is downloaded
+        """
+        with self.session.request(method.upper(), url, data=data, headers=headers, timeout=self.timeout,
+                                  stream=True) as response:
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+            for chunk in response.iter_content(chunk_size):
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b'', final=True)
+            if text:
+                yield text
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self.session.close()
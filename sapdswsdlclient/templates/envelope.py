@@ -0,0 +1,156 @@
+import codecs
+import html
+import re
+from string import Formatter
+from typing import NamedTuple
+from sapdswsdlclient.templates.templates import request_template
+
+markup_pattern = re.compile('[&<>"\']')
+
+
+class Raw(str):
+    """
+    Value inserted into a request as it is, for XML fragments such as job parameters or cleaned definitions.
+    """
+
+
+class Chunks:
+    def __init__(self, parts):
+        """
+        Value streamed into a request part by part and inserted as it is, like Raw;
+        a request holding Chunks is sent with chunked transfer encoding.
+
+        :param parts: iterable of str, e.g. a generator reading a file
+        """
+        self.parts = parts
+
+
+def escape_value(value):
+    """
+    :return: the value as text of an element or attribute, with &, <, > and quotes escaped unless it is Raw
+    """
+    if type(value) is not str:
+        if isinstance(value, Raw):
+            return value
+        value = str(value)
+    if markup_pattern.search(value) is None:
+        return value
+    return html.escape(value, quote=True)
+
+
+class RequestTemplate:
+    def __init__(self, request_body, session: bool = True):
+        """
+        Splits a request into its static parts and the names of the values placed between them,
+        so that rendering only escapes and encodes the values.
+
+        :param request_body: the ser:...Request element with {name} placeholders,
+                            or the full envelope if session is False
+        :param session: wrap request_body into the envelope carrying the session ID
+        """
+        text = request_template.replace('{request_body}', request_body) if session else request_body
+        self.segments = list()
+        self.fields = list()
+        literal_parts = list()
+        for literal, field, _, _ in Formatter().parse(text):
+            literal_parts.append(literal)
+            if field is not None:
+                self.segments.append(''.join(literal_parts))
+                self.fields.append(field)
+                literal_parts = list()
+        self.segments.append(''.join(literal_parts))
+        self._encoded = dict()
+        self._encoded_segments = dict()
+
+    def encoded_format(self, encoding):
+        """
+        :return: the static parts encoded once per encoding and joined into a bytes %-format with one %s per value;
+                a BOM of utf-8-sig only precedes the first part
+        """
+        encoded_format = self._encoded.get(encoding)
+        if encoded_format is None:
+            codec = 'utf-8' if encoding == 'utf-8-sig' else encoding
+            encoded_format = b'%s'.join(segment.encode(codec).replace(b'%', b'%%') for segment in self.segments)
+            if encoding == 'utf-8-sig':
+                encoded_format = codecs.BOM_UTF8 + encoded_format
+            self._encoded[encoding] = encoded_format
+        return encoded_format
+
+    def encoded_segments(self, encoding):
+        """
+        :return: list of the static parts encoded once per encoding; a BOM of utf-8-sig only precedes the first one
+        """
+        segments = self._encoded_segments.get(encoding)
+        if segments is None:
+            codec = 'utf-8' if encoding == 'utf-8-sig' else encoding
+            segments = [segment.encode(codec) for segment in self.segments]
+            if encoding == 'utf-8-sig':
+                segments[0] = codecs.BOM_UTF8 + segments[0]
+            self._encoded_segments[encoding] = segments
+        return segments
+
+    def render(self, session_id, values: dict, encoding: str = 'utf-8'):
+        """
+        :param session_id: session ID placed into the envelope
+        :param values: placeholder name -> value
+        :param encoding: [Optional] encoding of the request
+        :return: the request as bytes, or a generator of bytes if one of the values is Chunks
+        """
+        if any(isinstance(value, Chunks) for value in values.values()):
+            return self.iter_render(session_id, values, encoding)
+        codec = 'utf-8' if encoding == 'utf-8-sig' else encoding
+        return self.encoded_format(encoding) % tuple([
+            escape_value(session_id if field == 'session_id' else values[field]).encode(codec, 'xmlcharrefreplace')
+            for field in self.fields])
+
+    def iter_render(self, session_id, values: dict, encoding: str = 'utf-8'):
+        """
+        :return: generator of the request as bytes, reading the parts of Chunks values while it is sent
+        """
+        segments = self.encoded_segments(encoding)
+        codec = 'utf-8' if encoding == 'utf-8-sig' else encoding
+        yield segments[0]
+        for field, segment in zip(self.fields, segments[1:]):
+            value = session_id if field == 'session_id' else values[field]
+            if isinstance(value, Chunks):
+                for part in value.parts:
+                    if part:
+                        yield part.encode(codec, 'xmlcharrefreplace')
+            else:
+                yield escape_value(value).encode(codec, 'xmlcharrefreplace')
+            yield segment
+
+
+compiled_requests = dict()
+
+
+def compile_request(request_body, session: bool = True):
+    """
+    :return: the RequestTemplate of the request, compiled on first use
+    """
+    template = compiled_requests.get((request_body, session))
+    if template is None:
+        template = compiled_requests[request_body, session] = RequestTemplate(request_body, session)
+    return template
+
+
+class Request(NamedTuple):
+    template: RequestTemplate
+    values: dict
+
+    def render(self, session_id, encoding: str = 'utf-8'):
+        """
+        :return: the request as bytes
+        """
+        return self.template.render(session_id, self.values, encoding)
+
+
+def soap_request(request_body, session: bool = True, **values):
+    """
+    :param request_body: the ser:...Request element with {name} placeholders,
+                        or the full envelope if session is False
+    :param session: [Optional] wrap request_body into the envelope carrying the session ID
+    :param values: placeholder name -> value; values are escaped unless they are Raw or Chunks
+    :return: Request to send as the request_body of a SoapCall
+    """
+    return Request(compile_request(request_body, session), values)
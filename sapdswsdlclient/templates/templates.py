@@ -11,3 +11,10 @@ request_template = '''<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.or
 headers = {'Content-Type': 'application/x-www-form-urlencoded',
             'SOAPAction': '<undefined>'}
 
+
+def soap_headers(soap_action):
+    """
+    :param soap_action: value of the SOAPAction header
+    :return: a new headers dict for a single request; the shared headers dict is never modified
+    """
+    return {**headers, 'SOAPAction': soap_action}
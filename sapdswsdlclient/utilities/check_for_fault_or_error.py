@@ -1,9 +1,29 @@
 import xml.etree.ElementTree as ET
+import re
+from sapdswsdlclient.exceptions.exceptions import SessionExpiredError
+
+session_fault_pattern = re.compile(
+    r'\b(?:invalid|expired|unknown)\s+session(?:\s*id)?\b'
+    r'|\bsession(?:\s*id)?\s+(?:is\s+)?(?:invalid|not\s+valid|expired|has\s+expired|timed\s+out)\b',
+    re.IGNORECASE)
+
+
+def fault_error(tag_name, text):
+    """
+    :param tag_name: tag of the element holding the error, e.g. 'faultstring'
+    :param text: text of the element
+    :return: SessionExpiredError for faultstrings about an invalid or expired session, ValueError otherwise
+    """
+    if tag_name == 'faultstring' and session_fault_pattern.search(text):
+        return SessionExpiredError(text)
+    return ValueError(text)
+
 
 def check_for_fault_or_error(xml_root: ET.Element, tags: list[str]):
     """
     :param xml_root: xml root after parsing and cleaning
     :param tags: ['errorMessage', 'ErrorMessage', 'faultstring']
+    :raises SessionExpiredError: in case of faultstring about an invalid or expired session
     :raises ValueError: in case of error or faultstring
     """
     for tag_name in tags:
@@ -11,4 +31,4 @@ def check_for_fault_or_error(xml_root: ET.Element, tags: list[str]):
 
         if element is not None:
             if element.text is not None:
-                raise ValueError(element.text)
\ No newline at end of file
+                raise fault_error(tag_name, element.text)
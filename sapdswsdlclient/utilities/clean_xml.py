@@ -1,55 +1,244 @@
 import xml.etree.ElementTree as ET
 import re
 import html
+import sys
+import threading
+from functools import lru_cache
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
-def clean_xml_response(xml_string):
+parser_backends = ('lxml', 'etree')
+_parser_backend = 'lxml' if lxml_etree is not None else 'etree'
+_lxml_parsers = threading.local()
+
+stray_ampersand_pattern = re.compile(r'&(?!(?:amp|lt|gt|quot|apos);)')
+cdata_pattern = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+# stands in for CDATA sections while the text around them is cleaned in one go;
+# only used when the definition holds no NUL characters, which are removed from the text anyway
+cdata_separator = '\x00'
+# sequences replaced by restore_request_markers
+escaped_request_markers = ('\\d', '&lt;![CDATA[', ']]&gt;')
+
+# ASCII-only tables keep str.translate on its fast path
+response_translation = str.maketrans('', '', ''.join(map(chr, [*range(0x00, 0x09), *range(0x0e, 0x1c), 0x7f])))
+request_translation = str.maketrans('\n\r', '  ', ''.join(chr(code) for code in range(1, 32) if chr(code) not in '\t\r\n'))
+request_control_pattern = re.compile(r'[\x01-\x08\x0b\x0c\x0e-\x1f]')
+xml_invalid_pattern = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+@lru_cache(maxsize=None)
+def non_printable_pattern():
+    """
+    :return: compiled character class of every code point that is neither printable nor whitespace;
+            built on first use because it scans the whole Unicode range once
+    """
+    ranges = list()
+    start = None
+    for code in range(sys.maxunicode + 2):
+        char = chr(code) if code <= sys.maxunicode else ' '
+        if not (char.isprintable() or char.isspace()):
+            if start is None:
+                start = code
+        elif start is not None:
+            ranges.append(f'\\U{start:08x}-\\U{code - 1:08x}')
+            start = None
+    return re.compile(f"[{''.join(ranges)}]")
+
+
+def set_parser_backend(name):
+    """
+    :param name: 'lxml' to parse responses with lxml in recover mode, 'etree' for xml.etree.ElementTree;
+                lxml is used by default when it is installed
+    """
+    if name not in parser_backends:
+        raise ValueError(f'Unknown parser backend {name!r}, the options are {", ".join(parser_backends)}.')
+    if name == 'lxml' and lxml_etree is None:
+        raise ImportError('The lxml parser backend requires lxml: pip install sapdswsdlclient[lxml]')
+    global _parser_backend
+    _parser_backend = name
+
+
+def get_parser_backend():
+    """
+    :return: name of the backend parsing responses, 'lxml' or 'etree'
+    """
+    return _parser_backend
+
+
+def lxml_parser():
+    """
+    :return: lxml parser of the calling thread; lxml parsers must not be shared between threads
+    """
+    parser = getattr(_lxml_parsers, 'parser', None)
+    if parser is None:
+        parser = lxml_etree.XMLParser(encoding='utf-8', recover=True, huge_tree=True,
+                                      resolve_entities=False, no_network=True)
+        _lxml_parsers.parser = parser
+    return parser
+
+
+def clean_xml_text(xml_string):
     cleaned_xml = xml_string.replace('\xa0', ' ')
-    cleaned_xml = ''.join(c for c in cleaned_xml if c.isprintable() or c.isspace())
-    cleaned_xml = re.sub(r'&(?!(?:amp|lt|gt|quot|apos);)', '&amp;', cleaned_xml)
+    if cleaned_xml.isascii():
+        cleaned_xml = cleaned_xml.translate(response_translation)
+    else:
+        cleaned_xml = non_printable_pattern().sub('', cleaned_xml)
+    cleaned_xml = stray_ampersand_pattern.sub('&amp;', cleaned_xml)
+    return cleaned_xml
+
+
+def clean_xml_response(xml_string):
+    if _parser_backend == 'lxml':
+        return lxml_xml_response(xml_string)
+    cleaned_xml = clean_xml_text(xml_string)
     try:
         root = ET.fromstring(cleaned_xml)
         return root
     except ET.ParseError as e:
-        raise f'XML parsing error: {e}'
+        raise ValueError(f'XML parsing error: {e}') from e
 
 
-def clean_xml_request(xml_string):
-    if not isinstance(xml_string, str):
-        return ''
-
-    cdata_marker_base = 'CDATA_ID_{}'
-    cdata_map = {}
+def lxml_xml_response(xml_string):
+    """
+    Removes only the characters that are invalid in XML instead of every non-printable one and escapes
+    stray ampersands; whatever markup is still broken is left to lxml's recover mode.
+    """
+    cleaned_xml = xml_invalid_pattern.sub('', xml_string.replace('\xa0', ' '))
+    cleaned_xml = stray_ampersand_pattern.sub('&amp;', cleaned_xml)
+    try:
+        root = lxml_etree.fromstring(cleaned_xml.encode('utf-8', 'replace'), lxml_parser())
+    except lxml_etree.XMLSyntaxError as e:
+        raise ValueError(f'XML parsing error: {e}') from e
+    if root is None:
+        raise ValueError('XML parsing error: no element found')
+    return root
 
-    def replace_cdata(match):
-        index = len(cdata_map)
-        cdata_content = match.group(1)
-        cdata_map[index] = cdata_content
 
-        return f'<![CDATA[{cdata_marker_base.format(index)}]]>'
+def iter_clean_xml_response(chunks):
+    """
+    :param chunks: iterable of str parts of a response
+    :return: generator of the parts cleaned the same way as clean_xml_response, without joining them
+    """
+    tail = ''
+    for chunk in chunks:
+        text = tail + chunk
+        # an '&' in the last five characters may start an entity that continues in the next chunk
+        amp = text.find('&', max(0, len(text) - 5))
+        if amp != -1:
+            text, tail = text[:amp], text[amp:]
+        else:
+            tail = ''
+        if text:
+            yield clean_xml_text(text)
+    if tail:
+        yield clean_xml_text(tail)
 
-    xml_temp = re.sub(r'<!\[CDATA\[(.*?)\]\]>', replace_cdata, xml_string, flags=re.DOTALL)
 
-    cleaned_xml = xml_temp.replace('\xa0', ' ')
-    cleaned_xml = html.escape(cleaned_xml, quote=True)
+def escape_request_text(text):
+    """
+    :return: text outside of CDATA sections escaped and flattened to a single line, character by character;
+            NUL characters are kept, so that they can stand in for CDATA sections, and must be removed
+            before restore_request_markers
+    """
+    cleaned_xml = html.escape(text.replace('\xa0', ' '), quote=True)
+    if cleaned_xml.isascii():
+        return cleaned_xml.translate(request_translation)
+    # str.translate is slow on non-ASCII strings
     cleaned_xml = cleaned_xml.replace('\n', ' ').replace('\r', ' ')
-    allowed_chars = '\t\r\n'
-    cleaned_xml = ''.join(c for c in cleaned_xml if ord(c) >= 32 or c in allowed_chars)
-    cleaned_xml = cleaned_xml.replace('\u2028', ' ').replace('\u2029', ' ')
-    cleaned_xml = cleaned_xml.replace('"', 'quot;')
-    cleaned_xml = cleaned_xml.replace("'", '&apos;')
+    cleaned_xml = request_control_pattern.sub('', cleaned_xml)
+    return cleaned_xml.replace('\u2028', ' ').replace('\u2029', ' ')
+
+
+def restore_request_markers(cleaned_xml):
+    """
+    :return: escaped text with '\\d' doubled and stray CDATA markers put back
+    """
     cleaned_xml = cleaned_xml.replace(r'\d', r'\\d')
+    return cleaned_xml.replace('&lt;![CDATA[', '<![CDATA[').replace(']]&gt;', ']]>')
+
+
+def clean_request_text(text):
+    """
+    :return: text outside of CDATA sections escaped and flattened to a single line
+    """
+    return restore_request_markers(escape_request_text(text).replace(cdata_separator, ''))
+
+
+def clean_xml_request(xml_string):
+    """
+    Escapes an exported object definition to be sent as the text of the <definition> element:
+    markup is escaped, line breaks and control characters are removed, and the content of CDATA
+    sections is passed through unchanged without the CDATA markers.
+    """
+    if not isinstance(xml_string, str):
+        return ''
+
+    parts = cdata_pattern.split(xml_string)
+    # split() alternates the text around CDATA sections with the content of the sections
+    if len(parts) > 1 and cdata_separator not in xml_string:
+        # escape all text parts in one go instead of once per CDATA section
+        escaped = escape_request_text(cdata_separator.join(parts[::2]))
+        parts[::2] = [restore_request_markers(text) for text in escaped.split(cdata_separator)]
+    else:
+        parts[::2] = [clean_request_text(text) for text in parts[::2]]
+    return ''.join(parts)
+
 
 
-    def get_back_cdata(match):
-        marker_full = match.group(1)
-        try:
-            index = int(marker_full.split('_')[-1])
-            return cdata_map[index]
-        except (ValueError, IndexError):
-            return marker_full
+def held_back(text, markers):
+    """
+    :return: index from which the end of text may continue as one of the markers, len(text) if it can't
+    """
+    for index in range(max(0, len(text) - max(map(len, markers)) + 1), len(text)):
+        if any(marker.startswith(text[index:]) for marker in markers):
+            return index
+    return len(text)
 
-    cleaned_xml = cleaned_xml.replace('&lt;![CDATA[', '<![CDATA[').replace(']]&gt;', ']]>')
-    final_xml = re.sub(r'<!\[CDATA\[(.*?)\]\]>', get_back_cdata, cleaned_xml, flags=re.DOTALL)
 
-    return final_xml
\ No newline at end of file
+def iter_clean_xml_request(chunks):
+    """
+    :param chunks: iterable of str parts of an exported object definition
+    :return: generator of the parts cleaned the same way as clean_xml_request, without joining them;
+            only the content of a CDATA section is held until the section is closed
+    """
+    buffer = ''
+    escaped = ''
+    in_cdata = False
+    scanned = 0
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if in_cdata:
+                end = buffer.find(']]>', max(len('<![CDATA['), scanned - 2))
+                if end == -1:
+                    scanned = len(buffer)
+                    break
+                yield buffer[len('<![CDATA['):end]
+                buffer = buffer[end + len(']]>'):]
+                in_cdata = False
+            else:
+                start = buffer.find('<![CDATA[')
+                if start == -1:
+                    cut = held_back(buffer, ('<![CDATA[',))
+                    escaped += escape_request_text(buffer[:cut]).replace(cdata_separator, '')
+                    buffer = buffer[cut:]
+                    cut = held_back(escaped, escaped_request_markers)
+                    if cut:
+                        yield restore_request_markers(escaped[:cut])
+                        escaped = escaped[cut:]
+                    break
+                # text parts end at a CDATA section, so nothing held back continues after it
+                escaped += escape_request_text(buffer[:start]).replace(cdata_separator, '')
+                if escaped:
+                    yield restore_request_markers(escaped)
+                escaped = ''
+                buffer = buffer[start:]
+                in_cdata = True
+                scanned = 0
+    # an unclosed CDATA section is cleaned as text, like clean_xml_request does
+    escaped += escape_request_text(buffer).replace(cdata_separator, '')
+    if escaped:
+        yield restore_request_markers(escaped)
@@ -0,0 +1,176 @@
+from sapdswsdlclient.utilities.log_entries import monitor_row_pattern
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError('Columnar results require numpy: pip install sapdswsdlclient[numpy]')
+
+
+def to_float(value):
+    try:
+        return float(value.rstrip('% '))
+    except (AttributeError, ValueError):
+        return float('nan')
+
+
+def numeric_column(values, dtype):
+    """
+    :param values: list of numeric strings
+    :param dtype: numpy dtype of the column, e.g. np.int64
+    :return: array of the values; a column with missing or malformed values becomes float64 with NaN in their place
+    """
+    try:
+        return np.array(values, dtype=dtype)
+    except (ValueError, TypeError):
+        return np.array([to_float(value) for value in values], dtype=np.float64)
+
+
+def time_column(values):
+    """
+    :param values: list of times, either seconds or datetimes as YYYY-MM-DD HH:mm:ss
+    :return: float64 array of seconds or datetime64[ms] array
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        pass
+    try:
+        return np.array([value or 'NaT' for value in values], dtype='datetime64[ms]')
+    except ValueError:
+        return np.array([value or '' for value in values], dtype=str)
+
+
+def text_column(values):
+    return np.array([value or '' for value in values], dtype=str)
+
+
+def seconds(column):
+    """
+    :return: the time column as float seconds, counted from its earliest datetime if it holds datetimes
+    """
+    if np.issubdtype(column.dtype, np.datetime64):
+        if not len(column) or np.isnat(column).all():
+            return np.full(len(column), np.nan)
+        start = column[~np.isnat(column)].min()
+        return (column - start) / np.timedelta64(1, 's')
+    return column.astype(np.float64)
+
+
+def ratio(numerator, denominator):
+    numerator = numerator.astype(np.float64)
+    denominator = denominator.astype(np.float64)
+    result = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def group_max(keys, values):
+    """
+    :return: dict of key -> largest value of the key, ignoring NaN
+    """
+    names, inverse = np.unique(keys, return_inverse=True)
+    peaks = np.full(len(names), np.nan)
+    np.fmax.at(peaks, inverse, values.astype(np.float64))
+    return dict(zip(names.tolist(), peaks.tolist()))
+
+
+def group_mean(keys, values):
+    """
+    :return: dict of key -> mean value of the key, ignoring NaN
+    """
+    names, inverse = np.unique(keys, return_inverse=True)
+    values = values.astype(np.float64)
+    valid = ~np.isnan(values)
+    totals = np.bincount(inverse[valid], weights=values[valid], minlength=len(names))
+    counts = np.bincount(inverse[valid], minlength=len(names))
+    return dict(zip(names.tolist(), ratio(totals, counts).tolist()))
+
+
+class Columns:
+    """
+    Statistics held as one NumPy array per column instead of one dict per row.
+    column_types maps every column to 'int', 'float', 'time' or 'text'.
+    """
+    column_types = dict()
+
+    def __init__(self, columns: dict):
+        """
+        :param columns: column name -> list of the texts of the rows
+        """
+        require_numpy()
+        self.columns = dict()
+        for name, column_type in self.column_types.items():
+            values = columns.get(name, list())
+            if column_type == 'int':
+                self.columns[name] = numeric_column(values, np.int64)
+            elif column_type == 'float':
+                self.columns[name] = numeric_column(values, np.float64)
+            elif column_type == 'time':
+                self.columns[name] = time_column(values)
+            else:
+                self.columns[name] = text_column(values)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def __repr__(self):
+        return f'<{type(self).__name__} rows={len(self)}>'
+
+
+class DFMonitorColumns(Columns):
+    column_types = {'threadName': 'text', 'state': 'text', 'absoluteTime': 'time', 'counter': 'int',
+                    'rowProcessed': 'int', 'bufferSize': 'int', 'bufferUsed': 'int',
+                    'CPUUtilization': 'float', 'jobServerUsed': 'text'}
+
+    def rows_per_second(self):
+        """
+        :return: array of rows processed per second of absoluteTime for every row; NaN where no time has passed
+        """
+        return ratio(self['rowProcessed'], seconds(self['absoluteTime']))
+
+    def peak_buffer_use(self):
+        """
+        :return: dict of thread name -> highest bufferUsed of the thread
+        """
+        return group_max(self['threadName'], self['bufferUsed'])
+
+    def cpu_per_thread(self):
+        """
+        :return: dict of thread name -> mean CPUUtilization of the thread
+        """
+        return group_mean(self['threadName'], self['CPUUtilization'])
+
+
+class MonitorLogColumns(Columns):
+    column_types = {'PathName': 'text', 'State': 'text', 'RowCount': 'int', 'ElapsedTime': 'float',
+                    'AbsoluteTime': 'time'}
+
+    @classmethod
+    def from_text(cls, monitor_log_data):
+        """
+        :param monitor_log_data: monitor log as lines of 'PathName, State, RowCount, ElapsedTime, AbsoluteTime';
+                                lines that aren't rows are skipped, as in MonitorLogRows
+        :return: the columns of the monitor log
+        """
+        names = list(cls.column_types)
+        rows = monitor_row_pattern.findall(monitor_log_data)
+        return cls({name: list(column) for name, column in zip(names, zip(*rows))})
+
+    def rows_per_second(self):
+        """
+        :return: array of RowCount per ElapsedTime for every row; NaN where no time has passed
+        """
+        return ratio(self['RowCount'], self['ElapsedTime'])
+
+    def rows_per_path(self):
+        """
+        :return: dict of path name -> highest RowCount of the path
+        """
+        return group_max(self['PathName'], self['RowCount'])
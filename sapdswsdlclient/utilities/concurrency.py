@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def run_concurrently(fn, items, max_workers: int):
+    """
+    :param fn: callable applied to every item
+    :param items: iterable of hashable items, used as keys of the results
+    :param max_workers: maximum number of items processed at the same time
+    :return: generator of (item, result, error) in completion order; error is the raised exception or None
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fn, item): item for item in items}
+        try:
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is None:
+                    yield futures[future], future.result(), None
+                else:
+                    yield futures[future], None, error
+        finally:
+            # stop pending items if the caller leaves the loop early
+            for future in futures:
+                future.cancel()
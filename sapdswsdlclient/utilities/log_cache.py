@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+class LogCache:
+    def __init__(self, directory, max_bytes: int = 1 << 30, max_age: float = 30 * 86400,
+                 max_finished_runs: int = 10000):
+        """
+        Compressed on-disk cache of the log pages of finished runs, whose logs don't change any more.
+        Several processes may share a directory. Reading a page marks it as used, so that the least
+        recently used pages are removed first.
+
+        :param directory: directory holding the cache; created if it doesn't exist
+        :param max_bytes: [Optional] size of the cache on disk above which the least recently used pages are removed
+        :param max_age: [Optional] seconds after which a page that wasn't stored or read again is removed
+        :param max_finished_runs: [Optional] number of finished runs remembered; pages of a run that was
+                                forgotten are stored again once its status is seen again
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_finished_runs = max_finished_runs
+        self.hits = 0
+        self.misses = 0
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = sum(size for _, size, _ in self._entries())
+
+
+    def path(self, wsdl_url, repo_name, run_id, log_type, page):
+        """
+        :return: file of the cached page; None and 1 are different pages, as they are different requests
+        """
+        key = repr((wsdl_url, repo_name, str(run_id), log_type, page)).encode('utf-8')
+        digest = hashlib.sha256(key).hexdigest()
+        return self.directory / digest[:2] / f'{digest}.gz'
+
+
+    def mark_finished(self, wsdl_url, repo_name, run_id):
+        """
+        Records that a run has finished, so that its log pages are stored once they are downloaded.
+        """
+        key = (wsdl_url, repo_name, str(run_id))
+        with self._lock:
+            self._finished[key] = None
+            self._finished.move_to_end(key)
+            while len(self._finished) > self.max_finished_runs:
+                self._finished.popitem(last=False)
+
+
+    def is_finished(self, wsdl_url, repo_name, run_id):
+        with self._lock:
+            return (wsdl_url, repo_name, str(run_id)) in self._finished
+
+
+    def get(self, wsdl_url, repo_name, run_id, log_type, page):
+        """
+        :return: (True, text of the page) if it is cached, (False, None) if it isn't
+        """
+        path = self.path(wsdl_url, repo_name, run_id, log_type, page)
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.max_age:
+                self._remove(path, stat.st_size)
+                raise FileNotFoundError(path)
+            # an empty file stands for a page without text; compressed text is never empty
+            text = gzip.decompress(path.read_bytes()).decode('utf-8') if stat.st_size else None
+            # the modification time records the last use, which prune goes by
+            os.utime(path)
+        except (OSError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return False, None
+        with self._lock:
+            self.hits += 1
+        return True, text
+
+
+    def put(self, wsdl_url, repo_name, run_id, log_type, page, text):
+        """
+        Stores the text of a log page if the run is known to have finished.
+
+        :return: True if the page was stored
+        """
+        if not self.is_finished(wsdl_url, repo_name, run_id):
+            return False
+        path = self.path(wsdl_url, repo_name, run_id, log_type, page)
+        path.parent.mkdir(exist_ok=True)
+        data = b'' if text is None else gzip.compress(text.encode('utf-8'), compresslevel=6)
+        try:
+            replaced_size = path.stat().st_size
+        except FileNotFoundError:
+            replaced_size = 0
+        # written to a temporary file first, so readers never see a partly written page
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        with self._lock:
+            self._size += len(data) - replaced_size
+            over_size = self._size > self.max_bytes
+        if over_size:
+            self.prune()
+        return True
+
+
+    def prune(self):
+        """
+        Removes pages unused for longer than max_age, then the least recently used pages until the cache
+        fits into max_bytes.
+        """
+        now = time.time()
+        entries = list()
+        size = 0
+        for path, entry_size, mtime in self._entries():
+            if now - mtime > self.max_age:
+                self._unlink(path)
+            else:
+                entries.append((mtime, entry_size, path))
+                size += entry_size
+        entries.sort()
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            self._unlink(path)
+            size -= entry_size
+        with self._lock:
+            self._size = size
+
+
+    def clear(self):
+        """
+        Removes every cached page; runs already known to have finished stay known.
+        """
+        for path, _, _ in self._entries():
+            self._unlink(path)
+        with self._lock:
+            self._size = 0
+
+
+    def size(self):
+        """
+        :return: bytes taken by the cached pages, as far as this process knows
+        """
+        return self._size
+
+
+    def _entries(self):
+        """
+        :return: generator of (file, size, time of last use) of the cached pages
+        """
+        for path in self.directory.glob('*/*.gz'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+
+    def _remove(self, path, size):
+        if self._unlink(path):
+            with self._lock:
+                self._size -= size
+
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,139 @@
+import re
+from abc import abstractmethod
+from collections.abc import Sequence
+from sapdswsdlclient.models.items import ErrorLogEntry, MonitorLogRow
+
+# process ID, thread ID, error code and time at the start of an error log entry; the message follows
+# on the same line and continues on the lines up to the next entry
+error_entry_pattern = re.compile(
+    r'^[ \t]*(\d+)[ \t]+(\d+)[ \t]+([A-Z][A-Z0-9_]*-\d+)[ \t]+'
+    r'(\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}[ \t]+\d{1,2}:\d{2}:\d{2}(?:[ \t]?[AP]M)?)[ \t]*', re.MULTILINE)
+# PathName, State, RowCount, ElapsedTime, AbsoluteTime; only the path name may contain ', '
+monitor_row_pattern = re.compile(r'^(.+), ([^,\n]*), ([^,\n]*), ([^,\n]*), ([^,\n]*?)\r?$', re.MULTILINE)
+
+
+class LogEntries(Sequence):
+    """
+    Read-only sequence of the entries of a log text, parsed when they are accessed. The offsets of the entries
+    are found by one regular expression scan on first use of len() or an index; tail() reads backwards
+    from the end of the text without it.
+    """
+    pattern = None
+
+    def __init__(self, text):
+        """
+        :param text: log text, may be None
+        """
+        self.text = text or ''
+        self._offsets = None
+        self._entries = dict()
+
+    @abstractmethod
+    def make_entry(self, match, end):
+        """
+        :param match: match of pattern at the start of the entry
+        :param end: offset at which the entry ends
+        :return: the entry
+        """
+
+    def offsets(self):
+        """
+        :return: list of the offsets at which the entries start
+        """
+        if self._offsets is None:
+            self._offsets = [match.start() for match in self.pattern.finditer(self.text)]
+        return self._offsets
+
+    def entry_at(self, start, end):
+        """
+        :return: the entry starting at offset start and ending at offset end
+        """
+        entry = self._entries.get(start)
+        if entry is None:
+            entry = self._entries[start] = self.make_entry(self.pattern.match(self.text, start), end)
+        return entry
+
+    def __len__(self):
+        return len(self.offsets())
+
+    def __getitem__(self, index):
+        offsets = self.offsets()
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(offsets)))]
+        if index < 0:
+            index += len(offsets)
+        if not 0 <= index < len(offsets):
+            raise IndexError('log entry index out of range')
+        end = offsets[index + 1] if index + 1 < len(offsets) else len(self.text)
+        return self.entry_at(offsets[index], end)
+
+    def __iter__(self):
+        offsets = self.offsets()
+        ends = offsets[1:] + [len(self.text)]
+        for start, end in zip(offsets, ends):
+            yield self.entry_at(start, end)
+
+    def tail(self, n: int):
+        """
+        :param n: number of entries
+        :return: list of the last n entries, oldest first; only the lines they span are read
+        """
+        if n <= 0:
+            return list()
+        if self._offsets is not None:
+            return self[-n:]
+        text = self.text
+        starts = list()
+        position = len(text)
+        while position > 0 and len(starts) < n:
+            line_start = text.rfind('\n', 0, position - 1) + 1
+            if self.pattern.match(text, line_start) is not None:
+                starts.append(line_start)
+            position = line_start
+        ends = [len(text)] + starts[:-1]
+        return [self.entry_at(start, end) for start, end in zip(reversed(starts), reversed(ends))]
+
+    def __repr__(self):
+        return f'<{type(self).__name__} length={len(self.text)}>'
+
+
+class ErrorLog(LogEntries):
+    """
+    Entries of an error log as ErrorLogEntry records; lines that don't start an entry continue
+    the message of the entry before them.
+    """
+    pattern = error_entry_pattern
+
+    def make_entry(self, match, end):
+        process_id, thread_id, error_code, timestamp = match.groups()
+        message = self.text[match.end():end].rstrip('\r\n')
+        return ErrorLogEntry(ProcessID=process_id, ThreadID=thread_id, ErrorCode=error_code, Timestamp=timestamp,
+                             Message=message)
+
+    def with_code(self, *error_codes):
+        """
+        :param error_codes: error codes such as 'RUN-050304'
+        :return: list of the entries with one of the error codes; other entries are not parsed
+        """
+        error_codes = frozenset(error_codes)
+        entries = list()
+        previous = None
+        for match in self.pattern.finditer(self.text):
+            if previous is not None and previous.group(3) in error_codes:
+                entries.append(self.entry_at(previous.start(), match.start()))
+            previous = match
+        if previous is not None and previous.group(3) in error_codes:
+            entries.append(self.entry_at(previous.start(), len(self.text)))
+        return entries
+
+
+class MonitorLogRows(LogEntries):
+    """
+    Rows of a monitor log as MonitorLogRow records; path names may contain ', '.
+    """
+    pattern = monitor_row_pattern
+
+    def make_entry(self, match, end):
+        path_name, state, row_count, elapsed_time, absolute_time = match.groups()
+        return MonitorLogRow(PathName=path_name, State=state, RowCount=row_count, ElapsedTime=elapsed_time,
+                             AbsoluteTime=absolute_time)
@@ -0,0 +1,154 @@
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+
+# bytes scanned at a time while the line index is built
+index_block_size = 1 << 24
+
+
+class LogLines:
+    def __init__(self, log_file):
+        """
+        Lines of a LogFile by number: lines[i], lines[a:b], len(lines).
+        """
+        self._log_file = log_file
+
+    def __len__(self):
+        return len(self._log_file.line_offsets())
+
+    def __getitem__(self, index):
+        offsets = self._log_file.line_offsets()
+        if isinstance(index, slice):
+            return [self._log_file.line(position) for position in range(*index.indices(len(offsets)))]
+        if index < 0:
+            index += len(offsets)
+        if not 0 <= index < len(offsets):
+            raise IndexError('line index out of range')
+        return self._log_file.line(index)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._log_file.line(position)
+
+
+class LogFile:
+    def __init__(self, file, encoding: str = 'utf-8'):
+        """
+        Log held in a file and memory-mapped, so that only the lines that are read become Python strings.
+        The offsets of the lines are indexed on first access by number.
+
+        :param file: binary file object opened for reading, e.g. a temporary file written by Log.download;
+                    it is closed with the LogFile
+        :param encoding: [Optional] encoding of the log
+        """
+        self.file = file
+        self.encoding = encoding
+        file.seek(0, 2)
+        self.size = file.tell()
+        # empty files can't be mapped
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._offsets = None
+        self.lines = LogLines(self)
+
+
+    def line_offsets(self):
+        """
+        :return: array of the offsets at which the lines start; a final line break doesn't start another line
+        """
+        if self._offsets is None:
+            offsets = array('q')
+            if self.size:
+                offsets.append(0)
+            for start in range(0, self.size, index_block_size):
+                block = self._map[start:start + index_block_size]
+                offsets.extend([start + match.end() for match in re.finditer(b'\n', block)])
+            if offsets and offsets[-1] == self.size:
+                offsets.pop()
+            self._offsets = offsets
+        return self._offsets
+
+
+    def line(self, number):
+        """
+        :return: the line without its line break
+        """
+        offsets = self.line_offsets()
+        start = offsets[number]
+        end = offsets[number + 1] - 1 if number + 1 < len(offsets) else self.size
+        if end > start and end == self.size and self._map[end - 1:end] == b'\n':
+            end -= 1
+        return self._decode(self._map[start:end])
+
+
+    def read(self, start: int = 0, end: int = None):
+        """
+        :param start: [Optional] first byte
+        :param end: [Optional] byte after the last one; defaults to the end of the log
+        :return: bytes of the log in the range
+        """
+        return self._map[start:self.size if end is None else end]
+
+
+    def tail(self, n: int):
+        """
+        :param n: number of lines
+        :return: list of the last n lines, read backwards from the end without indexing the log
+        """
+        if n <= 0 or not self.size:
+            return list()
+        end = self.size
+        if self._map[end - 1:end] == b'\n':
+            end -= 1
+        lines = list()
+        while len(lines) < n:
+            start = self._map.rfind(b'\n', 0, end) + 1
+            lines.append(self._decode(self._map[start:end]))
+            if start == 0:
+                break
+            end = start - 1
+        lines.reverse()
+        return lines
+
+
+    def grep(self, pattern, flags=0):
+        """
+        :param pattern: regular expression as str or bytes, matched against the encoded log
+        :param flags: [Optional] re flags
+        :return: generator of (line number, line) of the lines holding a match, each line once
+        """
+        if isinstance(pattern, str):
+            pattern = pattern.encode(self.encoding)
+        offsets = self.line_offsets()
+        last_line = -1
+        for match in re.finditer(pattern, self._map, flags):
+            number = bisect_right(offsets, match.start()) - 1
+            if number != last_line:
+                last_line = number
+                yield number, self.line(number)
+
+
+    def _decode(self, data):
+        return data.decode(self.encoding, 'replace')
+
+
+    def __len__(self):
+        return len(self.line_offsets())
+
+
+    def __repr__(self):
+        return f'<LogFile size={self.size}>'
+
+
+    def close(self):
+        if self.size:
+            self._map.close()
+        self.file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,97 @@
+from xml.parsers import expat
+from sapdswsdlclient.exceptions.exceptions import LogNotFoundError
+from sapdswsdlclient.utilities.check_for_fault_or_error import fault_error
+
+
+class LogStreamParser:
+    def __init__(self, log_tag):
+        """
+        Incremental parser for Get_*_Log responses that hands out the log text as it is parsed.
+
+        :param log_tag: element holding the log text, e.g. 'trace', 'error' or 'monitor'
+        """
+        self.log_tag = log_tag
+        self.return_code = None
+        self.faultstring = None
+
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._data
+        self._current = None
+        self._small_text = []
+        self._log_parts = []
+
+    def _start(self, name, attrs):
+        self._current = name
+        self._small_text = []
+
+    def _end(self, name):
+        if name == 'returnCode':
+            self.return_code = ''.join(self._small_text)
+        elif name == 'faultstring':
+            self.faultstring = ''.join(self._small_text)
+        self._current = None
+
+    def _data(self, data):
+        if self._current == self.log_tag:
+            self._log_parts.append(data)
+        elif self._current in ('returnCode', 'faultstring'):
+            self._small_text.append(data)
+
+    def feed(self, text, is_final=False):
+        """
+        :param text: next part of the cleaned response
+        :param is_final: True for the last part
+        :return: log text parsed from this part
+        """
+        self._parser.Parse(text, is_final)
+        parts, self._log_parts = self._log_parts, []
+        return ''.join(parts)
+
+
+def iter_log_text(chunks, log_tag):
+    """
+    :param chunks: iterable of cleaned str parts of a Get_*_Log response
+    :param log_tag: element holding the log text, e.g. 'trace', 'error' or 'monitor'
+    :return: generator of non-empty parts of the log text as they are parsed; only the current part is kept in memory
+    :raises LogNotFoundError: if the response holds a return code of 1
+    :raises ValueError: if the response holds a fault
+    """
+    parser = LogStreamParser(log_tag)
+
+    def parsed_parts():
+        for chunk in chunks:
+            yield parser.feed(chunk)
+        yield parser.feed('', True)
+
+    failed_text = []
+    for text in parsed_parts():
+        if parser.faultstring is not None:
+            raise fault_error('faultstring', parser.faultstring)
+        if parser.return_code == '1':
+            # the log element holds the error message instead of the log
+            failed_text.append(text)
+            continue
+        if text:
+            yield text
+    if parser.return_code == '1':
+        raise LogNotFoundError(''.join(failed_text))
+
+
+def iter_log_lines(chunks, log_tag):
+    """
+    :param chunks: iterable of cleaned str parts of a Get_*_Log response
+    :param log_tag: element holding the log text, e.g. 'trace', 'error' or 'monitor'
+    :return: generator of log lines without line breaks; only the current line is kept in memory
+    :raises LogNotFoundError: if the response holds a return code of 1
+    :raises ValueError: if the response holds a fault
+    """
+    line = ''
+    for text in iter_log_text(chunks, log_tag):
+        line += text
+        *lines, line = line.split('\n')
+        yield from lines
+    if line:
+        yield line
@@ -0,0 +1,109 @@
+import copy
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+
+class MetadataCache:
+    def __init__(self, max_size: int = 256, ttl: float = 300):
+        """
+        LRU cache with a time to live for results of operations reading job definitions, such as
+        get_input_format, get_detail, get_options and get_list. Entries are kept per repository,
+        so that changes to a repository can invalidate them.
+
+        :param max_size: [Optional] number of results kept; the least recently used one is dropped beyond it
+        :param ttl: [Optional] seconds for which a result is served from the cache
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key):
+        """
+        :param key: (operation name, repository name, arguments)
+        :return: (True, copy of the cached result) if it is cached and fresh, (False, None) if it isn't
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+        # callers may change the result they get, so every one gets its own copy
+        return True, copy.deepcopy(value)
+
+
+    def put(self, key, value):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+    def invalidate(self, repo_name=None):
+        """
+        :param repo_name: [Optional] repository whose results are dropped; all results are dropped if not given
+        """
+        with self._lock:
+            if repo_name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[1] == repo_name]:
+                    del self._entries[key]
+
+
+    def stats(self):
+        """
+        :return: dict of hits, misses, evictions and the number of cached results
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries)}
+
+
+def cached_metadata(func):
+    """
+    Serves an operation reading job definitions from the metadata cache of the server, if any. Placed below
+    soap_operation, so that operations composing it with yield from, like run_job, use the cache as well.
+    The operation must have a repo_name parameter.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def operation(self, *args, **kwargs):
+        cache = self._server.metadata_cache
+        if cache is None:
+            return (yield from func(self, *args, **kwargs))
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((name, value) for name, value in bound.arguments.items() if name != 'self')
+        key = (func.__name__, bound.arguments['repo_name'], arguments)
+        hit, value = cache.get(key)
+        if hit:
+            return value
+        value = yield from func(self, *args, **kwargs)
+        cache.put(key, value)
+        return value
+    return operation
+
+
+def invalidate_metadata(server, repo_name):
+    """
+    Drops the cached job definitions of a repository after it was changed.
+    """
+    if server.metadata_cache is not None:
+        server.metadata_cache.invalidate(repo_name)
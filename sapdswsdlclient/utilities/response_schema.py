@@ -0,0 +1,113 @@
+from sapdswsdlclient.utilities.check_for_fault_or_error import fault_error
+
+
+class RecordSchema:
+    def __init__(self, record_tag, fields: dict, fault_tags=('faultstring',), record_type=None):
+        """
+        Maps every record element of a response to a record in a single walk over the tree.
+
+        :param record_tag: tag of the elements that become records, e.g. 'jobDetail'
+        :param fields: record key -> tag of the child element holding its value, e.g. {'RunID': 'runID'};
+                        missing children give None
+        :param fault_tags: tags whose text is raised as an error, e.g. ['errorMessage', 'faultstring']
+        :param record_type: [Optional] class called with the record keys as keyword arguments, e.g. JobExecution;
+                            records are dicts if not given
+        """
+        self.record_tag = record_tag
+        self.fields = fields
+        self.fault_tags = frozenset(fault_tags)
+        self.record_type = record_type
+        self._keys_by_tag = {tag: key for key, tag in fields.items()}
+
+    def make_record(self, values: dict):
+        """
+        :param values: record key -> text
+        :return: the record built from the values
+        """
+        if self.record_type is None:
+            return values
+        return self.record_type(**values)
+
+    def parse(self, root):
+        """
+        :param root: cleaned xml root of the response
+        :return: list of records in document order
+        :raises ValueError: if one of the fault tags holds a text
+        """
+        records = list()
+        for element in root.iter():
+            tag = element.tag
+            if tag == self.record_tag:
+                values = dict.fromkeys(self.fields)
+                for child in element:
+                    key = self._keys_by_tag.get(child.tag)
+                    if key is not None:
+                        values[key] = child.text
+                records.append(self.make_record(values))
+            elif tag in self.fault_tags and element.text is not None:
+                raise fault_error(tag, element.text)
+        return records
+
+    def parse_columns(self, root):
+        """
+        :param root: cleaned xml root of the response
+        :return: dict of record key -> list of the values of all records in document order
+        :raises ValueError: if one of the fault tags holds a text
+        """
+        columns = {key: list() for key in self.fields}
+        rows = 0
+        for element in root.iter():
+            tag = element.tag
+            if tag == self.record_tag:
+                rows += 1
+                for child in element:
+                    key = self._keys_by_tag.get(child.tag)
+                    if key is not None:
+                        column = columns[key]
+                        column.extend([None] * (rows - 1 - len(column)))
+                        column.append(child.text)
+            elif tag in self.fault_tags and element.text is not None:
+                raise fault_error(tag, element.text)
+        for column in columns.values():
+            column.extend([None] * (rows - len(column)))
+        return columns
+
+
+class FieldSchema:
+    def __init__(self, fields: dict, list_fields: dict = None, fault_tags=('faultstring',)):
+        """
+        Picks single values out of a response in a single walk over the tree.
+
+        :param fields: key -> tag of the first element holding its value anywhere in the response;
+                        missing elements give None
+        :param list_fields: [Optional] key -> tag of elements whose texts are all collected into a list
+        :param fault_tags: tags whose text is raised as an error, e.g. ['errorMessage', 'faultstring']
+        """
+        self.fields = fields
+        self.list_fields = list_fields or dict()
+        self.fault_tags = frozenset(fault_tags)
+        self._keys_by_tag = {tag: key for key, tag in fields.items()}
+        self._list_keys_by_tag = {tag: key for key, tag in self.list_fields.items()}
+
+    def parse(self, root):
+        """
+        :param root: cleaned xml root of the response
+        :return: dict of the values
+        :raises ValueError: if one of the fault tags holds a text
+        """
+        values = dict.fromkeys(self.fields)
+        found = set()
+        for key in self.list_fields:
+            values[key] = list()
+        for element in root.iter():
+            tag = element.tag
+            key = self._keys_by_tag.get(tag)
+            if key is not None and key not in found:
+                values[key] = element.text
+                found.add(key)
+            list_key = self._list_keys_by_tag.get(tag)
+            if list_key is not None:
+                values[list_key].append(element.text)
+            if tag in self.fault_tags and element.text is not None:
+                raise fault_error(tag, element.text)
+        return values
@@ -15,7 +15,8 @@ setup(
         'sapdswsdlclient.server',
         'sapdswsdlclient.models',
         'sapdswsdlclient.exceptions',
-        'sapdswsdlclient.templates'
+        'sapdswsdlclient.templates',
+        'sapdswsdlclient.utilities'
     ],
     url='https://github.com/sparklingSky/sap-ds-web-service-client',
     license='Custom Dual License',
@@ -26,5 +27,6 @@ setup(
     ],
     author='sparklingSky',
     python_requires='>=3.12',
-    install_requires=['requests~=2.32.3']
+    install_requires=['requests~=2.32.3'],
+    extras_require={'async': ['aiohttp>=3.9'], 'lxml': ['lxml>=5.0'], 'numpy': ['numpy>=1.24']}
 )
\ No newline at end of file
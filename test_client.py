@@ -23,6 +23,7 @@ parameter = 'substitution_parameter'
 service_name = 'service_name'
 
 xml_path = 'path_to_your_xml_object'
+xml_dir = 'path_to_your_directory_of_xml_objects'
 xml_pass = 'your_passphrase_for_the_object'
 
 server = ds.logon(wsdl_url, username, password, cms_system, cms_authentication)
@@ -64,6 +65,12 @@ job_run_ids = server.batch_job.get_run_ids(repo_name, job_name)
 job_run_ids = server.batch_job.get_run_ids(repo_name, job_name, 'warning')
 print(job_run_ids)
 
+for (job, run), details, error in server.batch_job.get_run_exe_detail_many(repo_name, [(job_name, run_id)]):
+    print(job, run, details, error)
+
+for job, run_ids, error in server.batch_job.get_run_ids_many(repo_name, [job_name], 'error'):
+    print(job, run_ids, error)
+
 job_input_format = server.batch_job.get_input_format(repo_name, job_name)
 print(job_input_format)
 
@@ -97,6 +104,9 @@ trace_log = server.log.get_trace_log(repo_name, run_id)
 print(trace_log)
 print(trace_log['traceLogMessage'].trace_log_raw_data)
 
+for line in server.log.iter_trace_log(repo_name, run_id):
+    print(line)
+
 job_servers = server.job_server.get_job_server_list(repo_name)
 print(job_servers)
 
@@ -122,6 +132,10 @@ import_job = server.repo.import_object(repo_name=repo_name, xml_path=xml_path,
 print(import_job)
 print(import_job['traceMessage'].trace_message)
 
+for path, imported, error in server.repo.import_objects(repo_name, xml_dir, xml_pass, max_workers=8,
+                                                        stop_on_error=True):
+    print(path, error or imported['returnCode'])
+
 as_info = server.realtime_service.get_as_info()
 print(as_info)
 
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+ENVELOPE = ('<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+            '<soapenv:Body>{}</soapenv:Body></soapenv:Envelope>')
+
+RESPONSES = {
+    'function=Logon': '<LogonResponse><SessionID>session-1</SessionID></LogonResponse>',
+    'function=Logout': '<LogoutResponse><status>Logout complete</status></LogoutResponse>',
+    'function=Validate_SessionID': '<ValidateResponse><Status>0</Status></ValidateResponse>',
+    'jobAdmin=Get_BatchJob_List': '<BatchJobList><jobName>JOB_A</jobName><jobName>JOB_B</jobName></BatchJobList>',
+    'jobAdmin=Get_Job_Input_Format': (
+        '<InputFormat><format>&lt;xsd:element name=\'JOB_A_GlobalVariables\'&gt;'
+        '&lt;xsd:element name=\'$G_DATE\'&gt;&lt;!-- data type \'date\'--&gt;</format></InputFormat>'),
+    'jobAdmin=Get_BatchJob_Run_ExeDetail': lambda data: (
+        '<faultstring>Run ID not found</faultstring>' if '<runID>404</runID>' in data else
+        '<jobDetail><ObjID>7</ObjID><StartTime>2026-10-01 10:00:00</StartTime><EndTime>2026-10-01 10:05:00</EndTime>'
+        '<ExecutionTime>300</ExecutionTime><Status>succeeded</Status><JobServerUsed>js1</JobServerUsed></jobDetail>'),
+    'jobAdmin=Get_Trace_Log': lambda data: (
+        '<faultstring>Session ID is invalid</faultstring>' if '<runID>401</runID>' in data else
+        '<returnCode>0</returnCode><trace>(14.2) started &amp; running\nrows: 10 & more \x01done\nlast line</trace>'),
+    'repoAdmin=Import_Repo_Object': '<returnCode>0</returnCode>',
+    'jobAdmin=Run_Batch_Job': ('<RunResponse><pid>1</pid><cid>2</cid><rid>3</rid>'
+                               '<repoName>REPO</repoName></RunResponse>'),
+}
+
+
+def respond(soap_action, data, responses=None):
+    responses = responses if responses is not None else RESPONSES
+    body = responses[soap_action]
+    if callable(body):
+        body = body(data)
+    return ENVELOPE.format(body)
+
+
+class FakeTransport:
+    def __init__(self, responses=None):
+        self.responses = responses
+        self.requests = []
+
+    def request(self, method, url, data, headers):
+        if not isinstance(data, (bytes, str)):
+            data = b''.join(data)
+        if isinstance(data, bytes):
+            data = data.decode('utf-8-sig')
+        self.requests.append((method, headers['SOAPAction'], data))
+        return SimpleNamespace(status_code=200, reason='OK', text=respond(headers['SOAPAction'], data, self.responses))
+
+    def stream(self, method, url, data, headers, chunk_size=65536):
+        text = self.request(method, url, data, headers).text
+        for start in range(0, len(text), 7):
+            yield text[start:start + 7]
+
+    def close(self):
+        pass
+
+
+class FakeAsyncTransport(FakeTransport):
+    async def request(self, method, url, data, headers):
+        response = FakeTransport.request(self, method, url, data, headers)
+        return response.status_code, response.reason, response.text
+
+    async def close(self):
+        pass
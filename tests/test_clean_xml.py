@@ -0,0 +1,94 @@
+import html
+import random
+import re
+import pytest
+from sapdswsdlclient.utilities.clean_xml import (clean_xml_text, clean_xml_request, iter_clean_xml_response,
+                                                 iter_clean_xml_request)
+
+
+def reference_clean_xml_text(xml_string):
+    cleaned_xml = xml_string.replace('\xa0', ' ')
+    cleaned_xml = ''.join(c for c in cleaned_xml if c.isprintable() or c.isspace())
+    return re.sub(r'&(?!(?:amp|lt|gt|quot|apos);)', '&amp;', cleaned_xml)
+
+
+def reference_clean_xml_request(xml_string):
+    if not isinstance(xml_string, str):
+        return ''
+    cdata_map = {}
+
+    def replace_cdata(match):
+        index = len(cdata_map)
+        cdata_map[index] = match.group(1)
+        return f'<![CDATA[CDATA_ID_{index}]]>'
+
+    xml_temp = re.sub(r'<!\[CDATA\[(.*?)\]\]>', replace_cdata, xml_string, flags=re.DOTALL)
+    cleaned_xml = xml_temp.replace('\xa0', ' ')
+    cleaned_xml = html.escape(cleaned_xml, quote=True)
+    cleaned_xml = cleaned_xml.replace('\n', ' ').replace('\r', ' ')
+    cleaned_xml = ''.join(c for c in cleaned_xml if ord(c) >= 32 or c in '\t\r\n')
+    cleaned_xml = cleaned_xml.replace('\u2028', ' ').replace('\u2029', ' ')
+    cleaned_xml = cleaned_xml.replace('"', 'quot;').replace("'", '&apos;').replace(r'\d', r'\\d')
+
+    def get_back_cdata(match):
+        marker_full = match.group(1)
+        try:
+            return cdata_map[int(marker_full.split('_')[-1])]
+        except (ValueError, IndexError):
+            return marker_full
+
+    cleaned_xml = cleaned_xml.replace('&lt;![CDATA[', '<![CDATA[').replace(']]&gt;', ']]>')
+    return re.sub(r'<!\[CDATA\[(.*?)\]\]>', get_back_cdata, cleaned_xml, flags=re.DOTALL)
+
+
+CORPUS = [
+    '',
+    '<a>plain</a>',
+    '<a>Tom & Jerry &amp; &lt;b&gt; &quot;q&quot; &apos;s&apos; &#10; &nbsp;</a>',
+    '<a>tab\tline\nfeed\rcarriage\x00\x01\x0b\x0c\x1b\x1c\x1f\x7f</a>',
+    '<a>\xa0non\xa0breaking\u2028line\u2029para\u200bzero\ufeffbom\u00adsoft</a>',
+    '<a>emoji \U0001F600 private \ue000 cjk 数据服务 \ud7ff</a>',
+    '<x attr="v" other=\'w\'>regex \\d+ and \\\\d</x>',
+    '<script><![CDATA[if (a < b && c > "d") { x = \'\\d\'; }]]></script>',
+    'stray ]]> before <![CDATA[one]]> and <![CDATA[two\nlines]]> after ]]> <![CDATA[ unclosed',
+    '<![CDATA[<![CDATA[nested]]>]]>',
+    '<a>CDATA_ID_0 <![CDATA[CDATA_ID_5]]></a>',
+    '\\\x00d',
+    '<a>\\\x00d &lt\x00;\u00e9 ]]\x00> <![CDATA[\\\x00d]]> \\\x01d</a>',
+]
+
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_clean_xml_text_matches_reference(text):
+    assert clean_xml_text(text) == reference_clean_xml_text(text)
+
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_clean_xml_request_matches_reference(text):
+    assert clean_xml_request(text) == reference_clean_xml_request(text)
+
+
+def test_random_input_matches_reference():
+    rng = random.Random(8)
+    alphabet = (['<![CDATA[', ']]>', '&', '&amp;', '&apos;', '<', '>', '"', "'", '\\d', '\n', '\r', '\t', '\xa0',
+                 '\u2028', '\u2029', '\x00', '\x1f', '\x85', '\u200b', '\U0001F600', 'CDATA_ID_1']
+                + list('abc xyz'))
+    for _ in range(500):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        assert clean_xml_text(text) == reference_clean_xml_text(text)
+        assert clean_xml_request(text) == reference_clean_xml_request(text)
+        chunk_size = rng.randint(1, 9)
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        assert ''.join(iter_clean_xml_response(chunks)) == reference_clean_xml_text(text)
+        assert ''.join(iter_clean_xml_request(chunks)) == reference_clean_xml_request(text)
+
+
+@pytest.mark.parametrize('text', CORPUS)
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 8, 13])
+def test_chunked_clean_xml_request_matches_whole(text, chunk_size):
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert ''.join(iter_clean_xml_request(chunks)) == clean_xml_request(text)
+
+
+def test_clean_xml_request_ignores_non_strings():
+    assert clean_xml_request(None) == ''
@@ -0,0 +1,72 @@
+import pytest
+from sapdswsdlclient import Server
+from sapdswsdlclient.utilities.columnar import MonitorLogColumns
+from sapdswsdlclient.utilities.log_entries import MonitorLogRows
+from tests.fakes import FakeTransport, RESPONSES
+
+np = pytest.importorskip('numpy')
+
+DF_ROWS = [('DF_A_1', 'PROCEED', '10', '1', '100', '1000', '200', '50.0'),
+           ('DF_A_1', 'STOP', '20', '2', '300', '1000', '600', '30.0'),
+           ('DF_A_2', 'STOP', '20', '2', '', '1000', '100', 'n/a')]
+MONITOR_LOG = ('/DF_A/SRC_TABLE, PROCEED, 100, 2.0, 3.0\n'
+               '/DF_A/Query, with comma, STOP, 300, 0, 6.5\n')
+
+
+def df_monitor_log(data):
+    return ''.join(f'<Row><threadName>{thread}</threadName><state>{state}</state>'
+                   f'<absoluteTime>{absolute_time}</absoluteTime><counter>{counter}</counter>'
+                   f'<rowProcessed>{rows}</rowProcessed><bufferSize>{size}</bufferSize><bufferUsed>{used}</bufferUsed>'
+                   f'<CPUUtilization>{cpu}</CPUUtilization></Row>'
+                   for thread, state, absolute_time, counter, rows, size, used, cpu in DF_ROWS)
+
+
+@pytest.fixture
+def server():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_DF_Monitor_Log': df_monitor_log,
+                                      'jobAdmin=Get_Monitor_Log': f'<returnCode>0</returnCode>'
+                                                                  f'<monitor>{MONITOR_LOG}</monitor>'})
+    server.logon()
+    return server
+
+
+def test_df_monitor_columns(server):
+    columns = server.dataflow.get_df_monitor_log('REPO', '1', 'DF_A', 'no', columnar=True)
+
+    assert len(columns) == 3
+    assert columns['counter'].dtype == np.int64
+    assert columns['rowProcessed'].dtype == np.float64 and np.isnan(columns['rowProcessed'][2])
+    assert columns['jobServerUsed'].tolist() == ['', '', '']
+    assert columns.rows_per_second()[:2].tolist() == [10.0, 15.0]
+    assert columns.peak_buffer_use() == {'DF_A_1': 600.0, 'DF_A_2': 100.0}
+    assert columns.cpu_per_thread()['DF_A_1'] == 40.0
+    assert np.isnan(columns.cpu_per_thread()['DF_A_2'])
+
+
+def test_df_monitor_rows_are_unchanged(server):
+    rows = server.dataflow.get_df_monitor_log('REPO', '1', 'DF_A', 'no')
+
+    assert [row['rowProcessed'] for row in rows] == ['100', '300', None]
+
+
+def test_monitor_log_columns(server):
+    monitor_log = server.log.get_monitor_log('REPO', '1', columnar=True)
+    columns = monitor_log['MonitorLogColumns']
+
+    assert columns['PathName'].tolist() == ['/DF_A/SRC_TABLE', '/DF_A/Query, with comma']
+    assert columns['RowCount'].tolist() == [100, 300]
+    assert columns['AbsoluteTime'].tolist() == [3.0, 6.5]
+    assert columns.rows_per_second()[0] == 50.0 and np.isnan(columns.rows_per_second()[1])
+    assert columns.rows_per_path() == {'/DF_A/Query, with comma': 300.0, '/DF_A/SRC_TABLE': 100.0}
+
+
+def test_monitor_log_columns_parse_like_monitor_log_rows():
+    text = MONITOR_LOG.replace('\n', '\r\n') + 'not a row\n'
+
+    columns = MonitorLogColumns.from_text(text)
+    rows = MonitorLogRows(text)
+
+    assert list(columns['PathName']) == [row['PathName'] for row in rows]
+    assert list(columns['PathName']) == ['/DF_A/SRC_TABLE', '/DF_A/Query, with comma']
+    assert list(columns['RowCount']) == [100, 300]
@@ -0,0 +1,35 @@
+import xml.etree.ElementTree as ET
+from sapdswsdlclient.server.soap_call import SoapCall, build_request
+from sapdswsdlclient.templates.envelope import Raw, compile_request, soap_request
+
+BODY = '''<ser:Run_Batch_JobRequest>
+            <repoName>{repo_name}</repoName>
+            <jobParameters>{job_parameters}</jobParameters>
+        </ser:Run_Batch_JobRequest>'''
+
+
+def test_values_are_escaped_and_raw_values_are_not():
+    request = soap_request(BODY, repo_name='R&D <test>', job_parameters=Raw('<executionParameters/>'))
+
+    data = request.render('session-1')
+    root = ET.fromstring(data)
+
+    assert isinstance(data, bytes)
+    assert root.find('.//repoName').text == 'R&D <test>'
+    assert root.find('.//jobParameters/executionParameters') is not None
+    assert root.find('.//SessionID').text == 'session-1'
+
+
+def test_templates_are_compiled_once():
+    assert soap_request(BODY, repo_name='A', job_parameters='').template is compile_request(BODY)
+
+
+def test_encoding_with_bom_prefixes_only_the_request():
+    call = SoapCall('repoAdmin=Import_Repo_Object', soap_request(BODY, repo_name='数据', job_parameters=''),
+                    encoding='utf-8-sig')
+
+    data = build_request('session-1', call)
+
+    assert data.startswith(b'\xef\xbb\xbf<soapenv:Envelope')
+    assert data.count(b'\xef\xbb\xbf') == 1
+    assert '数据'.encode('utf-8') in data
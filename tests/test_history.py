@@ -0,0 +1,79 @@
+import re
+from datetime import datetime, timedelta
+from sapdswsdlclient import Server
+from sapdswsdlclient.models.history import HistorySync
+from tests.fakes import FakeTransport, RESPONSES
+
+
+class History:
+    def __init__(self):
+        self.runs = {}
+        self.ranges = []
+
+    def add(self, run_id, job_name, start, status):
+        self.runs[run_id] = (job_name, start, status)
+
+    def respond(self, data):
+        start = re.search('<rangeStartTime>(.*?)</rangeStartTime>', data).group(1)
+        end = re.search('<rangeEndTime>(.*?)</rangeEndTime>', data).group(1)
+        self.ranges.append((start, end))
+        details = ''.join(
+            f'<jobDetail><JobName>{job}</JobName><runID>{run_id}</runID><StartTime>{run_start}</StartTime>'
+            f'<Status>{status}</Status></jobDetail>'
+            for run_id, (job, run_start, status) in self.runs.items()
+            if start <= run_start <= end or (status == 'running' and run_start <= end))
+        return details or '<errorMessage></errorMessage>'
+
+
+def make_server(history):
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_BatchJob_By_TimeRange': history.respond})
+    server.logon()
+    return server
+
+
+def test_sync_is_incremental_and_revisits_running_runs():
+    history = History()
+    server = make_server(history)
+    store = HistorySync(':memory:', overlap=timedelta(0))
+    history.add('1', 'JOB_A', '2026-07-01 10:00:00', 'error')
+    history.add('2', 'JOB_A', '2026-07-02 10:00:00', 'running')
+    history.add('3', 'JOB_B', '2026-07-02 11:00:00', 'succeeded')
+
+    assert store.sync_repo(server, 'REPO', since='2026-07-01 00:00:00', until='2026-07-03 00:00:00') == 3
+    assert history.ranges == [('2026-07-01 00:00:00', '2026-07-02 00:00:00'),
+                              ('2026-07-02 00:00:00', '2026-07-03 00:00:00')]
+    assert store.synced_until('REPO') == '2026-07-03 00:00:00'
+
+    history.add('2', 'JOB_A', '2026-07-02 10:00:00', 'succeeded')
+    history.add('4', 'JOB_A', '2026-07-03 09:00:00', 'error')
+    history.ranges.clear()
+    store.sync_repo(server, 'REPO', until='2026-07-03 12:00:00')
+
+    # the window starts at the running run instead of the high-water mark
+    assert history.ranges == [('2026-07-02 10:00:00', '2026-07-03 10:00:00'),
+                              ('2026-07-03 10:00:00', '2026-07-03 12:00:00')]
+    failures = store.query(job_name='JOB_A', status='ERROR')
+    assert [run['RunID'] for run in failures] == ['1', '4']
+    assert [run['Status'] for run in store.query(repo_name='REPO', since='2026-07-02 00:00:00')] == [
+        'succeeded', 'succeeded', 'error']
+    assert len(store.query()) == 4
+
+
+def test_sync_many_repos_and_persists(tmp_path):
+    history = History()
+    server = make_server(history)
+    path = str(tmp_path / 'history.db')
+    until = datetime(2026, 7, 3)
+    history.add('1', 'JOB_A', '2026-07-02 10:00:00', 'succeeded')
+
+    with HistorySync(path) as store:
+        results = {repo: (count, error) for repo, count, error in
+                   store.sync(server, ['REPO', 'OTHER'], since=until - timedelta(days=1), until=until,
+                                                                max_workers=2)}
+    assert results == {'REPO': (1, None), 'OTHER': (1, None)}
+
+    with HistorySync(path) as store:
+        assert store.synced_until('OTHER') == '2026-07-03 00:00:00'
+        assert store.synced_until('UNKNOWN') is None
+        assert len(store.query(repo_name='REPO')) == 1
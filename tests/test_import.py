@@ -0,0 +1,63 @@
+import pytest
+from sapdswsdlclient import Server
+from tests.fakes import FakeTransport
+
+DEFINITION = ('<?xml version="1.0" encoding="UTF-8"?>\n\n'
+              '<DataIntegratorExport><DIScript name="SCR_INIT"><![CDATA[$G_DATE = sysdate(); print(\'\\d\');]]>'
+              '</DIScript><DIAttribute name="desc" value="Tom & Jerry <b> 数据"/>\n</DataIntegratorExport>\n')
+
+
+@pytest.fixture
+def server():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport()
+    server.logon()
+    return server
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 9, 64])
+def test_streamed_import_sends_the_same_request(server, tmp_path, chunk_size):
+    xml_path = tmp_path / 'export.xml'
+    xml_path.write_text(DEFINITION)
+
+    loaded = server.repo.import_object('REPO', xml_path, 'secret')
+    streamed = server.repo.import_object('REPO', xml_path, 'secret', chunk_size=chunk_size)
+
+    whole_request, streamed_request = server.transport.requests[-2][2], server.transport.requests[-1][2]
+    assert streamed['returnCode'] == loaded['returnCode'] == '0'
+    assert streamed_request == whole_request
+    assert '<definition>&lt;DataIntegratorExport&gt;' in streamed_request
+
+
+def test_import_objects_reports_every_file_of_a_directory(server, tmp_path):
+    for name in ('a.xml', 'b.XML', 'notes.txt'):
+        (tmp_path / name).write_text(DEFINITION)
+
+    results = list(server.repo.import_objects('REPO', tmp_path, 'secret', max_workers=2))
+
+    assert sorted(path for path, _, _ in results) == [str(tmp_path / 'a.xml'), str(tmp_path / 'b.XML')]
+    assert all(error is None and imported['returnCode'] == '0' for _, imported, error in results)
+
+
+@pytest.mark.parametrize('as_path', [str, lambda path: path])
+def test_import_objects_imports_a_single_file_path(server, tmp_path, as_path):
+    xml_path = tmp_path / 'export.xml'
+    xml_path.write_text(DEFINITION)
+
+    results = list(server.repo.import_objects('REPO', as_path(xml_path), 'secret', max_workers=2))
+
+    assert [(path, imported['returnCode'], error) for path, imported, error in results] == [
+        (as_path(xml_path), '0', None)]
+
+
+def test_import_objects_stops_on_first_failure(server, tmp_path):
+    paths = [tmp_path / 'missing.xml'] + [tmp_path / f'{index}.xml' for index in range(20)]
+    for path in paths[1:]:
+        path.write_text(DEFINITION)
+
+    results = list(server.repo.import_objects('REPO', paths, 'secret', max_workers=1, stop_on_error=True))
+
+    # imports that finished before the failure may be reported first, in any order
+    assert results[-1][0] == paths[0]
+    assert isinstance(results[-1][2], FileNotFoundError)
+    assert all(error is None for _, _, error in results[:-1])
@@ -0,0 +1,128 @@
+import os
+import time
+import pytest
+from sapdswsdlclient import Server
+from sapdswsdlclient.utilities.log_cache import LogCache
+from tests.fakes import FakeTransport, RESPONSES
+
+RUN_IDS = ('<runs><run><runID>1</runID><status>error</status><repoName>REPO</repoName></run>'
+           '<run><runID>2</runID><status>running</status><repoName>REPO</repoName></run></runs>')
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_BatchJob_RunIDs': RUN_IDS})
+    server.logon()
+    server.open_log_cache(tmp_path / 'logs')
+    return server
+
+
+def log_requests(server):
+    return [action for _, action, _ in server.transport.requests if action.endswith('_Log')]
+
+
+def test_finished_runs_are_served_from_cache(server):
+    server.batch_job.get_run_ids('REPO', 'JOB_A')
+    first = server.log.get_trace_log('REPO', '1', 1)
+    second = server.log.get_trace_log('REPO', '1', 1)
+
+    assert second['traceLogMessage'].trace_log_raw_data == first['traceLogMessage'].trace_log_raw_data
+    assert second['ReturnCode'] == '0'
+    assert len(log_requests(server)) == 1
+    assert (server.log_cache.hits, server.log_cache.misses) == (1, 1)
+
+
+def test_cached_pages_need_no_session(server):
+    server.batch_job.get_run_ids('REPO', 'JOB_A')
+    server.log.get_trace_log('REPO', '1', 1)
+    # the session is due to be validated again, but a cached page doesn't need it
+    server.session_validated_at = None
+    sent = len(server.transport.requests)
+
+    assert server.log.get_trace_log('REPO', '1', 1)['ReturnCode'] == '0'
+    assert len(server.transport.requests) == sent
+
+
+def test_running_and_unknown_runs_are_not_stored(server):
+    server.batch_job.get_run_ids('REPO', 'JOB_A')
+    server.log.get_trace_log('REPO', '2', 1)
+    server.log.get_trace_log('REPO', '2', 1)
+    server.log.get_trace_log('REPO', '3', 1)
+    server.log.get_trace_log('REPO', '3', 1)
+
+    assert len(log_requests(server)) == 4
+    assert server.log_cache.size() == 0
+
+
+def test_run_exe_detail_marks_run_finished(server):
+    server.batch_job.get_run_exe_detail('REPO', 'JOB_A', '7')
+    server.log.get_trace_log('REPO', '7')
+
+    assert server.log_cache.get(server.wsdl_url, 'REPO', '7', 'trace', None)[0]
+    assert not server.log_cache.get(server.wsdl_url, 'REPO', '7', 'trace', 1)[0]
+
+
+def test_cache_is_shared_across_instances(tmp_path):
+    cache = LogCache(tmp_path)
+    cache.mark_finished('url', 'REPO', 1)
+    cache.put('url', 'REPO', 1, 'error', 1, 'line & more\n')
+    cache.put('url', 'REPO', 1, 'error', 2, None)
+
+    reopened = LogCache(tmp_path)
+    assert reopened.get('url', 'REPO', '1', 'error', 1) == (True, 'line & more\n')
+    assert reopened.get('url', 'REPO', '1', 'error', 2) == (True, None)
+    assert reopened.get('other', 'REPO', '1', 'error', 1) == (False, None)
+    assert reopened.size() == cache.size() > 0
+
+
+def test_evicts_oldest_pages_above_max_bytes(tmp_path):
+    cache = LogCache(tmp_path, max_bytes=10 ** 6)
+    cache.mark_finished('url', 'REPO', 1)
+    for page in range(1, 4):
+        cache.put('url', 'REPO', 1, 'trace', page, os.urandom(300).hex())
+        path = cache.path('url', 'REPO', 1, 'trace', page)
+        os.utime(path, (time.time() - 100 + page, time.time() - 100 + page))
+    cache.max_bytes = cache.size() - 1
+    cache.prune()
+
+    assert not cache.get('url', 'REPO', 1, 'trace', 1)[0]
+    assert cache.get('url', 'REPO', 1, 'trace', 2)[0]
+    assert cache.get('url', 'REPO', 1, 'trace', 3)[0]
+
+
+def test_reading_a_page_keeps_it_over_older_unread_pages(tmp_path):
+    cache = LogCache(tmp_path, max_bytes=10 ** 6)
+    cache.mark_finished('url', 'REPO', 1)
+    for page in range(1, 4):
+        cache.put('url', 'REPO', 1, 'trace', page, os.urandom(300).hex())
+        path = cache.path('url', 'REPO', 1, 'trace', page)
+        os.utime(path, (time.time() - 100 + page, time.time() - 100 + page))
+    assert cache.get('url', 'REPO', 1, 'trace', 1)[0]
+    cache.max_bytes = cache.size() - 1
+    cache.prune()
+
+    assert cache.get('url', 'REPO', 1, 'trace', 1)[0]
+    assert not cache.get('url', 'REPO', 1, 'trace', 2)[0]
+    assert cache.get('url', 'REPO', 1, 'trace', 3)[0]
+
+
+def test_remembers_a_limited_number_of_finished_runs(tmp_path):
+    cache = LogCache(tmp_path, max_finished_runs=2)
+    for run_id in (1, 2, 1, 3):
+        cache.mark_finished('url', 'REPO', run_id)
+
+    assert [cache.is_finished('url', 'REPO', run_id) for run_id in (1, 2, 3)] == [True, False, True]
+    assert not cache.put('url', 'REPO', 2, 'trace', 1, 'text')
+
+
+def test_expires_pages_after_max_age(tmp_path):
+    cache = LogCache(tmp_path, max_age=60)
+    cache.mark_finished('url', 'REPO', 1)
+    cache.put('url', 'REPO', 1, 'trace', 1, 'text')
+    path = cache.path('url', 'REPO', 1, 'trace', 1)
+    os.utime(path, (time.time() - 120, time.time() - 120))
+
+    assert cache.get('url', 'REPO', 1, 'trace', 1) == (False, None)
+    assert not path.exists()
+    assert cache.size() == 0
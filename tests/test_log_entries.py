@@ -0,0 +1,63 @@
+import pytest
+from sapdswsdlclient.utilities.log_entries import LogEntries, ErrorLog, MonitorLogRows
+
+ERROR_LOG = ('5208\t4836\tDBS-070401\t6/29/2026 4:18:43 AM\t|Data flow DF_LOAD|Reader SALES\n'
+             'ODBC data source <DWH> error message for operation <SQLExecute>:\n'
+             '<Table not found>.\n'
+             '5208\t4836\tRUN-050304\t6/29/2026 4:18:44 AM\t|Session JOB_A|Data flow DF_LOAD\n'
+             '5208\t4840\tDBS-070401\t6/29/2026 4:18:45 AM\tsecond failure\n')
+
+
+def test_error_log_entries():
+    entries = ErrorLog(ERROR_LOG)
+
+    assert len(entries) == 3
+    first = entries[0]
+    assert (first['ProcessID'], first['ThreadID'], first['ErrorCode'], first['Timestamp']) == (
+        '5208', '4836', 'DBS-070401', '6/29/2026 4:18:43 AM')
+    assert first['Message'] == ('|Data flow DF_LOAD|Reader SALES\n'
+                                'ODBC data source <DWH> error message for operation <SQLExecute>:\n'
+                                '<Table not found>.')
+    assert entries[-1]['Message'] == 'second failure'
+    assert [entry['ErrorCode'] for entry in entries[1:]] == ['RUN-050304', 'DBS-070401']
+    assert list(entries) == entries[:]
+    with pytest.raises(IndexError):
+        entries[3]
+
+
+def test_error_log_tail_reads_from_the_end():
+    entries = ErrorLog(ERROR_LOG)
+
+    assert [entry['Timestamp'][-5:-3] for entry in entries.tail(2)] == ['44', '45']
+    assert entries.tail(10)[0]['Message'].endswith('<Table not found>.')
+    # tail() doesn't index the whole text
+    assert entries._offsets is None
+    assert entries.tail(2) == entries[-2:]
+    assert entries.tail(0) == []
+
+
+def test_error_log_with_code_parses_only_matching_entries():
+    entries = ErrorLog(ERROR_LOG)
+
+    matching = entries.with_code('DBS-070401')
+
+    assert [entry['ThreadID'] for entry in matching] == ['4836', '4840']
+    assert len(entries._entries) == 2
+    assert ErrorLog(None).with_code('RUN-050304') == []
+    assert len(ErrorLog(None)) == 0
+
+
+def test_monitor_log_rows_keep_commas_in_path_names():
+    rows = MonitorLogRows('/DF_A/Query, PROCEED, 10, 1.5, 2.0\n'
+                          '/DF_A/Join, left, right, STOP, 20, 3.0, 4.5\r\n'
+                          '\n')
+
+    assert len(rows) == 2
+    assert rows[1].to_dict() == {'PathName': '/DF_A/Join, left, right', 'State': 'STOP', 'RowCount': '20',
+                                 'ElapsedTime': '3.0', 'AbsoluteTime': '4.5'}
+    assert rows.tail(1) == [rows[1]]
+
+
+def test_log_entries_require_make_entry():
+    with pytest.raises(TypeError):
+        LogEntries('text')
@@ -0,0 +1,56 @@
+import tempfile
+import pytest
+from sapdswsdlclient import Server
+from sapdswsdlclient.utilities import log_file
+from sapdswsdlclient.utilities.log_file import LogFile
+from tests.fakes import FakeTransport
+
+
+def make_log_file(text):
+    file = tempfile.TemporaryFile()
+    file.write(text.encode('utf-8'))
+    return LogFile(file)
+
+
+@pytest.mark.parametrize('text', ['', 'one', 'one\n', 'one\ntwo\nthree\n', 'one\n\nthrée\nfour', '\n\n'])
+def test_lines_match_split(text, monkeypatch):
+    monkeypatch.setattr(log_file, 'index_block_size', 3)
+    expected = text.split('\n')
+    if text.endswith('\n') or not text:
+        expected.pop()
+    with make_log_file(text) as log:
+        assert log.tail(2) == expected[-2:]
+        assert log.tail(100) == expected
+        assert len(log) == len(log.lines) == len(expected)
+        assert log.lines[:] == list(log.lines) == expected
+        assert log.lines[1:3] == expected[1:3]
+        if expected:
+            assert log.lines[-1] == expected[-1]
+
+
+def test_grep_and_read():
+    with make_log_file('start\nRUN-050304 failed\nretry\nRUN-050304 RUN-050304 again\n') as log:
+        assert list(log.grep(r'RUN-\d+')) == [(1, 'RUN-050304 failed'), (3, 'RUN-050304 RUN-050304 again')]
+        assert list(log.grep('missing')) == []
+        assert log.read(0, 5) == b'start'
+        assert log.read(log.size - 6) == b'again\n'
+        with pytest.raises(IndexError):
+            log.lines[4]
+
+
+def test_tail_does_not_index():
+    with make_log_file('\n'.join(map(str, range(1000)))) as log:
+        assert log.tail(3) == ['997', '998', '999']
+        assert log._offsets is None
+
+
+def test_trace_log_as_file():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport()
+    server.logon()
+    expected = server.log.get_trace_log('REPO', '1')['traceLogMessage'].trace_log_raw_data
+
+    with server.log.get_trace_log('REPO', '1', as_file=True) as log:
+        assert isinstance(log, LogFile)
+        assert log.lines[:] == expected.split('\n')
+        assert log.tail(1) == ['last line']
@@ -0,0 +1,80 @@
+import html
+from datetime import datetime, timedelta
+import pytest
+from sapdswsdlclient import Server
+from sapdswsdlclient.models.log_index import LogIndex, log_tokens
+from tests.fakes import FakeTransport, RESPONSES
+
+ERROR_LOG = ('(14.2) 10-01-26 10:00:05 (E) (1234:5678) RUN-050304: |Data flow DF_LOAD_SALES|Reader SALES\n'
+             'Function call <sql ( DS_DWH, DWH.SALES_FACT )> failed, due to error <DBS-070401>.\n')
+
+
+def test_log_tokens():
+    tokens = log_tokens(ERROR_LOG)
+
+    assert tokens['RUN-050304'] == 1
+    assert tokens['DBS-070401'] == 1
+    assert tokens['DF_LOAD_SALES'] == 1
+    assert tokens['DWH.SALES_FACT'] == 1
+    assert tokens['SALES_FACT'] == 1
+    # times, dates, process IDs and single characters aren't tokens
+    assert not {'10-01-26', '10', '1234', 'E'} & set(tokens)
+
+
+def test_search_by_tokens_and_time():
+    index = LogIndex(':memory:')
+    now = datetime.now()
+    index.add('REPO', 1, 'error', ERROR_LOG, now - timedelta(days=40))
+    index.add('REPO', 2, 'error', [ERROR_LOG, 'RUN-050304 again'], now - timedelta(days=2))
+    index.add('REPO', 3, 'error', 'DBS-070401 only', now - timedelta(days=1))
+
+    assert [hit['run_id'] for hit in index.search('run-050304')] == ['2', '1']
+    assert index.search('RUN-050304', since=now - timedelta(days=30))[0]['count'] == 2
+    assert [hit['run_id'] for hit in index.search('RUN-050304', 'DBS-070401')] == ['2', '1']
+    assert index.search('RUN-050304', repo_name='OTHER') == []
+    assert index.search('UNKNOWN') == []
+    with pytest.raises(ValueError):
+        index.search()
+
+
+def test_add_replaces_and_remove_before(tmp_path):
+    with LogIndex(str(tmp_path / 'index.db')) as index:
+        index.add('REPO', 1, 'trace', 'DF_A', '2026-01-01 00:00:00')
+        index.add('REPO', 1, 'trace', 'DF_B', '2026-01-01 00:00:00')
+        index.add('REPO', 2, 'trace', 'DF_B', '2026-06-01 00:00:00')
+
+    with LogIndex(str(tmp_path / 'index.db')) as index:
+        assert index.search('DF_A') == []
+        assert len(index.search('DF_B')) == 2
+        assert index.remove_before('2026-03-01 00:00:00') == 1
+        assert [hit['run_id'] for hit in index.search('DF_B')] == ['2']
+
+
+def test_update_indexes_finished_runs_once():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_Error_Log': lambda data: (
+        f'<returnCode>0</returnCode><error>{html.escape(ERROR_LOG) if "<page>1</page>" in data else ""}</error>')})
+    server.logon()
+    index = LogIndex(':memory:')
+    runs = [{'RunID': '1', 'Status': 'error', 'StartTime': '2026-10-01 10:00:00'},
+            {'RunID': '2', 'Status': 'running', 'StartTime': '2026-10-01 11:00:00'}]
+
+    assert index.update(server, 'REPO', runs, log_types=('error',)) == 1
+    assert index.update(server, 'REPO', runs, log_types=('error',)) == 0
+    assert [hit['run_id'] for hit in index.search('DBS-070401')] == ['1']
+    assert index.search('DBS-070401')[0]['run_time'] == datetime(2026, 10, 1, 10, 0)
+
+
+def test_update_takes_run_id_records_and_pairs_but_not_bare_run_ids():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_Error_Log': lambda data: (
+        f'<returnCode>0</returnCode><error>{html.escape(ERROR_LOG) if "<page>1</page>" in data else ""}</error>')})
+    server.logon()
+    index = LogIndex(':memory:')
+
+    assert index.update(server, 'REPO', [('1', 'succeeded'), ('2', 'running')], log_types=('error',)) == 1
+    assert index.update(server, 'REPO', [{'runID': '2', 'status': 'warning', 'repoName': 'REPO'}],
+                        log_types=('error',)) == 1
+    assert [hit['run_id'] for hit in index.search('DBS-070401')] == ['2', '1']
+    with pytest.raises(TypeError):
+        index.update(server, 'REPO', ['3'], log_types=('error',))
@@ -0,0 +1,237 @@
+import gzip
+import io
+import pytest
+from sapdswsdlclient import Server
+from sapdswsdlclient.models import logs
+from sapdswsdlclient.exceptions.exceptions import SessionExpiredError, LogNotFoundError
+from tests.fakes import FakeTransport, RESPONSES
+
+
+@pytest.fixture
+def server():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport()
+    server.logon()
+    return server
+
+
+def test_iter_trace_log_matches_full_parse(server):
+    lines = list(server.log.iter_trace_log('REPO', '1'))
+    full = server.log.get_trace_log('REPO', '1')['traceLogMessage'].trace_log_raw_data
+
+    assert lines == ['(14.2) started & running', 'rows: 10 & more done', 'last line']
+    assert '\n'.join(lines) == full
+
+
+def test_iter_trace_log_raises_faults(server):
+    with pytest.raises(SessionExpiredError):
+        list(server.log.iter_trace_log('REPO', '401'))
+
+
+def expiring_trace_log():
+    """
+    :return: responses whose first session has expired by the time a trace log is requested
+    """
+    sessions = iter(range(1, 10))
+
+    def trace(data):
+        if '<SessionID>session-1</SessionID>' in data:
+            return '<faultstring>Session ID is invalid</faultstring>'
+        return '<returnCode>0</returnCode><trace>first\nsecond</trace>'
+    return {**RESPONSES, 'function=Logon': lambda data: f'<SessionID>session-{next(sessions)}</SessionID>',
+            'jobAdmin=Get_Trace_Log': trace}
+
+
+@pytest.mark.parametrize('read', [
+    lambda log: list(log.iter_trace_log('REPO', '1')),
+    lambda log: log.download('REPO', '1', 'trace', io.BytesIO()),
+    lambda log: log.get_trace_log('REPO', '1', as_file=True).lines[:],
+])
+def test_streamed_logs_sign_in_again_on_session_fault(read):
+    transport = FakeTransport(expiring_trace_log())
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = transport
+    server.logon()
+
+    assert read(server.log) in (['first', 'second'], len('first\nsecond'))
+    assert [action for _, action, _ in transport.requests] == [
+        'function=Logon', 'jobAdmin=Get_Trace_Log', 'function=Logout', 'function=Logon', 'jobAdmin=Get_Trace_Log']
+
+
+def paged_trace_log(pages, missing_after=None):
+    """
+    :return: response of Get_Trace_Log serving the given page texts, an empty page after the last one
+            or, if missing_after is set, returnCode 1 for pages beyond it
+    """
+    def respond_page(data):
+        page = int(data.split('<page>')[1].split('</page>')[0])
+        if missing_after is not None and page > missing_after:
+            return '<returnCode>1</returnCode><trace>Log not found</trace>'
+        text = pages[page - 1] if page <= len(pages) else ''
+        return f'<returnCode>0</returnCode><trace>{text}</trace>'
+    return {'function=Logon': '<LogonResponse><SessionID>session-1</SessionID></LogonResponse>',
+            'jobAdmin=Get_Trace_Log': respond_page}
+
+
+def paged_server(responses):
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport(responses)
+    server.logon()
+    return server
+
+
+@pytest.mark.parametrize('read_ahead', [0, 1, 3])
+def test_iter_pages_walks_all_pages(read_ahead):
+    server = paged_server(paged_trace_log(['one', 'two', 'three']))
+
+    pages = [(page, log['traceLogMessage'].trace_log_raw_data)
+             for page, log in server.log.iter_pages('REPO', '1', 'trace', read_ahead=read_ahead)]
+
+    assert pages == [(1, 'one'), (2, 'two'), (3, 'three')]
+
+
+def test_iter_pages_stops_at_missing_or_repeated_page():
+    server = paged_server(paged_trace_log(['one', 'two'], missing_after=2))
+    assert [page for page, _ in server.log.iter_pages('REPO', '1', 'trace')] == [1, 2]
+
+    # servers that ignore the page number keep returning the same text
+    server = paged_server(paged_trace_log(['same'] * 10))
+    assert [page for page, _ in server.log.iter_pages('REPO', '1', 'trace', first_page=4)] == [4]
+
+
+def test_iter_pages_raises_if_first_page_is_missing():
+    server = paged_server(paged_trace_log(['one'], missing_after=0))
+    with pytest.raises(LogNotFoundError):
+        list(server.log.iter_pages('REPO', '1', 'trace'))
+
+
+def test_iter_pages_limits_read_ahead():
+    server = paged_server(paged_trace_log([str(page) for page in range(1, 51)]))
+    pages = server.log.iter_pages('REPO', '1', 'trace', read_ahead=2)
+
+    assert next(pages)[0] == 1
+    pages.close()
+    requested = [data for _, action, data in server.transport.requests if action == 'jobAdmin=Get_Trace_Log']
+    assert len(requested) <= 3
+
+
+def test_iter_pages_checks_arguments_eagerly(server):
+    with pytest.raises(ValueError):
+        server.log.iter_pages('REPO', '1', 'audit')
+    with pytest.raises(ValueError):
+        server.log.iter_pages('REPO', '1', 'trace', read_ahead=-1)
+
+
+class GrowingRun:
+    """
+    Run whose trace log grows by one snapshot per status check; pages hold at most page_size lines.
+    """
+    def __init__(self, snapshots, page_size=2):
+        self.snapshots = snapshots
+        self.page_size = page_size
+        self.checks = 0
+        self.pages_requested = []
+
+    def lines(self):
+        return self.snapshots[min(self.checks, len(self.snapshots)) - 1]
+
+    def status(self, data):
+        self.checks += 1
+        status = 'succeeded' if self.checks >= len(self.snapshots) else 'running'
+        return f'<jobDetail><Status>{status}</Status></jobDetail>'
+
+    def trace(self, data):
+        page = int(data.split('<page>')[1].split('</page>')[0])
+        self.pages_requested.append(page)
+        text = '\n'.join(self.lines())
+        lines = text.split('\n')
+        start = (page - 1) * self.page_size
+        if start and start >= len(lines):
+            return '<returnCode>1</returnCode><trace>Log not found</trace>'
+        page_lines = lines[start:start + self.page_size]
+        page_text = '\n'.join(page_lines) + ('\n' if start + self.page_size < len(lines) else '')
+        return f'<returnCode>0</returnCode><trace>{page_text}</trace>'
+
+
+def test_follow_yields_new_lines_until_run_finishes():
+    run = GrowingRun([['a'], ['a', 'b', 'c'], ['a', 'b', 'c', 'd', 'e']])
+    server = paged_server({'function=Logon': '<LogonResponse><SessionID>session-1</SessionID></LogonResponse>',
+                           'jobAdmin=Get_BatchJob_Run_ExeDetail': run.status,
+                           'jobAdmin=Get_Trace_Log': run.trace})
+
+    lines = list(server.log.follow('REPO', '1', 'JOB_A', 'trace', poll=0, max_poll=0))
+
+    assert lines == ['a', 'b', 'c', 'd', 'e']
+    # every poll downloads the current page and probes the next one, earlier pages aren't downloaded again
+    assert run.pages_requested == [1, 2, 1, 1, 2, 3, 4]
+
+
+def test_follow_holds_back_incomplete_last_line():
+    run = GrowingRun([['a', 'b'], ['a', 'b'], ['a', 'b']], page_size=10)
+    server = paged_server({'function=Logon': '<LogonResponse><SessionID>session-1</SessionID></LogonResponse>',
+                           'jobAdmin=Get_BatchJob_Run_ExeDetail': run.status,
+                           'jobAdmin=Get_Trace_Log': run.trace})
+    lines = server.log.follow('REPO', '1', 'JOB_A', poll=0, max_poll=0)
+
+    assert next(lines) == 'a'
+    assert run.checks == 1
+    # 'b' has no line break yet, so it is only handed out once the run has finished
+    assert list(lines) == ['b']
+    assert run.checks == 3
+
+
+def test_follow_times_out():
+    run = GrowingRun([['a']] * 100)
+    server = paged_server({'function=Logon': '<LogonResponse><SessionID>session-1</SessionID></LogonResponse>',
+                           'jobAdmin=Get_BatchJob_Run_ExeDetail': run.status,
+                           'jobAdmin=Get_Trace_Log': run.trace})
+    with pytest.raises(TimeoutError):
+        list(server.log.follow('REPO', '1', 'JOB_A', poll=0.01, max_poll=0.02, timeout=0.05))
+
+
+def test_download_writes_log_while_streaming(server, tmp_path):
+    expected = server.log.get_trace_log('REPO', '1')['traceLogMessage'].trace_log_raw_data
+
+    buffer = io.BytesIO()
+    assert server.log.download('REPO', '1', 'trace', buffer) == len(expected)
+    assert buffer.getvalue().decode('utf-8') == expected
+
+    text = io.StringIO()
+    server.log.download('REPO', '1', 'trace', text)
+    assert text.getvalue() == expected
+
+    path = tmp_path / 'trace.txt.gz'
+    server.log.download('REPO', '1', 'trace', path, gzip=True)
+    assert gzip.decompress(path.read_bytes()).decode('utf-8') == expected
+
+
+def test_download_removes_partial_file(server, tmp_path):
+    path = tmp_path / 'trace.txt'
+    with pytest.raises(SessionExpiredError):
+        server.log.download('REPO', '401', 'trace', path)
+    assert not path.exists()
+    with pytest.raises(ValueError):
+        server.log.download('REPO', '1', 'trace', io.StringIO(), gzip=True)
+
+
+def test_download_keeps_the_error_of_a_target_that_cant_be_opened(server, tmp_path):
+    with pytest.raises(FileNotFoundError) as error:
+        server.log.download('REPO', '1', 'trace', tmp_path / 'missing' / 'trace.txt')
+    assert error.value.__context__ is None
+    with pytest.raises(IsADirectoryError) as error:
+        server.log.download('REPO', '1', 'trace', tmp_path)
+    assert error.value.__context__ is None
+    assert tmp_path.is_dir()
+
+
+def test_download_leaves_an_existing_file_it_cant_open(server, tmp_path, monkeypatch):
+    path = tmp_path / 'trace.txt'
+    path.write_text('kept')
+
+    def read_only(file, mode='r', *args, **kwargs):
+        raise PermissionError(13, 'Permission denied', str(file))
+
+    monkeypatch.setattr(logs, 'open', read_only, raising=False)
+    with pytest.raises(PermissionError):
+        server.log.download('REPO', '1', 'trace', path)
+    assert path.read_text() == 'kept'
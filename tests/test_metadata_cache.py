@@ -0,0 +1,92 @@
+import time
+from sapdswsdlclient import Server
+from sapdswsdlclient.utilities.metadata_cache import MetadataCache
+from tests.fakes import FakeTransport
+
+
+def make_server(metadata_cache=None):
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise',
+                    metadata_cache=metadata_cache or MetadataCache())
+    server.transport = FakeTransport()
+    server.logon()
+    return server
+
+
+def actions(server):
+    return [action for _, action, _ in server.transport.requests[1:]]
+
+
+def test_run_job_reads_input_format_once():
+    server = make_server()
+    for _ in range(3):
+        server.batch_job.run_job('REPO', 'JOB_A', global_variables={'$G_DATE': '2026-01-01'})
+
+    assert actions(server).count('jobAdmin=Get_Job_Input_Format') == 1
+    assert actions(server).count('jobAdmin=Run_Batch_Job') == 3
+    assert server.metadata_cache.stats() == {'hits': 2, 'misses': 1, 'evictions': 0, 'size': 1}
+
+
+def test_results_are_copies_and_defaults_share_entries():
+    server = make_server()
+    job_list = server.batch_job.get_list('REPO')
+    job_list['REPO'].append('CHANGED')
+
+    assert server.batch_job.get_list('REPO', 1) == {'REPO': ['JOB_A', 'JOB_B']}
+    assert server.batch_job.get_list(repo_name='REPO') == {'REPO': ['JOB_A', 'JOB_B']}
+    assert actions(server) == ['jobAdmin=Get_BatchJob_List']
+
+
+def test_import_invalidates_the_repository(tmp_path):
+    server = make_server()
+    definition = tmp_path / 'job.xml'
+    definition.write_text('<DataIntegratorExport></DataIntegratorExport>')
+    server.batch_job.get_input_format('REPO', 'JOB_A')
+    server.metadata_cache.put(('get_list', 'OTHER', ()), {'OTHER': []})
+
+    server.repo.import_object('REPO', str(definition), 'secret')
+    server.batch_job.get_input_format('REPO', 'JOB_A')
+
+    assert actions(server).count('jobAdmin=Get_Job_Input_Format') == 2
+    assert server.metadata_cache.get(('get_list', 'OTHER', ()))[0]
+
+
+def test_ttl_and_lru_eviction():
+    cache = MetadataCache(max_size=2, ttl=0.05)
+    cache.put(('op', 'REPO', 1), 'a')
+    cache.put(('op', 'REPO', 2), 'b')
+    assert cache.get(('op', 'REPO', 1)) == (True, 'a')
+    cache.put(('op', 'REPO', 3), 'c')
+
+    assert cache.get(('op', 'REPO', 2)) == (False, None)
+    assert cache.stats()['evictions'] == 1
+    time.sleep(0.06)
+    assert cache.get(('op', 'REPO', 1)) == (False, None)
+    assert cache.stats()['size'] == 1
+
+
+def test_cache_is_off_by_default():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport()
+    server.logon()
+    assert server.metadata_cache is None
+    server.batch_job.get_list('REPO')
+    server.batch_job.get_list('REPO')
+
+    assert actions(server) == ['jobAdmin=Get_BatchJob_List'] * 2
+
+
+def test_hits_need_no_session_or_lease():
+    server = make_server()
+    server.batch_job.get_list('REPO')
+    pool = server.open_session_pool(size=1)
+    # the session is due to be validated again, but a cached result doesn't need it
+    server.session_validated_at = None
+    sent = len(server.transport.requests)
+
+    def lease(timeout=None):
+        raise AssertionError('a cached result leased a session')
+
+    pool.lease = lease
+    assert server.batch_job.get_list('REPO') == {'REPO': ['JOB_A', 'JOB_B']}
+    assert len(server.transport.requests) == sent
+    pool.close()
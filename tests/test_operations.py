@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import pytest
+from sapdswsdlclient import Server, AsyncServer
+from sapdswsdlclient.server.async_transport import iter_async
+from tests.fakes import FakeTransport, FakeAsyncTransport, RESPONSES
+
+
+def make_server(cls, transport):
+    server = cls('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = transport
+    return server
+
+
+def test_sync_operation_builds_envelope_with_session():
+    transport = FakeTransport()
+    server = make_server(Server, transport)
+    server.logon()
+
+    assert server.batch_job.get_list('REPO') == {'REPO': ['JOB_A', 'JOB_B']}
+    method, soap_action, data = transport.requests[-1]
+    assert (method, soap_action) == ('get', 'jobAdmin=Get_BatchJob_List')
+    assert '<SessionID>session-1</SessionID>' in data
+
+
+def test_run_job_reuses_input_format_operation():
+    transport = FakeTransport()
+    server = make_server(Server, transport)
+    server.logon()
+
+    run_status = server.batch_job.run_job('REPO', 'JOB_A', global_variables={'$G_DATE': '2026-01-01'})
+    assert run_status['runID'] == '3'
+    assert [r[1] for r in transport.requests[1:]] == ['jobAdmin=Get_Job_Input_Format', 'jobAdmin=Run_Batch_Job']
+    assert transport.requests[-1][0] == 'post'
+
+    with pytest.raises(ValueError):
+        server.batch_job.run_job('REPO', 'JOB_A', global_variables={'$G_OTHER': '1'})
+
+
+def test_async_server_mirrors_sync_api():
+    async def scenario():
+        transport = FakeAsyncTransport()
+        server = make_server(AsyncServer, transport)
+        await server.logon()
+        job_list = await server.batch_job.get_list('REPO')
+        await server.logout()
+        return transport, job_list
+
+    transport, job_list = asyncio.run(scenario())
+    assert job_list == {'REPO': ['JOB_A', 'JOB_B']}
+    assert [r[1] for r in transport.requests] == ['function=Logon', 'jobAdmin=Get_BatchJob_List', 'function=Logout']
+    for name in ('batch_job', 'log', 'repo', 'dataflow', 'job_server', 'realtime_service'):
+        assert hasattr(make_server(AsyncServer, transport), name)
+    assert asyncio.iscoroutinefunction(AsyncServer.logon)
+
+
+def test_map_sends_each_soap_action_with_its_own_headers():
+    transport = FakeTransport()
+    server = make_server(Server, transport)
+    server.logon()
+
+    calls = [lambda: server.batch_job.get_list('REPO'),
+             lambda: server.batch_job.get_input_format('REPO', 'JOB_A')] * 20
+    results = server.map(lambda call: call(), calls, max_workers=8)
+
+    assert results[0] == {'REPO': ['JOB_A', 'JOB_B']}
+    assert results[1] == {'JOB_A_GlobalVariables': [{'name': '$G_DATE', 'dataType': 'date'}]}
+    assert len(transport.requests[1:]) == len(calls)
+    for _, soap_action, data in transport.requests[1:]:
+        expected = 'Get_BatchJob_ListRequest' if soap_action == 'jobAdmin=Get_BatchJob_List' else 'Get_Job_Input_FormatRequest'
+        assert expected in data
+
+
+def test_bulk_run_exe_detail_reports_failures_per_key():
+    transport = FakeTransport()
+    server = make_server(Server, transport)
+    server.logon()
+
+    runs = [('JOB_A', str(run_id)) for run_id in range(1, 30)] + [('JOB_A', '404')]
+    results = {key: (details, error) for key, details, error in
+               server.batch_job.get_run_exe_detail_many('REPO', runs, max_workers=4)}
+
+    assert set(results) == set(runs)
+    assert results[('JOB_A', '1')][0]['Status'] == 'succeeded'
+    assert isinstance(results[('JOB_A', '404')][1], ValueError)
+
+
+def test_iter_async_reads_parts_off_the_event_loop():
+    threads = []
+
+    def parts():
+        for part in ('<a>', 'b', '</a>'):
+            threads.append(threading.get_ident())
+            yield part
+
+    async def collect():
+        return [part async for part in iter_async(parts())], threading.get_ident()
+
+    collected, loop_thread = asyncio.run(collect())
+    assert collected == ['<a>', 'b', '</a>']
+    assert loop_thread not in threads
+
+
+def test_job_detail_without_substitution_parameters_is_returned():
+    transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_BatchJob_Details': (
+        '<jobDetail><globalVariables><variable name="$G_DATE" type="date">2026-01-01</variable></globalVariables>'
+        '<systemConfigurations><config name="DEV"/></systemConfigurations></jobDetail>')})
+    server = make_server(Server, transport)
+    server.logon()
+
+    details = server.batch_job.get_detail('REPO', 'JOB_A')
+
+    assert details[0] == {'globalVariables': [{'name': '$G_DATE', 'type': 'date', 'default_value': '2026-01-01'}]}
+    assert len(details) == 2
+
+
+def test_missing_elements_are_returned_as_none():
+    transport = FakeTransport({**RESPONSES, 'repoAdmin=Validate_Repo_Object': '<ValidateResponse/>',
+                               'repoAdmin=Delete_Repo_Objects': '<DeleteResponse/>',
+                               'jobAdmin=Get_Job_Input_Format': '<InputFormat/>'})
+    server = make_server(Server, transport)
+    server.logon()
+
+    assert server.repo.validate_repo_object('JOB_A', 'BATCH_JOB', 'REPO', '')['returnCode'] is None
+    assert server.repo.delete_repo_object('JOB_A', 'BATCH_JOB', 'REPO')['returnCode'] is None
+    assert server.batch_job.get_input_format('REPO', 'JOB_A') == {None: []}
@@ -0,0 +1,42 @@
+import pytest
+from sapdswsdlclient.models.batch_job import job_detail_schema
+from sapdswsdlclient.utilities import clean_xml
+from sapdswsdlclient.utilities.clean_xml import clean_xml_response, get_parser_backend, set_parser_backend
+
+RESPONSE = ('<?xml version="1.0" encoding="UTF-8"?>'
+            '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"><soapenv:Body>'
+            '<jobDetail><JobName>AT&T\xa0LOAD \x01sales</JobName><runID>1</runID>'
+            '<Status>succeeded &amp; done</Status><!-- note --></jobDetail>'
+            '<jobDetail><JobName>数据服务</JobName></jobDetail>'
+            '</soapenv:Body></soapenv:Envelope>')
+
+backends = [pytest.param('lxml', marks=pytest.mark.skipif(clean_xml.lxml_etree is None, reason='lxml not installed')),
+            'etree']
+
+
+@pytest.fixture
+def backend(request):
+    previous = get_parser_backend()
+    set_parser_backend(request.param)
+    yield request.param
+    set_parser_backend(previous)
+
+
+@pytest.mark.parametrize('backend', backends, indirect=True)
+def test_backends_parse_the_same_records(backend):
+    records = job_detail_schema.parse(clean_xml_response(RESPONSE))
+
+    assert [record['JobName'] for record in records] == ['AT&T LOAD sales', '数据服务']
+    assert records[0]['Status'] == 'succeeded & done'
+    assert records[1]['Status'] is None
+
+
+@pytest.mark.parametrize('backend', backends, indirect=True)
+def test_backends_raise_value_error_on_empty_response(backend):
+    with pytest.raises(ValueError):
+        clean_xml_response('')
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        set_parser_backend('minidom')
@@ -0,0 +1,105 @@
+import threading
+import pytest
+from sapdswsdlclient.exceptions.exceptions import SessionExpiredError
+from sapdswsdlclient.server.re_auth import re_logon
+from sapdswsdlclient.utilities.check_for_fault_or_error import session_fault_pattern
+
+
+class FakeServer:
+    def __init__(self, fresh=True, valid='0'):
+        self.fresh = fresh
+        self.valid = valid
+        self.calls = []
+        self.session_id = 'session-1'
+        self.session_lock = threading.RLock()
+        self.session_pool = None
+
+    def is_session_fresh(self):
+        return self.fresh
+
+    def mark_session_valid(self):
+        self.calls.append('mark_session_valid')
+        self.fresh = True
+
+    def validate_session_id(self):
+        self.calls.append('validate_session_id')
+        return self.valid
+
+    def logon(self):
+        self.calls.append('logon')
+        self.fresh = True
+
+    def logout(self):
+        self.calls.append('logout')
+
+
+class FakeModel:
+    def __init__(self, server, failures=0):
+        self._server = server
+        self.failures = failures
+        self.attempts = 0
+
+    def _call(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise SessionExpiredError('Session ID is invalid')
+        return 'result'
+
+    @re_logon
+    def read(self):
+        return self._call()
+
+    @re_logon(retry=False)
+    def write(self):
+        return self._call()
+
+
+def test_fresh_session_is_trusted_without_round_trips():
+    server = FakeServer(fresh=True)
+    assert FakeModel(server).read() == 'result'
+    assert server.calls == []
+
+
+def test_expired_ttl_validates_session_again():
+    server = FakeServer(fresh=False, valid='0')
+    assert FakeModel(server).read() == 'result'
+    assert server.calls == ['validate_session_id', 'mark_session_valid']
+
+
+def test_invalid_session_after_ttl_signs_in_again():
+    server = FakeServer(fresh=False, valid='1')
+    assert FakeModel(server).read() == 'result'
+    assert server.calls == ['validate_session_id', 'logout', 'logon']
+
+
+def test_session_fault_retries_exactly_once():
+    server = FakeServer()
+    model = FakeModel(server, failures=1)
+    assert model.read() == 'result'
+    assert model.attempts == 2
+    assert server.calls == ['logout', 'logon']
+
+    model = FakeModel(server, failures=2)
+    with pytest.raises(SessionExpiredError):
+        model.read()
+    assert model.attempts == 2
+
+
+def test_state_changing_call_is_not_retried():
+    server = FakeServer()
+    model = FakeModel(server, failures=1)
+    with pytest.raises(SessionExpiredError):
+        model.write()
+    assert model.attempts == 1
+    assert server.calls == ['logout', 'logon']
+
+
+@pytest.mark.parametrize('faultstring, is_session_fault', [
+    ('Session ID is invalid', True),
+    ('Invalid session ID', True),
+    ('The session has expired', True),
+    ('Realtime service session pool exhausted', False),
+    ('Repository does not exist', False),
+])
+def test_session_fault_pattern(faultstring, is_session_fault):
+    assert bool(session_fault_pattern.search(faultstring)) is is_session_fault
@@ -0,0 +1,59 @@
+import pickle
+import xml.etree.ElementTree as ET
+import pytest
+from sapdswsdlclient.exceptions.exceptions import SessionExpiredError
+from sapdswsdlclient.models.batch_job import job_detail_schema, job_options_schema
+from sapdswsdlclient.models.items import JobExecution
+from sapdswsdlclient.utilities.response_schema import RecordSchema
+
+
+def test_records_in_document_order_with_missing_fields_as_none():
+    root = ET.fromstring('<r><jobDetail><JobName>A</JobName><runID>1</runID></jobDetail>'
+                         '<x><jobDetail><JobName>B</JobName><Status>error</Status></jobDetail></x></r>')
+
+    records = job_detail_schema.parse(root)
+
+    assert [record['JobName'] for record in records] == ['A', 'B']
+    assert records[0]['RunID'] == '1'
+    assert records[0]['Status'] is None
+    assert records[1]['RunID'] is None
+
+
+def test_fault_tags_raise():
+    schema = RecordSchema('run', {'runID': 'runID'}, fault_tags=['errorMessage', 'faultstring'])
+
+    with pytest.raises(ValueError, match='no such repo'):
+        schema.parse(ET.fromstring('<r><errorMessage>no such repo</errorMessage></r>'))
+    with pytest.raises(SessionExpiredError):
+        schema.parse(ET.fromstring('<r><faultstring>Invalid session ID</faultstring></r>'))
+    assert schema.parse(ET.fromstring('<r><errorMessage/></r>')) == []
+
+
+def test_field_schema_takes_first_value_and_collects_lists():
+    root = ET.fromstring('<r><auditing>true</auditing><trace>a</trace><trace>b</trace>'
+                         '<x><auditing>false</auditing></x></r>')
+
+    options = job_options_schema.parse(root)
+
+    assert options['auditing'] == 'true'
+    assert options['trace'] == ['a', 'b']
+    assert options['recovery'] is None
+
+
+def test_records_read_like_dicts_and_share_repeated_values():
+    root = ET.fromstring('<r>' + ''.join(f'<jobDetail><JobName>JOB_A</JobName><runID>{run_id}</runID>'
+                                         f'<Status>succeeded</Status></jobDetail>' for run_id in (1, 2)) + '</r>')
+
+    first, second = job_detail_schema.parse(root)
+
+    assert isinstance(first, JobExecution)
+    assert not hasattr(first, '__dict__')
+    assert first['RunID'] == first.RunID == '1'
+    assert first == dict(first) == first.to_dict()
+    assert first.to_dict() == {'JobName': 'JOB_A', 'ObjID': None, 'RunID': '1', 'StartTime': None, 'EndTime': None,
+                               'ExecutionTime': None, 'Status': 'succeeded', 'JobServerUsed': None}
+    assert first.Status is second.Status
+    assert first.JobName is second.JobName
+    assert pickle.loads(pickle.dumps(second)) == second
+    with pytest.raises(KeyError):
+        first['runID']
@@ -0,0 +1,58 @@
+import pytest
+from sapdswsdlclient.server.auth import Server
+from sapdswsdlclient.server.transport import Transport
+
+
+def make_server(**kwargs):
+    return Server('http://localhost/wsdl', 'user', 'password', 'localhost', 'secEnterprise', **kwargs)
+
+
+def record_calls(server):
+    calls = []
+    server.logout = lambda: calls.append('logout')
+    server.close = lambda: calls.append('close')
+    return calls
+
+
+def test_default_timeout_is_finite():
+    assert Transport().timeout == (10, 300)
+    server = make_server()
+    assert server.transport.timeout == (10, 300)
+    server.close()
+
+
+def test_context_manager_logs_out_and_closes():
+    server = make_server()
+    server.session_id = 'session'
+    calls = record_calls(server)
+    with server as entered:
+        assert entered is server
+    assert calls == ['logout', 'close']
+
+
+def test_context_manager_skips_logout_when_not_signed_in():
+    server = make_server()
+    calls = record_calls(server)
+    with server:
+        pass
+    server.session_id = 'session'
+    server.status = 'Logout complete'
+    with server:
+        pass
+    assert calls == ['close', 'close']
+
+
+def test_context_manager_closes_when_logout_fails():
+    server = make_server()
+    server.session_id = 'session'
+    calls = []
+
+    def logout():
+        raise ConnectionError('Management Console is unreachable')
+
+    server.logout = logout
+    server.close = lambda: calls.append('close')
+    with pytest.raises(ConnectionError):
+        with server:
+            pass
+    assert calls == ['close']
@@ -0,0 +1,94 @@
+import itertools
+import re
+import threading
+import pytest
+from sapdswsdlclient import Server
+from tests.fakes import FakeTransport, RESPONSES
+
+
+def pool_responses():
+    counter = itertools.count(1)
+    expired = set()
+    lock = threading.Lock()
+
+    def logon(data):
+        with lock:
+            return f'<LogonResponse><SessionID>session-{next(counter)}</SessionID></LogonResponse>'
+
+    def job_list(data):
+        session_id = re.search(r'<SessionID>(.*?)</SessionID>', data).group(1)
+        if session_id in expired:
+            return '<faultstring>Session ID is invalid</faultstring>'
+        return RESPONSES['jobAdmin=Get_BatchJob_List']
+
+    return {**RESPONSES, 'function=Logon': logon, 'jobAdmin=Get_BatchJob_List': job_list}, expired
+
+
+def session_ids(transport, soap_action):
+    return {re.search(r'<SessionID>(.*?)</SessionID>', data).group(1)
+            for _, action, data in transport.requests if action == soap_action}
+
+
+def test_model_calls_lease_pooled_sessions():
+    responses, _ = pool_responses()
+    transport = FakeTransport(responses)
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = transport
+    server.logon()
+
+    with server.open_session_pool(size=3) as pool:
+        assert pool.sessions == 3
+        results = server.map(lambda _: server.batch_job.get_list('REPO'), range(30), max_workers=6)
+
+    assert all(result == {'REPO': ['JOB_A', 'JOB_B']} for result in results)
+    assert sum(action == 'jobAdmin=Get_BatchJob_List' for _, action, _ in transport.requests) == 30
+    assert session_ids(transport, 'jobAdmin=Get_BatchJob_List') <= {'session-2', 'session-3', 'session-4'}
+    assert session_ids(transport, 'function=Logout') == {'session-2', 'session-3', 'session-4'}
+    assert server.session_pool is None
+
+
+def test_expired_pooled_session_is_replaced_and_call_retried():
+    responses, expired = pool_responses()
+    transport = FakeTransport(responses)
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = transport
+
+    with server.open_session_pool(size=1) as pool:
+        expired.add('session-1')
+        assert server.batch_job.get_list('REPO') == {'REPO': ['JOB_A', 'JOB_B']}
+        assert pool.sessions == 1
+    assert session_ids(transport, 'jobAdmin=Get_BatchJob_List') == {'session-1', 'session-2'}
+
+
+def test_session_leased_during_close_is_signed_out_on_release():
+    responses, _ = pool_responses()
+    transport = FakeTransport(responses)
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = transport
+
+    pool = server.open_session_pool(size=2)
+    with pool.lease() as session_id:
+        pool.close()
+        assert session_ids(transport, 'function=Logout') == {'session-1', 'session-2'} - {session_id}
+    assert session_ids(transport, 'function=Logout') == {'session-1', 'session-2'}
+    assert pool.sessions == 0
+
+
+def test_failed_open_signs_out_sessions_already_signed_in():
+    responses, _ = pool_responses()
+    logon = responses['function=Logon']
+    attempts = itertools.count(1)
+
+    def failing_logon(data):
+        if next(attempts) == 3:
+            raise ConnectionError('Management Console is unreachable')
+        return logon(data)
+
+    transport = FakeTransport({**responses, 'function=Logon': failing_logon})
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = transport
+
+    with pytest.raises(ConnectionError):
+        server.open_session_pool(size=4)
+    assert session_ids(transport, 'function=Logout') == {'session-1', 'session-2'}
+    assert server.session_pool is None
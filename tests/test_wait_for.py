@@ -0,0 +1,96 @@
+import re
+import pytest
+from sapdswsdlclient import Server
+from tests.fakes import FakeTransport, RESPONSES
+
+
+class Runs:
+    """
+    Runs that are queued, unknown to the server, for a number of polls of their job's running list,
+    and finish after a number of polls.
+    """
+    def __init__(self, finish_after, queued_for=None):
+        self.finish_after = finish_after
+        self.queued_for = queued_for or dict()
+        self.polls = dict()
+
+    def status(self, job_name, run_id):
+        polls = self.polls.get(job_name, 0)
+        if polls <= self.queued_for.get((job_name, run_id), 0):
+            return None
+        if polls <= self.finish_after[job_name, run_id]:
+            return 'running'
+        return 'error' if run_id == '2' else 'succeeded'
+
+    def run_ids(self, data):
+        job_name = re.search('<jobName>(.*?)</jobName>', data).group(1)
+        listed = re.search('<status>(.*?)</status>', data).group(1)
+        if listed == 'running':
+            self.polls[job_name] = self.polls.get(job_name, 0) + 1
+        runs = ''.join(f'<run><runID>{run_id}</runID><status>{status}</status><repoName>REPO</repoName></run>'
+                       for (job, run_id) in self.finish_after if job == job_name
+                       for status in [self.status(job, run_id)]
+                       if status is not None and listed in (status, 'all'))
+        return f'<runs>{runs}</runs>'
+
+
+def make_server(runs):
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport({**RESPONSES, 'jobAdmin=Get_BatchJob_RunIDs': runs.run_ids})
+    server.logon()
+    return server
+
+
+def listed(server):
+    return [re.search('<status>(.*?)</status>', data).group(1) for _, action, data in server.transport.requests
+            if action == 'jobAdmin=Get_BatchJob_RunIDs']
+
+
+def test_wait_for_yields_runs_as_they_finish():
+    runs = Runs({('JOB_A', '1'): 3, ('JOB_A', '2'): 1, ('JOB_B', '3'): 2})
+    server = make_server(runs)
+    started = [{'repoName': 'REPO', 'jobName': 'JOB_A', 'runID': '1'}, ('REPO', 'JOB_A', 2), ('REPO', 'JOB_B', '3')]
+
+    finished = list(server.batch_job.wait_for(started, poll=0, max_poll=0))
+
+    assert finished == [(('REPO', 'JOB_A', 2), 'error'), (('REPO', 'JOB_B', '3'), 'succeeded'),
+                        (started[0], 'succeeded')]
+    # one running list per job and poll, all runs only for jobs with a run that left it
+    assert listed(server).count('running') == 4 + 3
+    assert listed(server).count('all') == 2 + 1
+
+
+def test_queued_runs_stay_pending_without_detail_requests():
+    runs = Runs({('JOB_A', '1'): 4}, queued_for={('JOB_A', '1'): 2})
+    server = make_server(runs)
+
+    finished = list(server.batch_job.wait_for([('REPO', 'JOB_A', '1')], poll=0, max_poll=0))
+
+    assert finished == [(('REPO', 'JOB_A', '1'), 'succeeded')]
+    assert listed(server) == ['running', 'all', 'running', 'all', 'running', 'running', 'running', 'all']
+    assert not any(action == 'jobAdmin=Get_BatchJob_Run_ExeDetail' for _, action, _ in server.transport.requests)
+
+
+def test_wait_for_times_out():
+    server = make_server(Runs({('JOB_A', '1'): 10 ** 6}))
+    with pytest.raises(TimeoutError):
+        list(server.batch_job.wait_for([('REPO', 'JOB_A', '1')], timeout=0.05, poll=0.01, max_poll=0.02))
+
+
+def test_wait_for_polls_until_the_deadline_has_passed():
+    runs = Runs({('JOB_A', '1'): 1})
+    server = make_server(runs)
+    # the run finishes by the second poll, which a wait of poll seconds would place after the deadline
+    finished = list(server.batch_job.wait_for([('REPO', 'JOB_A', '1')], timeout=0.05, poll=10, max_poll=10))
+
+    assert finished == [(('REPO', 'JOB_A', '1'), 'succeeded')]
+
+
+def test_run_job_result_can_be_waited_for():
+    server = Server('http://mc/ws', 'user', 'password', 'cms', 'secEnterprise')
+    server.transport = FakeTransport()
+    server.logon()
+
+    run = server.batch_job.run_job('REPO', 'JOB_A')
+
+    assert (run['repoName'], run['jobName'], run['runID']) == ('REPO', 'JOB_A', '3')